@@ -6,3 +6,7 @@ from ._version import __version__
 TA_EPSILON: float = 1e-8
 # 默认最小样本数量
 MIN_SAMPLES: Optional[int] = None
+# 部分滚动计算是否使用numba实现
+USE_NUMBA: bool = False
+# 部分每个窗口需要完整计算的滚动函数是否使用numba多线程并行
+NUMBA_PARALLEL: bool = False
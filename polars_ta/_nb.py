@@ -0,0 +1,124 @@
+import numpy as np
+from numba import jit
+from numpy import full
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _efficiency_ratio(x1, window):
+    """abs(x[i] - x[i-window]) / sum(abs(diff(x))), the path length is kept as a running sum
+    位移除以路程，路程使用滚动累加，一次循环完成"""
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    ring = full(window, np.nan, dtype=np.float64)  # 窗口内的一阶差分绝对值，移出时不再重算
+    s = 0.0  # 路程
+    n = 0  # 窗口内有效的一阶差分个数
+    for i in range(1, x1.shape[0]):
+        k = i % window
+        d = ring[k]
+        if d == d:
+            s -= d
+            n -= 1
+        # np.abs编译为清除符号位，无分支
+        d = np.abs(x1[i] - x1[i - 1])
+        ring[k] = d
+        if d == d:
+            s += d
+            n += 1
+        if n == window and s > 0:
+            out[i] = abs(x1[i] - x1[i - window]) / s
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _price_density(high, low, window):
+    """sum(high-low) / (max(high) - min(low)), the extremes are kept by two monotonic deques
+    最高价与最低价使用单调队列维护，一次循环完成"""
+    out = full(high.shape, np.nan, dtype=np.float64)
+    q_max = np.empty(window, dtype=np.int64)  # 环形数组实现的单调递减队列
+    q_min = np.empty(window, dtype=np.int64)  # 环形数组实现的单调递增队列
+    h_max, n_max = 0, 0
+    h_min, n_min = 0, 0
+    s = 0.0
+    n = 0
+    for i in range(high.shape[0]):
+        if i >= window:
+            j = i - window
+            if high[j] == high[j] and low[j] == low[j]:
+                s -= high[j] - low[j]
+                n -= 1
+            if n_max > 0 and q_max[h_max] == j:
+                h_max = (h_max + 1) % window
+                n_max -= 1
+            if n_min > 0 and q_min[h_min] == j:
+                h_min = (h_min + 1) % window
+                n_min -= 1
+        if high[i] == high[i] and low[i] == low[i]:
+            s += high[i] - low[i]
+            n += 1
+            while n_max > 0 and high[q_max[(h_max + n_max - 1) % window]] <= high[i]:
+                n_max -= 1
+            q_max[(h_max + n_max) % window] = i
+            n_max += 1
+            while n_min > 0 and low[q_min[(h_min + n_min - 1) % window]] >= low[i]:
+                n_min -= 1
+            q_min[(h_min + n_min) % window] = i
+            n_min += 1
+        if n == window:
+            t = high[q_max[h_max]] - low[q_min[h_min]]
+            if t != 0:
+                out[i] = s / t
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _fractal_dimension(high, low, close, window, n1, n2, n3):
+    """1 + (log(L) + n2) / n3, L = sum(sqrt(n1 + (diff(close) / (max(high) - min(low)))^2))
+    区间最高最低价使用单调队列维护，L使用环形数组滚动累加，一次循环完成
+
+    n1, n2, n3 are (1/n)^2, log(2), log(2n)
+    """
+    out = full(close.shape, np.nan, dtype=np.float64)
+    q_max = np.empty(window, dtype=np.int64)
+    q_min = np.empty(window, dtype=np.int64)
+    h_max, n_max = 0, 0
+    h_min, n_min = 0, 0
+    n_hl = 0  # 窗口内high与low都有效的个数
+    terms = full(window, np.nan, dtype=np.float64)  # L的各项
+    L = 0.0
+    n = 0  # 窗口内L的有效项数
+    for i in range(close.shape[0]):
+        if i >= window:
+            j = i - window
+            if high[j] == high[j] and low[j] == low[j]:
+                n_hl -= 1
+            if n_max > 0 and q_max[h_max] == j:
+                h_max = (h_max + 1) % window
+                n_max -= 1
+            if n_min > 0 and q_min[h_min] == j:
+                h_min = (h_min + 1) % window
+                n_min -= 1
+        if high[i] == high[i] and low[i] == low[i]:
+            n_hl += 1
+            while n_max > 0 and high[q_max[(h_max + n_max - 1) % window]] <= high[i]:
+                n_max -= 1
+            q_max[(h_max + n_max) % window] = i
+            n_max += 1
+            while n_min > 0 and low[q_min[(h_min + n_min - 1) % window]] >= low[i]:
+                n_min -= 1
+            q_min[(h_min + n_min) % window] = i
+            n_min += 1
+
+        k = i % window
+        if terms[k] == terms[k]:
+            L -= terms[k]
+            n -= 1
+        terms[k] = np.nan
+        if n_hl == window and i > 0:
+            t1 = high[q_max[h_max]] - low[q_min[h_min]]
+            t2 = close[i] - close[i - 1]
+            if t1 != 0 and t2 == t2:
+                terms[k] = np.sqrt(n1 + (t2 / t1) ** 2)
+                L += terms[k]
+                n += 1
+        if n == window:
+            out[i] = 1 + (np.log(L) + n2) / n3
+    return out
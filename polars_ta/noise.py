@@ -13,18 +13,21 @@ References
 https://zhuanlan.zhihu.com/p/544744582
 
 """
-import numpy as np
-from polars import Expr
+import math
+from functools import lru_cache
+
+from polars import Expr, Float64, struct
+
+from polars_ta._nb import _efficiency_ratio, _price_density, _fractal_dimension
+from polars_ta.utils.numba_ import batches_i1_o1, batches_i2_o1, struct_to_numpy
 
 
 def ts_efficiency_ratio(close: Expr, timeperiod: int = 14) -> Expr:
     """效率系数。值越大，噪音越小。最大值为1，最小值为0
 
-    本质上是位移除以路程
+    本质上是位移除以路程。位移与路程在一次循环中完成计算
     """
-    t1 = close.diff(timeperiod).abs()
-    t2 = close.diff(1).abs().rolling_sum(timeperiod)
-    return t1 / t2
+    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _efficiency_ratio, timeperiod, skip_nan=True), return_dtype=Float64)
 
 
 def ts_price_density(high: Expr, low: Expr, timeperiod: int = 14) -> Expr:
@@ -32,20 +35,21 @@ def ts_price_density(high: Expr, low: Expr, timeperiod: int = 14) -> Expr:
 
     如果K线高低相连，上涨为1，下跌也为1
     如果K线高低平行，值大于1，最大为timeperiod
+
+    区间最高最低价使用单调队列维护，与K线长度之和在一次循环中完成计算
     """
-    t1 = (high - low).rolling_sum(timeperiod)
-    t2 = high.rolling_max(timeperiod) - low.rolling_min(timeperiod)
-    return t1 / t2
+    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _price_density, timeperiod), return_dtype=Float64)
 
 
-def ts_fractal_dimension(high: Expr, low: Expr, close: Expr, timeperiod: int = 14) -> Expr:
-    """分形维度。值越大，噪音越大"""
-    n1 = (1 / timeperiod) ** 2
-    n2 = np.log(2)
-    n3 = np.log(2 * timeperiod)
+@lru_cache(maxsize=None)
+def _fd_consts(timeperiod: int):
+    """constants of `ts_fractal_dimension`: (1/n)^2, log(2), log(2n)"""
+    return (1 / timeperiod) ** 2, math.log(2), math.log(2 * timeperiod)
 
-    t1 = high.rolling_max(timeperiod) - low.rolling_min(timeperiod)
-    t2 = close.diff(1)
 
-    L = (n1 + t2 / t1).sqrt().rolling_sum(timeperiod)
-    return 1 + (L.log() + n2) / n3
+def ts_fractal_dimension(high: Expr, low: Expr, close: Expr, timeperiod: int = 14) -> Expr:
+    """分形维度。值越大，噪音越大
+
+    区间最高最低价使用单调队列维护，曲线长度使用环形数组滚动累加，一次循环完成计算
+    """
+    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _fractal_dimension, timeperiod, *_fd_consts(timeperiod)), return_dtype=Float64)
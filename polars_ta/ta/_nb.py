@@ -0,0 +1,253 @@
+import numpy as np
+from numba import jit, guvectorize, float64, int64
+from numpy import full
+
+from polars_ta.utils.numba_ import _mean_m2
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _ewm_step(x, mean, wt, count, alpha):
+    """one step of `ewm_mean(adjust=False, ignore_nulls=False)`, nan is treated as null
+    ewm_mean单步更新，与polars的规则一致，nan当成null处理"""
+    if mean == mean:
+        wt *= 1 - alpha
+    if x == x:
+        if mean == mean:
+            mean = (wt * mean + alpha * x) / (wt + alpha)
+        else:
+            mean = x
+        wt = 1.0
+        count += 1
+    return mean, wt, count
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _ewm_mean(x1, alpha, min_samples):
+    """same as `ewm_mean(alpha=alpha, adjust=False, min_samples=min_samples)`
+    与polars的ewm_mean结果一致"""
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    m, w, c = np.nan, 1.0, 0
+    for i in range(x1.shape[0]):
+        v = x1[i]
+        m, w, c = _ewm_step(v, m, w, c, alpha)
+        if v == v and c >= min_samples:
+            out[i] = m
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _dema(x1, alpha, min_samples):
+    """EMA1 * 2 - EMA2, two chained ewm in one pass
+    两层EMA嵌套，一次循环完成"""
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    m1, w1, c1 = np.nan, 1.0, 0
+    m2, w2, c2 = np.nan, 1.0, 0
+    for i in range(x1.shape[0]):
+        v = x1[i]
+        m1, w1, c1 = _ewm_step(v, m1, w1, c1, alpha)
+        e1 = m1 if v == v and c1 >= min_samples else np.nan
+        m2, w2, c2 = _ewm_step(e1, m2, w2, c2, alpha)
+        if e1 == e1 and c2 >= min_samples:
+            out[i] = e1 * 2 - m2
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _tema(x1, alpha, min_samples):
+    """(EMA1 - EMA2) * 3 + EMA3, three chained ewm in one pass
+    三层EMA嵌套，一次循环完成"""
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    m1, w1, c1 = np.nan, 1.0, 0
+    m2, w2, c2 = np.nan, 1.0, 0
+    m3, w3, c3 = np.nan, 1.0, 0
+    for i in range(x1.shape[0]):
+        v = x1[i]
+        m1, w1, c1 = _ewm_step(v, m1, w1, c1, alpha)
+        e1 = m1 if v == v and c1 >= min_samples else np.nan
+        m2, w2, c2 = _ewm_step(e1, m2, w2, c2, alpha)
+        e2 = m2 if e1 == e1 and c2 >= min_samples else np.nan
+        m3, w3, c3 = _ewm_step(e2, m3, w3, c3, alpha)
+        if e2 == e2 and c3 >= min_samples:
+            out[i] = (e1 - e2) * 3 + m3
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _trima(x1, n1, n2, min_periods1, min_periods2):
+    """SMA(SMA(x, n1), n2), two ring buffers fed in one pass
+    两层SMA嵌套，第一层的结果直接送入第二层的环形缓冲区，一次循环完成"""
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    rb1 = full(n1, np.nan, dtype=np.float64)
+    rb2 = full(n2, np.nan, dtype=np.float64)
+    s1, c1 = 0.0, 0
+    s2, c2 = 0.0, 0
+    for i in range(x1.shape[0]):
+        k = i % n1
+        v = rb1[k]
+        if v == v:
+            s1 -= v
+            c1 -= 1
+        v = x1[i]
+        rb1[k] = v
+        if v == v:
+            s1 += v
+            c1 += 1
+        m = s1 / c1 if c1 >= min_periods1 and c1 > 0 else np.nan
+
+        k = i % n2
+        v = rb2[k]
+        if v == v:
+            s2 -= v
+            c2 -= 1
+        rb2[k] = m
+        if m == m:
+            s2 += m
+            c2 += 1
+        if c2 >= min_periods2 and c2 > 0:
+            out[i] = s2 / c2
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _kama(x1, window, fast, slow):
+    """Kaufman adaptive moving average, same recurrence as TA-Lib
+    考夫曼自适应均线，效率系数与递推在一次循环中完成。遇到nan后重新开始
+
+    sc = (ER * (2/(fast+1) - 2/(slow+1)) + 2/(slow+1))^2
+    kama[i] = kama[i-1] + sc * (x[i] - kama[i-1])
+    """
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    c_max = 2 / (slow + 1)
+    c_diff = 2 / (fast + 1) - c_max
+    ring = full(window, np.nan, dtype=np.float64)  # 窗口内的一阶差分绝对值
+    s = 0.0  # 路程
+    n = 0  # 窗口内有效的一阶差分个数
+    kama = np.nan
+    for i in range(1, x1.shape[0]):
+        k = i % window
+        d = ring[k]
+        if d == d:
+            s -= d
+            n -= 1
+        d = np.abs(x1[i] - x1[i - 1])
+        ring[k] = d
+        if d == d:
+            s += d
+            n += 1
+        if n < window:
+            kama = np.nan
+            continue
+        if kama != kama:
+            # 前一根K线做为初值
+            kama = x1[i - 1]
+        er = np.abs(x1[i] - x1[i - window]) / s if s > 0 else 1.0
+        sc = er * c_diff + c_max
+        kama += sc * sc * (x1[i] - kama)
+        out[i] = kama
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _bbands(x1, window, min_periods, nbdevup, nbdevdn):
+    """rolling mean and std in one pass with Welford's add/remove update
+    使用Welford算法增删窗口数据，一次循环同时得到均值与标准差"""
+    upper = full(x1.shape, np.nan, dtype=np.float64)
+    middle = full(x1.shape, np.nan, dtype=np.float64)
+    lower = full(x1.shape, np.nan, dtype=np.float64)
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    run = 0  # 最近连续相同的有效值个数
+    last = np.nan
+    for i in range(x1.shape[0]):
+        v = x1[i]
+        if v == v:
+            n += 1
+            d = v - mean
+            mean += d / n
+            m2 += d * (v - mean)
+            run = run + 1 if v == last else 1
+            last = v
+        if i >= window:
+            v = x1[i - window]
+            if v == v:
+                n -= 1
+                if n == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    d = v - mean
+                    mean -= d / n
+                    m2 -= d * (v - mean)
+        if run >= n > 0:
+            # 窗口内的值全部相同，直接置为精确值，否则增删的残余误差会让标准差不为0
+            mean, m2 = last, 0.0
+        elif (i + 1) % window == 0:
+            # 每隔window步用窗口内的数据重算一次，防止误差累积
+            n, mean, m2 = _mean_m2(x1[i + 1 - window:i + 1])
+        if n >= min_periods:
+            std = np.sqrt(max(m2, 0.0) / n)
+            upper[i] = mean + std * nbdevup
+            middle[i] = mean
+            lower[i] = mean - std * nbdevdn
+    return upper, middle, lower
+
+
+@guvectorize([(float64[:], int64, int64, float64[:])], '(n),(),()->(n)', nopython=True, cache=True)
+def _roll_mean(x1, window, min_periods, out):
+    """same as `rolling_mean(window, min_samples=min_periods)`, add the entering value and subtract the leaving one
+    滚动均值，新值加入旧值移出"""
+    s = 0.0
+    n = 0
+    for i in range(x1.shape[0]):
+        v = x1[i]
+        if v == v:
+            s += v
+            n += 1
+        if i >= window:
+            v = x1[i - window]
+            if v == v:
+                s -= v
+                n -= 1
+        # 除法放在条件外且除数不为0，防止编译器提前计算0/0触发gufunc的浮点异常警告
+        m = s / max(n, 1)
+        out[i] = m if n >= min_periods else np.nan
+
+
+@guvectorize([(float64[:], float64[:], int64, int64, float64[:])], '(n),(n),(),()->(n)', nopython=True, cache=True)
+def _roll_midprice(high, low, window, min_periods, out):
+    """(rolling_max(high) + rolling_min(low)) / 2, the extremes are kept by two monotonic deques
+    区间最高最低价使用单调队列维护"""
+    q_max = np.empty(window, dtype=np.int64)
+    q_min = np.empty(window, dtype=np.int64)
+    h_max, n_max = 0, 0
+    h_min, n_min = 0, 0
+    c_h, c_l = 0, 0  # 窗口内有效值个数
+    for i in range(high.shape[0]):
+        if i >= window:
+            j = i - window
+            if high[j] == high[j]:
+                c_h -= 1
+            if low[j] == low[j]:
+                c_l -= 1
+            if n_max > 0 and q_max[h_max] == j:
+                h_max = (h_max + 1) % window
+                n_max -= 1
+            if n_min > 0 and q_min[h_min] == j:
+                h_min = (h_min + 1) % window
+                n_min -= 1
+        if high[i] == high[i]:
+            c_h += 1
+            while n_max > 0 and high[q_max[(h_max + n_max - 1) % window]] <= high[i]:
+                n_max -= 1
+            q_max[(h_max + n_max) % window] = i
+            n_max += 1
+        if low[i] == low[i]:
+            c_l += 1
+            while n_min > 0 and low[q_min[(h_min + n_min - 1) % window]] >= low[i]:
+                n_min -= 1
+            q_min[(h_min + n_min) % window] = i
+            n_min += 1
+        out[i] = np.nan
+        if c_h >= min_periods and c_l >= min_periods and c_h > 0 and c_l > 0:
+            out[i] = (high[q_max[h_max]] + low[q_min[h_min]]) / 2
@@ -1,40 +1,86 @@
 from math import ceil, floor
+from typing import Optional
 
-from polars import Expr, struct
+from polars import Expr, Float64, Struct, Field, struct
 
+import polars_ta
+from polars_ta.ta._nb import _dema, _tema, _trima, _kama, _bbands, _ewm_mean, _roll_mean, _roll_midprice
 from polars_ta.ta.operators import MAX
 from polars_ta.ta.operators import MIN
-from polars_ta.ta.statistic import STDDEV
+from polars_ta.utils.numba_ import batches_i1_o1, batches_i1_o2, batches_i2_o1, struct_to_numpy
 from polars_ta.wq.time_series import ts_decay_linear as WMA  # noqa
-from polars_ta.wq.time_series import ts_mean as SMA  # noqa
+from polars_ta.wq.time_series import ts_mean
 
 
 def BBANDS(close: Expr, timeperiod: float = 5.0, nbdevup: float = 2.0, nbdevdn: float = 2.0, matype: float = 0.0) -> Expr:
-    middleband = SMA(close, timeperiod)
-    stddev = STDDEV(close, timeperiod)
-    return struct(upperband=middleband + stddev * nbdevup, middleband=middleband, lowerband=middleband - stddev * nbdevdn)
+    """
+
+    Notes
+    -----
+    `SMA` and `STDDEV` are computed in one pass, instead of two separate rolling windows
+    `SMA`与`STDDEV`在一次循环中完成，不再分两次滚动计算
+
+    """
+    timeperiod = int(timeperiod)
+    minp = polars_ta.MIN_SAMPLES or timeperiod
+    names = ['upperband', 'middleband', 'lowerband']
+    dtype = Struct([Field(f"column_{i}", Float64) for i in range(3)])
+    return close.map_batches(lambda x1: batches_i1_o2(x1.to_numpy().astype(float, copy=False), _bbands, timeperiod, minp, nbdevup, nbdevdn, skip_nan=True),
+                             return_dtype=dtype).struct.rename_fields(names)
 
 
 def DEMA(close: Expr, timeperiod: int = 30) -> Expr:
-    EMA1 = EMA(close, timeperiod)
-    EMA2 = EMA(EMA1, timeperiod)
-    return EMA1 * 2 - EMA2
+    """EMA1 * 2 - EMA2
+
+    Notes
+    -----
+    The two chained EMA are computed in one pass, same as `EMA(EMA(close))`
+    两层EMA在一次循环中完成，结果与`EMA(EMA(close))`嵌套相同
+
+    """
+    alpha = 2 / (1 + timeperiod)
+    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _dema, alpha, timeperiod, skip_nan=True), return_dtype=Float64)
 
 
-def EMA(close: Expr, timeperiod: int = 30) -> Expr:
+def EMA(close: Expr, timeperiod: int = 30, use_numba: Optional[bool] = None) -> Expr:
     """
 
+    Parameters
+    ----------
+    close
+    timeperiod
+    use_numba
+        使用numba实现的递推，跳过`ewm_mean`的调用开销，适合大量短序列分组计算。为`None`时参考`polars_ta.USE_NUMBA`
+
     References
     ----------
     https://pola-rs.github.io/polars/py-polars/html/reference/expressions/api/polars.Expr.ewm_mean.html#polars.Expr.ewm_mean
 
     """
+    if use_numba or (use_numba is None and polars_ta.USE_NUMBA):
+        return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _ewm_mean, 2 / (1 + timeperiod), timeperiod, skip_nan=True), return_dtype=Float64)
     # 相当于alpha=2/(1+timeperiod)
     return close.ewm_mean(span=timeperiod, adjust=False, min_samples=timeperiod)
 
 
 def KAMA(close: Expr, timeperiod: int = 30) -> Expr:
-    raise
+    """Kaufman Adaptive Moving Average, fast=2, slow=30
+
+    Notes
+    -----
+    The efficiency ratio and the variable-alpha recurrence are computed in one pass.
+    The first value is at `timeperiod`, seeded with the previous close, same as TA-Lib
+    效率系数与变系数递推在一次循环中完成。第一个值出现在`timeperiod`处，以前一个收盘价为初值，与TA-Lib一致
+
+    References
+    ----------
+    https://github.com/TA-Lib/ta-lib/blob/main/src/ta_func/ta_KAMA.c
+
+    """
+    if timeperiod == 1:
+        # 与TA-Lib一致，周期为1时不平滑
+        return close.cast(Float64)
+    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _kama, timeperiod, 2, 30, skip_nan=True), return_dtype=Float64)
 
 
 def MIDPOINT(close: Expr, timeperiod: int = 14) -> Expr:
@@ -45,6 +91,9 @@ def MIDPOINT(close: Expr, timeperiod: int = 14) -> Expr:
     https://github.com/TA-Lib/ta-lib/blob/main/src/ta_func/ta_MIDPOINT.c#L198
 
     """
+    if polars_ta.USE_NUMBA:
+        minp = polars_ta.MIN_SAMPLES or timeperiod
+        return close.map_batches(lambda x1: batches_i2_o1([x1.to_numpy().astype(float, copy=False)] * 2, _roll_midprice, timeperiod, minp, skip_nan=True), return_dtype=Float64)
     return (MAX(close, timeperiod) + MIN(close, timeperiod)) / 2
 
 
@@ -56,37 +105,67 @@ def MIDPRICE(high: Expr, low: Expr, timeperiod: int = 14) -> Expr:
     https://github.com/TA-Lib/ta-lib/blob/main/src/ta_func/ta_MIDPRICE.c#L202
 
     """
+    if polars_ta.USE_NUMBA:
+        minp = polars_ta.MIN_SAMPLES or timeperiod
+        return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _roll_midprice, timeperiod, minp, skip_nan=True), return_dtype=Float64)
     return (MAX(high, timeperiod) + MIN(low, timeperiod)) / 2
 
 
-def RMA(close: Expr, timeperiod: int = 30) -> Expr:
+def RMA(close: Expr, timeperiod: int = 30, use_numba: Optional[bool] = None) -> Expr:
     """TA-Lib does not provide this algorithm explicitly, it is just put here for convenience
     TA-Lib没有明确的提供此算法，这里只是为了调用方便而放在此处
 
+    Parameters
+    ----------
+    close
+    timeperiod
+    use_numba
+        使用numba实现的递推，跳过`ewm_mean`的调用开销，适合大量短序列分组计算。为`None`时参考`polars_ta.USE_NUMBA`
+
     References
     ----------
     https://pola-rs.github.io/polars/py-polars/html/reference/expressions/api/polars.Expr.ewm_mean.html#polars.Expr.ewm_mean
     https://github.com/twopirllc/pandas-ta/blob/main/pandas_ta/overlap/rma.py
 
     """
+    if use_numba or (use_numba is None and polars_ta.USE_NUMBA):
+        return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _ewm_mean, 1 / timeperiod, timeperiod, skip_nan=True), return_dtype=Float64)
     return close.ewm_mean(alpha=1 / timeperiod, adjust=False, min_samples=timeperiod)
 
 
+def SMA(x: Expr, d: int = 5, min_samples: Optional[int] = None) -> Expr:
+    """Same as `ts_mean`. When `polars_ta.USE_NUMBA` is set, a numba gufunc is used
+    与`ts_mean`相同。设置`polars_ta.USE_NUMBA`后使用numba实现"""
+    if polars_ta.USE_NUMBA:
+        minp = min_samples or polars_ta.MIN_SAMPLES or d
+        return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _roll_mean, d, minp, skip_nan=True), return_dtype=Float64)
+    return ts_mean(x, d, min_samples)
+
+
 def TEMA(close: Expr, timeperiod: int = 30) -> Expr:
-    """
+    """(EMA1 - EMA2) * 3 + EMA3
 
     Notes
     -----
-    todo: if the nesting level is too deep, maybe call talib.TEMA directly
-    嵌套层数过多，也许直接调用talib.TEMA更快
+    The three chained EMA are computed in one pass, same as `EMA(EMA(EMA(close)))`
+    三层EMA在一次循环中完成，结果与`EMA(EMA(EMA(close)))`嵌套相同
 
     """
-    EMA1 = EMA(close, timeperiod)
-    EMA2 = EMA(EMA1, timeperiod)
-    EMA3 = EMA(EMA2, timeperiod)
-    return (EMA1 - EMA2) * 3 + EMA3
+    alpha = 2 / (1 + timeperiod)
+    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _tema, alpha, timeperiod, skip_nan=True), return_dtype=Float64)
 
 
 def TRIMA(close: Expr, timeperiod: int = 30) -> Expr:
-    SMA1 = SMA(close, ceil(timeperiod / 2))
-    return SMA(SMA1, floor(timeperiod / 2) + 1)
+    """SMA(SMA(close, ceil(n/2)), floor(n/2)+1)
+
+    Notes
+    -----
+    The two chained SMA are computed in one pass, same as `SMA(SMA(close))`
+    两层SMA在一次循环中完成，结果与`SMA(SMA(close))`嵌套相同
+
+    """
+    n1 = ceil(timeperiod / 2)
+    n2 = floor(timeperiod / 2) + 1
+    minp1 = polars_ta.MIN_SAMPLES or n1
+    minp2 = polars_ta.MIN_SAMPLES or n2
+    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _trima, n1, n2, minp1, minp2, skip_nan=True), return_dtype=Float64)
@@ -1,8 +1,13 @@
 # generated by codegen_talib.py
+from functools import partial
+
 import talib as _ta
 from polars import Expr, struct, Struct, Field, Float64, Int32
 
-from polars_ta.utils.numba_ import batches_i1_o1, batches_i1_o2, batches_i2_o1, batches_i2_o2, struct_to_numpy
+from polars_ta.utils.talib_shim import make_talib_cb
+
+
+_cb_HT_DCPERIOD = make_talib_cb(_ta.HT_DCPERIOD, 1, 1)
 
 
 def HT_DCPERIOD(close: Expr) -> Expr:  # ['real']
@@ -16,7 +21,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.HT_DCPERIOD), return_dtype=Float64)
+    return close.map_batches(_cb_HT_DCPERIOD, return_dtype=Float64)
+
+
+_cb_HT_DCPHASE = make_talib_cb(_ta.HT_DCPHASE, 1, 1)
 
 
 def HT_DCPHASE(close: Expr) -> Expr:  # ['real']
@@ -30,7 +38,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.HT_DCPHASE), return_dtype=Float64)
+    return close.map_batches(_cb_HT_DCPHASE, return_dtype=Float64)
+
+
+_cb_HT_PHASOR = make_talib_cb(_ta.HT_PHASOR, 1, 2)
 
 
 def HT_PHASOR(close: Expr) -> Expr:  # ['inphase', 'quadrature']
@@ -46,7 +57,10 @@ Outputs:
     inphase
     quadrature"""
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(2)])
-    return close.map_batches(lambda x1: batches_i1_o2(x1.to_numpy().astype(float), _ta.HT_PHASOR), return_dtype=dtype)
+    return close.map_batches(_cb_HT_PHASOR, return_dtype=dtype)
+
+
+_cb_HT_SINE = make_talib_cb(_ta.HT_SINE, 1, 2)
 
 
 def HT_SINE(close: Expr) -> Expr:  # ['sine', 'leadsine']
@@ -62,7 +76,10 @@ Outputs:
     sine
     leadsine"""
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(2)])
-    return close.map_batches(lambda x1: batches_i1_o2(x1.to_numpy().astype(float), _ta.HT_SINE), return_dtype=dtype)
+    return close.map_batches(_cb_HT_SINE, return_dtype=dtype)
+
+
+_cb_HT_TRENDMODE = make_talib_cb(_ta.HT_TRENDMODE, 1, 1)
 
 
 def HT_TRENDMODE(close: Expr) -> Expr:  # ['integer']
@@ -76,7 +93,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.HT_TRENDMODE), return_dtype=Int32)
+    return close.map_batches(_cb_HT_TRENDMODE, return_dtype=Int32)
+
+
+_cb_ADD = make_talib_cb(_ta.ADD, 2, 1)
 
 
 def ADD(high: Expr, low: Expr) -> Expr:  # ['real']
@@ -91,7 +111,10 @@ Inputs:
     real1: (any ndarray)
 Outputs:
     real"""
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.ADD), return_dtype=Float64)
+    return struct(f0=high, f1=low).map_batches(_cb_ADD, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_DIV = make_talib_cb(_ta.DIV, 2, 1)
 
 
 def DIV(high: Expr, low: Expr) -> Expr:  # ['real']
@@ -106,7 +129,10 @@ Inputs:
     real1: (any ndarray)
 Outputs:
     real"""
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.DIV), return_dtype=Float64)
+    return struct(f0=high, f1=low).map_batches(_cb_DIV, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_MAX = make_talib_cb(_ta.MAX, 1, 1)
 
 
 def MAX(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['real']
@@ -122,7 +148,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.MAX, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_MAX, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_MAXINDEX = make_talib_cb(_ta.MAXINDEX, 1, 1)
 
 
 def MAXINDEX(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['integer']
@@ -138,7 +167,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.MAXINDEX, timeperiod), return_dtype=Int32)
+    return close.map_batches(partial(_cb_MAXINDEX, timeperiod=timeperiod), return_dtype=Int32)
+
+
+_cb_MIN = make_talib_cb(_ta.MIN, 1, 1)
 
 
 def MIN(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['real']
@@ -154,7 +186,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.MIN, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_MIN, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_MININDEX = make_talib_cb(_ta.MININDEX, 1, 1)
 
 
 def MININDEX(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['integer']
@@ -170,7 +205,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.MININDEX, timeperiod), return_dtype=Int32)
+    return close.map_batches(partial(_cb_MININDEX, timeperiod=timeperiod), return_dtype=Int32)
+
+
+_cb_MINMAX = make_talib_cb(_ta.MINMAX, 1, 2)
 
 
 def MINMAX(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['min', 'max']
@@ -188,7 +226,10 @@ Outputs:
     min
     max"""
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(2)])
-    return close.map_batches(lambda x1: batches_i1_o2(x1.to_numpy().astype(float), _ta.MINMAX, timeperiod), return_dtype=dtype)
+    return close.map_batches(partial(_cb_MINMAX, timeperiod=timeperiod), return_dtype=dtype)
+
+
+_cb_MINMAXINDEX = make_talib_cb(_ta.MINMAXINDEX, 1, 2)
 
 
 def MINMAXINDEX(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['minidx', 'maxidx']
@@ -206,7 +247,10 @@ Outputs:
     minidx
     maxidx"""
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(2)])
-    return close.map_batches(lambda x1: batches_i1_o2(x1.to_numpy().astype(float), _ta.MINMAXINDEX, timeperiod), return_dtype=dtype)
+    return close.map_batches(partial(_cb_MINMAXINDEX, timeperiod=timeperiod), return_dtype=dtype)
+
+
+_cb_MULT = make_talib_cb(_ta.MULT, 2, 1)
 
 
 def MULT(high: Expr, low: Expr) -> Expr:  # ['real']
@@ -221,7 +265,10 @@ Inputs:
     real1: (any ndarray)
 Outputs:
     real"""
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.MULT), return_dtype=Float64)
+    return struct(f0=high, f1=low).map_batches(_cb_MULT, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_SUB = make_talib_cb(_ta.SUB, 2, 1)
 
 
 def SUB(high: Expr, low: Expr) -> Expr:  # ['real']
@@ -236,7 +283,10 @@ Inputs:
     real1: (any ndarray)
 Outputs:
     real"""
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.SUB), return_dtype=Float64)
+    return struct(f0=high, f1=low).map_batches(_cb_SUB, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_SUM = make_talib_cb(_ta.SUM, 1, 1)
 
 
 def SUM(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['real']
@@ -252,7 +302,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.SUM, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_SUM, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_ACOS = make_talib_cb(_ta.ACOS, 1, 1)
 
 
 def ACOS(close: Expr) -> Expr:  # ['real']
@@ -266,7 +319,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.ACOS), return_dtype=Float64)
+    return close.map_batches(_cb_ACOS, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_ASIN = make_talib_cb(_ta.ASIN, 1, 1)
 
 
 def ASIN(close: Expr) -> Expr:  # ['real']
@@ -280,7 +336,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.ASIN), return_dtype=Float64)
+    return close.map_batches(_cb_ASIN, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_ATAN = make_talib_cb(_ta.ATAN, 1, 1)
 
 
 def ATAN(close: Expr) -> Expr:  # ['real']
@@ -294,7 +353,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.ATAN), return_dtype=Float64)
+    return close.map_batches(_cb_ATAN, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_CEIL = make_talib_cb(_ta.CEIL, 1, 1)
 
 
 def CEIL(close: Expr) -> Expr:  # ['real']
@@ -308,7 +370,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.CEIL), return_dtype=Float64)
+    return close.map_batches(_cb_CEIL, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_COS = make_talib_cb(_ta.COS, 1, 1)
 
 
 def COS(close: Expr) -> Expr:  # ['real']
@@ -322,7 +387,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.COS), return_dtype=Float64)
+    return close.map_batches(_cb_COS, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_COSH = make_talib_cb(_ta.COSH, 1, 1)
 
 
 def COSH(close: Expr) -> Expr:  # ['real']
@@ -336,7 +404,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.COSH), return_dtype=Float64)
+    return close.map_batches(_cb_COSH, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_EXP = make_talib_cb(_ta.EXP, 1, 1)
 
 
 def EXP(close: Expr) -> Expr:  # ['real']
@@ -350,7 +421,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.EXP), return_dtype=Float64)
+    return close.map_batches(_cb_EXP, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_FLOOR = make_talib_cb(_ta.FLOOR, 1, 1)
 
 
 def FLOOR(close: Expr) -> Expr:  # ['real']
@@ -364,7 +438,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.FLOOR), return_dtype=Float64)
+    return close.map_batches(_cb_FLOOR, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_LN = make_talib_cb(_ta.LN, 1, 1)
 
 
 def LN(close: Expr) -> Expr:  # ['real']
@@ -378,7 +455,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.LN), return_dtype=Float64)
+    return close.map_batches(_cb_LN, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_LOG10 = make_talib_cb(_ta.LOG10, 1, 1)
 
 
 def LOG10(close: Expr) -> Expr:  # ['real']
@@ -392,7 +472,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.LOG10), return_dtype=Float64)
+    return close.map_batches(_cb_LOG10, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_SIN = make_talib_cb(_ta.SIN, 1, 1)
 
 
 def SIN(close: Expr) -> Expr:  # ['real']
@@ -406,7 +489,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.SIN), return_dtype=Float64)
+    return close.map_batches(_cb_SIN, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_SINH = make_talib_cb(_ta.SINH, 1, 1)
 
 
 def SINH(close: Expr) -> Expr:  # ['real']
@@ -420,7 +506,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.SINH), return_dtype=Float64)
+    return close.map_batches(_cb_SINH, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_SQRT = make_talib_cb(_ta.SQRT, 1, 1)
 
 
 def SQRT(close: Expr) -> Expr:  # ['real']
@@ -434,7 +523,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.SQRT), return_dtype=Float64)
+    return close.map_batches(_cb_SQRT, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_TAN = make_talib_cb(_ta.TAN, 1, 1)
 
 
 def TAN(close: Expr) -> Expr:  # ['real']
@@ -448,7 +540,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.TAN), return_dtype=Float64)
+    return close.map_batches(_cb_TAN, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_TANH = make_talib_cb(_ta.TANH, 1, 1)
 
 
 def TANH(close: Expr) -> Expr:  # ['real']
@@ -462,7 +557,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.TANH), return_dtype=Float64)
+    return close.map_batches(_cb_TANH, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_ADX = make_talib_cb(_ta.ADX, 3, 1)
 
 
 def ADX(high: Expr, low: Expr, close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -478,7 +576,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _ta.ADX, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close).map_batches(partial(_cb_ADX, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_ADXR = make_talib_cb(_ta.ADXR, 3, 1)
 
 
 def ADXR(high: Expr, low: Expr, close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -494,7 +595,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _ta.ADXR, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close).map_batches(partial(_cb_ADXR, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_APO = make_talib_cb(_ta.APO, 1, 1)
 
 
 def APO(close: Expr, fastperiod: float = 12.0, slowperiod: float = 26.0, matype: float = 0.0) -> Expr:  # ['real']
@@ -512,7 +616,10 @@ Parameters:
     matype: 0 (Simple Moving Average)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.APO, fastperiod, slowperiod, matype), return_dtype=Float64)
+    return close.map_batches(partial(_cb_APO, fastperiod=fastperiod, slowperiod=slowperiod, matype=matype), return_dtype=Float64)
+
+
+_cb_AROON = make_talib_cb(_ta.AROON, 2, 2)
 
 
 def AROON(high: Expr, low: Expr, timeperiod: float = 14.0) -> Expr:  # ['aroondown', 'aroonup']
@@ -530,7 +637,10 @@ Outputs:
     aroondown
     aroonup"""
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(2)])
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o2(struct_to_numpy(xx, 2, dtype=float), _ta.AROON, timeperiod), return_dtype=dtype)
+    return struct(f0=high, f1=low).map_batches(partial(_cb_AROON, timeperiod=timeperiod), return_dtype=dtype)
+
+
+_cb_AROONOSC = make_talib_cb(_ta.AROONOSC, 2, 1)
 
 
 def AROONOSC(high: Expr, low: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -546,7 +656,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.AROONOSC, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low).map_batches(partial(_cb_AROONOSC, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_BOP = make_talib_cb(_ta.BOP, 4, 1)
 
 
 def BOP(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['real']
@@ -560,7 +673,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     real"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.BOP), return_dtype=Float64)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_BOP, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_CCI = make_talib_cb(_ta.CCI, 3, 1)
 
 
 def CCI(high: Expr, low: Expr, close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -576,7 +692,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _ta.CCI, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close).map_batches(partial(_cb_CCI, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_CMO = make_talib_cb(_ta.CMO, 1, 1)
 
 
 def CMO(close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -592,7 +711,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.CMO, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_CMO, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_DX = make_talib_cb(_ta.DX, 3, 1)
 
 
 def DX(high: Expr, low: Expr, close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -608,7 +730,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _ta.DX, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close).map_batches(partial(_cb_DX, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_MACD = make_talib_cb(_ta.MACD, 1, 3)
 
 
 def MACD(close: Expr, fastperiod: float = 12.0, slowperiod: float = 26.0, signalperiod: float = 9.0) -> Expr:  # ['macd', 'macdsignal', 'macdhist']
@@ -629,7 +754,10 @@ Outputs:
     macdsignal
     macdhist"""
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(3)])
-    return close.map_batches(lambda x1: batches_i1_o2(x1.to_numpy().astype(float), _ta.MACD, fastperiod, slowperiod, signalperiod), return_dtype=dtype)
+    return close.map_batches(partial(_cb_MACD, fastperiod=fastperiod, slowperiod=slowperiod, signalperiod=signalperiod), return_dtype=dtype)
+
+
+_cb_MACDEXT = make_talib_cb(_ta.MACDEXT, 1, 3)
 
 
 def MACDEXT(close: Expr, fastperiod: float = 12.0, fastmatype: float = 0.0, slowperiod: float = 26.0, slowmatype: float = 0.0, signalperiod: float = 9.0, signalmatype: float = 0.0) -> Expr:  # ['macd', 'macdsignal', 'macdhist']
@@ -653,7 +781,10 @@ Outputs:
     macdsignal
     macdhist"""
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(3)])
-    return close.map_batches(lambda x1: batches_i1_o2(x1.to_numpy().astype(float), _ta.MACDEXT, fastperiod, fastmatype, slowperiod, slowmatype, signalperiod, signalmatype), return_dtype=dtype)
+    return close.map_batches(partial(_cb_MACDEXT, fastperiod=fastperiod, fastmatype=fastmatype, slowperiod=slowperiod, slowmatype=slowmatype, signalperiod=signalperiod, signalmatype=signalmatype), return_dtype=dtype)
+
+
+_cb_MACDFIX = make_talib_cb(_ta.MACDFIX, 1, 3)
 
 
 def MACDFIX(close: Expr, signalperiod: float = 9.0) -> Expr:  # ['macd', 'macdsignal', 'macdhist']
@@ -672,7 +803,10 @@ Outputs:
     macdsignal
     macdhist"""
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(3)])
-    return close.map_batches(lambda x1: batches_i1_o2(x1.to_numpy().astype(float), _ta.MACDFIX, signalperiod), return_dtype=dtype)
+    return close.map_batches(partial(_cb_MACDFIX, signalperiod=signalperiod), return_dtype=dtype)
+
+
+_cb_MFI = make_talib_cb(_ta.MFI, 4, 1)
 
 
 def MFI(high: Expr, low: Expr, close: Expr, volume: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -688,7 +822,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close, f3=volume).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.MFI, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close, f3=volume).map_batches(partial(_cb_MFI, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_MINUS_DI = make_talib_cb(_ta.MINUS_DI, 3, 1)
 
 
 def MINUS_DI(high: Expr, low: Expr, close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -704,7 +841,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _ta.MINUS_DI, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close).map_batches(partial(_cb_MINUS_DI, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_MINUS_DM = make_talib_cb(_ta.MINUS_DM, 2, 1)
 
 
 def MINUS_DM(high: Expr, low: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -720,7 +860,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.MINUS_DM, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low).map_batches(partial(_cb_MINUS_DM, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_MOM = make_talib_cb(_ta.MOM, 1, 1)
 
 
 def MOM(close: Expr, timeperiod: float = 10.0) -> Expr:  # ['real']
@@ -736,7 +879,10 @@ Parameters:
     timeperiod: 10
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.MOM, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_MOM, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_PLUS_DI = make_talib_cb(_ta.PLUS_DI, 3, 1)
 
 
 def PLUS_DI(high: Expr, low: Expr, close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -752,7 +898,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _ta.PLUS_DI, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close).map_batches(partial(_cb_PLUS_DI, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_PLUS_DM = make_talib_cb(_ta.PLUS_DM, 2, 1)
 
 
 def PLUS_DM(high: Expr, low: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -768,7 +917,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.PLUS_DM, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low).map_batches(partial(_cb_PLUS_DM, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_PPO = make_talib_cb(_ta.PPO, 1, 1)
 
 
 def PPO(close: Expr, fastperiod: float = 12.0, slowperiod: float = 26.0, matype: float = 0.0) -> Expr:  # ['real']
@@ -786,7 +938,10 @@ Parameters:
     matype: 0 (Simple Moving Average)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.PPO, fastperiod, slowperiod, matype), return_dtype=Float64)
+    return close.map_batches(partial(_cb_PPO, fastperiod=fastperiod, slowperiod=slowperiod, matype=matype), return_dtype=Float64)
+
+
+_cb_ROC = make_talib_cb(_ta.ROC, 1, 1)
 
 
 def ROC(close: Expr, timeperiod: float = 10.0) -> Expr:  # ['real']
@@ -802,7 +957,10 @@ Parameters:
     timeperiod: 10
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.ROC, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_ROC, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_ROCP = make_talib_cb(_ta.ROCP, 1, 1)
 
 
 def ROCP(close: Expr, timeperiod: float = 10.0) -> Expr:  # ['real']
@@ -818,7 +976,10 @@ Parameters:
     timeperiod: 10
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.ROCP, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_ROCP, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_ROCR = make_talib_cb(_ta.ROCR, 1, 1)
 
 
 def ROCR(close: Expr, timeperiod: float = 10.0) -> Expr:  # ['real']
@@ -834,7 +995,10 @@ Parameters:
     timeperiod: 10
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.ROCR, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_ROCR, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_ROCR100 = make_talib_cb(_ta.ROCR100, 1, 1)
 
 
 def ROCR100(close: Expr, timeperiod: float = 10.0) -> Expr:  # ['real']
@@ -850,7 +1014,10 @@ Parameters:
     timeperiod: 10
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.ROCR100, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_ROCR100, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_RSI = make_talib_cb(_ta.RSI, 1, 1)
 
 
 def RSI(close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -866,7 +1033,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.RSI, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_RSI, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_STOCH = make_talib_cb(_ta.STOCH, 3, 2)
 
 
 def STOCH(high: Expr, low: Expr, close: Expr, fastk_period: float = 5.0, slowk_period: float = 3.0, slowk_matype: float = 0.0, slowd_period: float = 3.0, slowd_matype: float = 0.0) -> Expr:  # ['slowk', 'slowd']
@@ -888,7 +1058,10 @@ Outputs:
     slowk
     slowd"""
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(2)])
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o2(struct_to_numpy(xx, 3, dtype=float), _ta.STOCH, fastk_period, slowk_period, slowk_matype, slowd_period, slowd_matype), return_dtype=dtype)
+    return struct(f0=high, f1=low, f2=close).map_batches(partial(_cb_STOCH, fastk_period=fastk_period, slowk_period=slowk_period, slowk_matype=slowk_matype, slowd_period=slowd_period, slowd_matype=slowd_matype), return_dtype=dtype)
+
+
+_cb_STOCHF = make_talib_cb(_ta.STOCHF, 3, 2)
 
 
 def STOCHF(high: Expr, low: Expr, close: Expr, fastk_period: float = 5.0, fastd_period: float = 3.0, fastd_matype: float = 0.0) -> Expr:  # ['fastk', 'fastd']
@@ -908,7 +1081,10 @@ Outputs:
     fastk
     fastd"""
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(2)])
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o2(struct_to_numpy(xx, 3, dtype=float), _ta.STOCHF, fastk_period, fastd_period, fastd_matype), return_dtype=dtype)
+    return struct(f0=high, f1=low, f2=close).map_batches(partial(_cb_STOCHF, fastk_period=fastk_period, fastd_period=fastd_period, fastd_matype=fastd_matype), return_dtype=dtype)
+
+
+_cb_STOCHRSI = make_talib_cb(_ta.STOCHRSI, 1, 2)
 
 
 def STOCHRSI(close: Expr, timeperiod: float = 14.0, fastk_period: float = 5.0, fastd_period: float = 3.0, fastd_matype: float = 0.0) -> Expr:  # ['fastk', 'fastd']
@@ -929,7 +1105,10 @@ Outputs:
     fastk
     fastd"""
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(2)])
-    return close.map_batches(lambda x1: batches_i1_o2(x1.to_numpy().astype(float), _ta.STOCHRSI, timeperiod, fastk_period, fastd_period, fastd_matype), return_dtype=dtype)
+    return close.map_batches(partial(_cb_STOCHRSI, timeperiod=timeperiod, fastk_period=fastk_period, fastd_period=fastd_period, fastd_matype=fastd_matype), return_dtype=dtype)
+
+
+_cb_TRIX = make_talib_cb(_ta.TRIX, 1, 1)
 
 
 def TRIX(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['real']
@@ -945,7 +1124,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.TRIX, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_TRIX, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_ULTOSC = make_talib_cb(_ta.ULTOSC, 3, 1)
 
 
 def ULTOSC(high: Expr, low: Expr, close: Expr, timeperiod1: float = 7.0, timeperiod2: float = 14.0, timeperiod3: float = 28.0) -> Expr:  # ['real']
@@ -963,7 +1145,10 @@ Parameters:
     timeperiod3: 28
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _ta.ULTOSC, timeperiod1, timeperiod2, timeperiod3), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close).map_batches(partial(_cb_ULTOSC, timeperiod1=timeperiod1, timeperiod2=timeperiod2, timeperiod3=timeperiod3), return_dtype=Float64)
+
+
+_cb_WILLR = make_talib_cb(_ta.WILLR, 3, 1)
 
 
 def WILLR(high: Expr, low: Expr, close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -979,7 +1164,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _ta.WILLR, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close).map_batches(partial(_cb_WILLR, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_BBANDS = make_talib_cb(_ta.BBANDS, 1, 3)
 
 
 def BBANDS(close: Expr, timeperiod: float = 5.0, nbdevup: float = 2.0, nbdevdn: float = 2.0, matype: float = 0.0) -> Expr:  # ['upperband', 'middleband', 'lowerband']
@@ -1001,7 +1189,10 @@ Outputs:
     middleband
     lowerband"""
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(3)])
-    return close.map_batches(lambda x1: batches_i1_o2(x1.to_numpy().astype(float), _ta.BBANDS, timeperiod, nbdevup, nbdevdn, matype), return_dtype=dtype)
+    return close.map_batches(partial(_cb_BBANDS, timeperiod=timeperiod, nbdevup=nbdevup, nbdevdn=nbdevdn, matype=matype), return_dtype=dtype)
+
+
+_cb_DEMA = make_talib_cb(_ta.DEMA, 1, 1)
 
 
 def DEMA(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['real']
@@ -1017,7 +1208,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.DEMA, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_DEMA, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_EMA = make_talib_cb(_ta.EMA, 1, 1)
 
 
 def EMA(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['real']
@@ -1033,7 +1227,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.EMA, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_EMA, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_HT_TRENDLINE = make_talib_cb(_ta.HT_TRENDLINE, 1, 1)
 
 
 def HT_TRENDLINE(close: Expr) -> Expr:  # ['real']
@@ -1047,7 +1244,10 @@ Inputs:
     real: (any ndarray)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.HT_TRENDLINE), return_dtype=Float64)
+    return close.map_batches(_cb_HT_TRENDLINE, return_dtype=Float64)
+
+
+_cb_KAMA = make_talib_cb(_ta.KAMA, 1, 1)
 
 
 def KAMA(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['real']
@@ -1063,7 +1263,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.KAMA, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_KAMA, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_MA = make_talib_cb(_ta.MA, 1, 1)
 
 
 def MA(close: Expr, timeperiod: float = 30.0, matype: float = 0.0) -> Expr:  # ['real']
@@ -1080,7 +1283,10 @@ Parameters:
     matype: 0 (Simple Moving Average)
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.MA, timeperiod, matype), return_dtype=Float64)
+    return close.map_batches(partial(_cb_MA, timeperiod=timeperiod, matype=matype), return_dtype=Float64)
+
+
+_cb_MAMA = make_talib_cb(_ta.MAMA, 1, 2)
 
 
 def MAMA(close: Expr, fastlimit: float = 0.5, slowlimit: float = 0.05) -> Expr:  # ['mama', 'fama']
@@ -1099,7 +1305,10 @@ Outputs:
     mama
     fama"""
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(2)])
-    return close.map_batches(lambda x1: batches_i1_o2(x1.to_numpy().astype(float), _ta.MAMA, fastlimit, slowlimit), return_dtype=dtype)
+    return close.map_batches(partial(_cb_MAMA, fastlimit=fastlimit, slowlimit=slowlimit), return_dtype=dtype)
+
+
+_cb_MAVP = make_talib_cb(_ta.MAVP, 2, 1)
 
 
 def MAVP(close: Expr, periods: Expr, minperiod: float = 2.0, maxperiod: float = 30.0, matype: float = 0.0) -> Expr:  # ['real']
@@ -1118,7 +1327,10 @@ Parameters:
     matype: 0 (Simple Moving Average)
 Outputs:
     real"""
-    return struct(f0=close, f1=periods).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.MAVP, minperiod, maxperiod, matype), return_dtype=Float64)
+    return struct(f0=close, f1=periods).map_batches(partial(_cb_MAVP, minperiod=minperiod, maxperiod=maxperiod, matype=matype), return_dtype=Float64)
+
+
+_cb_MIDPOINT = make_talib_cb(_ta.MIDPOINT, 1, 1)
 
 
 def MIDPOINT(close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -1134,7 +1346,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.MIDPOINT, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_MIDPOINT, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_MIDPRICE = make_talib_cb(_ta.MIDPRICE, 2, 1)
 
 
 def MIDPRICE(high: Expr, low: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -1150,7 +1365,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.MIDPRICE, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low).map_batches(partial(_cb_MIDPRICE, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_SAR = make_talib_cb(_ta.SAR, 2, 1)
 
 
 def SAR(high: Expr, low: Expr, acceleration: float = 0.02, maximum: float = 0.2) -> Expr:  # ['real']
@@ -1167,7 +1385,10 @@ Parameters:
     maximum: 0.2
 Outputs:
     real"""
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.SAR, acceleration, maximum), return_dtype=Float64)
+    return struct(f0=high, f1=low).map_batches(partial(_cb_SAR, acceleration=acceleration, maximum=maximum), return_dtype=Float64)
+
+
+_cb_SAREXT = make_talib_cb(_ta.SAREXT, 2, 1)
 
 
 def SAREXT(high: Expr, low: Expr, startvalue: float = 0.0, offsetonreverse: float = 0.0, accelerationinitlong: float = 0.02, accelerationlong: float = 0.02, accelerationmaxlong: float = 0.2, accelerationinitshort: float = 0.02, accelerationshort: float = 0.02, accelerationmaxshort: float = 0.2) -> Expr:  # ['real']
@@ -1190,7 +1411,10 @@ Parameters:
     accelerationmaxshort: 0.2
 Outputs:
     real"""
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.SAREXT, startvalue, offsetonreverse, accelerationinitlong, accelerationlong, accelerationmaxlong, accelerationinitshort, accelerationshort, accelerationmaxshort), return_dtype=Float64)
+    return struct(f0=high, f1=low).map_batches(partial(_cb_SAREXT, startvalue=startvalue, offsetonreverse=offsetonreverse, accelerationinitlong=accelerationinitlong, accelerationlong=accelerationlong, accelerationmaxlong=accelerationmaxlong, accelerationinitshort=accelerationinitshort, accelerationshort=accelerationshort, accelerationmaxshort=accelerationmaxshort), return_dtype=Float64)
+
+
+_cb_SMA = make_talib_cb(_ta.SMA, 1, 1)
 
 
 def SMA(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['real']
@@ -1206,7 +1430,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.SMA, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_SMA, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_T3 = make_talib_cb(_ta.T3, 1, 1)
 
 
 def T3(close: Expr, timeperiod: float = 5.0, vfactor: float = 0.7) -> Expr:  # ['real']
@@ -1223,7 +1450,10 @@ Parameters:
     vfactor: 0.7
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.T3, timeperiod, vfactor), return_dtype=Float64)
+    return close.map_batches(partial(_cb_T3, timeperiod=timeperiod, vfactor=vfactor), return_dtype=Float64)
+
+
+_cb_TEMA = make_talib_cb(_ta.TEMA, 1, 1)
 
 
 def TEMA(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['real']
@@ -1239,7 +1469,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.TEMA, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_TEMA, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_TRIMA = make_talib_cb(_ta.TRIMA, 1, 1)
 
 
 def TRIMA(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['real']
@@ -1255,7 +1488,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.TRIMA, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_TRIMA, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_WMA = make_talib_cb(_ta.WMA, 1, 1)
 
 
 def WMA(close: Expr, timeperiod: float = 30.0) -> Expr:  # ['real']
@@ -1271,7 +1507,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.WMA, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_WMA, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_CDL2CROWS = make_talib_cb(_ta.CDL2CROWS, 4, 1)
 
 
 def CDL2CROWS(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1285,7 +1524,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDL2CROWS), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDL2CROWS, return_dtype=Int32)
+
+
+_cb_CDL3BLACKCROWS = make_talib_cb(_ta.CDL3BLACKCROWS, 4, 1)
 
 
 def CDL3BLACKCROWS(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1299,7 +1541,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDL3BLACKCROWS), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDL3BLACKCROWS, return_dtype=Int32)
+
+
+_cb_CDL3INSIDE = make_talib_cb(_ta.CDL3INSIDE, 4, 1)
 
 
 def CDL3INSIDE(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1313,7 +1558,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDL3INSIDE), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDL3INSIDE, return_dtype=Int32)
+
+
+_cb_CDL3LINESTRIKE = make_talib_cb(_ta.CDL3LINESTRIKE, 4, 1)
 
 
 def CDL3LINESTRIKE(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1327,7 +1575,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDL3LINESTRIKE), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDL3LINESTRIKE, return_dtype=Int32)
+
+
+_cb_CDL3OUTSIDE = make_talib_cb(_ta.CDL3OUTSIDE, 4, 1)
 
 
 def CDL3OUTSIDE(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1341,7 +1592,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDL3OUTSIDE), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDL3OUTSIDE, return_dtype=Int32)
+
+
+_cb_CDL3STARSINSOUTH = make_talib_cb(_ta.CDL3STARSINSOUTH, 4, 1)
 
 
 def CDL3STARSINSOUTH(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1355,7 +1609,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDL3STARSINSOUTH), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDL3STARSINSOUTH, return_dtype=Int32)
+
+
+_cb_CDL3WHITESOLDIERS = make_talib_cb(_ta.CDL3WHITESOLDIERS, 4, 1)
 
 
 def CDL3WHITESOLDIERS(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1369,7 +1626,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDL3WHITESOLDIERS), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDL3WHITESOLDIERS, return_dtype=Int32)
+
+
+_cb_CDLABANDONEDBABY = make_talib_cb(_ta.CDLABANDONEDBABY, 4, 1)
 
 
 def CDLABANDONEDBABY(open: Expr, high: Expr, low: Expr, close: Expr, penetration: float = 0.3) -> Expr:  # ['integer']
@@ -1385,7 +1645,10 @@ Parameters:
     penetration: 0.3
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLABANDONEDBABY, penetration), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(partial(_cb_CDLABANDONEDBABY, penetration=penetration), return_dtype=Int32)
+
+
+_cb_CDLADVANCEBLOCK = make_talib_cb(_ta.CDLADVANCEBLOCK, 4, 1)
 
 
 def CDLADVANCEBLOCK(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1399,7 +1662,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLADVANCEBLOCK), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLADVANCEBLOCK, return_dtype=Int32)
+
+
+_cb_CDLBELTHOLD = make_talib_cb(_ta.CDLBELTHOLD, 4, 1)
 
 
 def CDLBELTHOLD(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1413,7 +1679,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLBELTHOLD), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLBELTHOLD, return_dtype=Int32)
+
+
+_cb_CDLBREAKAWAY = make_talib_cb(_ta.CDLBREAKAWAY, 4, 1)
 
 
 def CDLBREAKAWAY(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1427,7 +1696,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLBREAKAWAY), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLBREAKAWAY, return_dtype=Int32)
+
+
+_cb_CDLCLOSINGMARUBOZU = make_talib_cb(_ta.CDLCLOSINGMARUBOZU, 4, 1)
 
 
 def CDLCLOSINGMARUBOZU(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1441,7 +1713,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLCLOSINGMARUBOZU), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLCLOSINGMARUBOZU, return_dtype=Int32)
+
+
+_cb_CDLCONCEALBABYSWALL = make_talib_cb(_ta.CDLCONCEALBABYSWALL, 4, 1)
 
 
 def CDLCONCEALBABYSWALL(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1455,7 +1730,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLCONCEALBABYSWALL), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLCONCEALBABYSWALL, return_dtype=Int32)
+
+
+_cb_CDLCOUNTERATTACK = make_talib_cb(_ta.CDLCOUNTERATTACK, 4, 1)
 
 
 def CDLCOUNTERATTACK(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1469,7 +1747,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLCOUNTERATTACK), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLCOUNTERATTACK, return_dtype=Int32)
+
+
+_cb_CDLDARKCLOUDCOVER = make_talib_cb(_ta.CDLDARKCLOUDCOVER, 4, 1)
 
 
 def CDLDARKCLOUDCOVER(open: Expr, high: Expr, low: Expr, close: Expr, penetration: float = 0.5) -> Expr:  # ['integer']
@@ -1485,7 +1766,10 @@ Parameters:
     penetration: 0.5
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLDARKCLOUDCOVER, penetration), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(partial(_cb_CDLDARKCLOUDCOVER, penetration=penetration), return_dtype=Int32)
+
+
+_cb_CDLDOJI = make_talib_cb(_ta.CDLDOJI, 4, 1)
 
 
 def CDLDOJI(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1499,7 +1783,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLDOJI), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLDOJI, return_dtype=Int32)
+
+
+_cb_CDLDOJISTAR = make_talib_cb(_ta.CDLDOJISTAR, 4, 1)
 
 
 def CDLDOJISTAR(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1513,7 +1800,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLDOJISTAR), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLDOJISTAR, return_dtype=Int32)
+
+
+_cb_CDLDRAGONFLYDOJI = make_talib_cb(_ta.CDLDRAGONFLYDOJI, 4, 1)
 
 
 def CDLDRAGONFLYDOJI(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1527,7 +1817,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLDRAGONFLYDOJI), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLDRAGONFLYDOJI, return_dtype=Int32)
+
+
+_cb_CDLENGULFING = make_talib_cb(_ta.CDLENGULFING, 4, 1)
 
 
 def CDLENGULFING(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1541,7 +1834,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLENGULFING), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLENGULFING, return_dtype=Int32)
+
+
+_cb_CDLEVENINGDOJISTAR = make_talib_cb(_ta.CDLEVENINGDOJISTAR, 4, 1)
 
 
 def CDLEVENINGDOJISTAR(open: Expr, high: Expr, low: Expr, close: Expr, penetration: float = 0.3) -> Expr:  # ['integer']
@@ -1557,7 +1853,10 @@ Parameters:
     penetration: 0.3
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLEVENINGDOJISTAR, penetration), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(partial(_cb_CDLEVENINGDOJISTAR, penetration=penetration), return_dtype=Int32)
+
+
+_cb_CDLEVENINGSTAR = make_talib_cb(_ta.CDLEVENINGSTAR, 4, 1)
 
 
 def CDLEVENINGSTAR(open: Expr, high: Expr, low: Expr, close: Expr, penetration: float = 0.3) -> Expr:  # ['integer']
@@ -1573,7 +1872,10 @@ Parameters:
     penetration: 0.3
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLEVENINGSTAR, penetration), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(partial(_cb_CDLEVENINGSTAR, penetration=penetration), return_dtype=Int32)
+
+
+_cb_CDLGAPSIDESIDEWHITE = make_talib_cb(_ta.CDLGAPSIDESIDEWHITE, 4, 1)
 
 
 def CDLGAPSIDESIDEWHITE(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1587,7 +1889,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLGAPSIDESIDEWHITE), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLGAPSIDESIDEWHITE, return_dtype=Int32)
+
+
+_cb_CDLGRAVESTONEDOJI = make_talib_cb(_ta.CDLGRAVESTONEDOJI, 4, 1)
 
 
 def CDLGRAVESTONEDOJI(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1601,7 +1906,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLGRAVESTONEDOJI), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLGRAVESTONEDOJI, return_dtype=Int32)
+
+
+_cb_CDLHAMMER = make_talib_cb(_ta.CDLHAMMER, 4, 1)
 
 
 def CDLHAMMER(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1615,7 +1923,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLHAMMER), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLHAMMER, return_dtype=Int32)
+
+
+_cb_CDLHANGINGMAN = make_talib_cb(_ta.CDLHANGINGMAN, 4, 1)
 
 
 def CDLHANGINGMAN(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1629,7 +1940,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLHANGINGMAN), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLHANGINGMAN, return_dtype=Int32)
+
+
+_cb_CDLHARAMI = make_talib_cb(_ta.CDLHARAMI, 4, 1)
 
 
 def CDLHARAMI(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1643,7 +1957,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLHARAMI), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLHARAMI, return_dtype=Int32)
+
+
+_cb_CDLHARAMICROSS = make_talib_cb(_ta.CDLHARAMICROSS, 4, 1)
 
 
 def CDLHARAMICROSS(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1657,7 +1974,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLHARAMICROSS), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLHARAMICROSS, return_dtype=Int32)
+
+
+_cb_CDLHIGHWAVE = make_talib_cb(_ta.CDLHIGHWAVE, 4, 1)
 
 
 def CDLHIGHWAVE(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1671,7 +1991,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLHIGHWAVE), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLHIGHWAVE, return_dtype=Int32)
+
+
+_cb_CDLHIKKAKE = make_talib_cb(_ta.CDLHIKKAKE, 4, 1)
 
 
 def CDLHIKKAKE(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1685,7 +2008,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLHIKKAKE), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLHIKKAKE, return_dtype=Int32)
+
+
+_cb_CDLHIKKAKEMOD = make_talib_cb(_ta.CDLHIKKAKEMOD, 4, 1)
 
 
 def CDLHIKKAKEMOD(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1699,7 +2025,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLHIKKAKEMOD), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLHIKKAKEMOD, return_dtype=Int32)
+
+
+_cb_CDLHOMINGPIGEON = make_talib_cb(_ta.CDLHOMINGPIGEON, 4, 1)
 
 
 def CDLHOMINGPIGEON(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1713,7 +2042,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLHOMINGPIGEON), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLHOMINGPIGEON, return_dtype=Int32)
+
+
+_cb_CDLIDENTICAL3CROWS = make_talib_cb(_ta.CDLIDENTICAL3CROWS, 4, 1)
 
 
 def CDLIDENTICAL3CROWS(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1727,7 +2059,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLIDENTICAL3CROWS), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLIDENTICAL3CROWS, return_dtype=Int32)
+
+
+_cb_CDLINNECK = make_talib_cb(_ta.CDLINNECK, 4, 1)
 
 
 def CDLINNECK(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1741,7 +2076,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLINNECK), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLINNECK, return_dtype=Int32)
+
+
+_cb_CDLINVERTEDHAMMER = make_talib_cb(_ta.CDLINVERTEDHAMMER, 4, 1)
 
 
 def CDLINVERTEDHAMMER(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1755,7 +2093,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLINVERTEDHAMMER), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLINVERTEDHAMMER, return_dtype=Int32)
+
+
+_cb_CDLKICKING = make_talib_cb(_ta.CDLKICKING, 4, 1)
 
 
 def CDLKICKING(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1769,7 +2110,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLKICKING), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLKICKING, return_dtype=Int32)
+
+
+_cb_CDLKICKINGBYLENGTH = make_talib_cb(_ta.CDLKICKINGBYLENGTH, 4, 1)
 
 
 def CDLKICKINGBYLENGTH(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1783,7 +2127,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLKICKINGBYLENGTH), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLKICKINGBYLENGTH, return_dtype=Int32)
+
+
+_cb_CDLLADDERBOTTOM = make_talib_cb(_ta.CDLLADDERBOTTOM, 4, 1)
 
 
 def CDLLADDERBOTTOM(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1797,7 +2144,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLLADDERBOTTOM), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLLADDERBOTTOM, return_dtype=Int32)
+
+
+_cb_CDLLONGLEGGEDDOJI = make_talib_cb(_ta.CDLLONGLEGGEDDOJI, 4, 1)
 
 
 def CDLLONGLEGGEDDOJI(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1811,7 +2161,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLLONGLEGGEDDOJI), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLLONGLEGGEDDOJI, return_dtype=Int32)
+
+
+_cb_CDLLONGLINE = make_talib_cb(_ta.CDLLONGLINE, 4, 1)
 
 
 def CDLLONGLINE(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1825,7 +2178,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLLONGLINE), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLLONGLINE, return_dtype=Int32)
+
+
+_cb_CDLMARUBOZU = make_talib_cb(_ta.CDLMARUBOZU, 4, 1)
 
 
 def CDLMARUBOZU(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1839,7 +2195,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLMARUBOZU), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLMARUBOZU, return_dtype=Int32)
+
+
+_cb_CDLMATCHINGLOW = make_talib_cb(_ta.CDLMATCHINGLOW, 4, 1)
 
 
 def CDLMATCHINGLOW(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1853,7 +2212,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLMATCHINGLOW), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLMATCHINGLOW, return_dtype=Int32)
+
+
+_cb_CDLMATHOLD = make_talib_cb(_ta.CDLMATHOLD, 4, 1)
 
 
 def CDLMATHOLD(open: Expr, high: Expr, low: Expr, close: Expr, penetration: float = 0.5) -> Expr:  # ['integer']
@@ -1869,7 +2231,10 @@ Parameters:
     penetration: 0.5
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLMATHOLD, penetration), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(partial(_cb_CDLMATHOLD, penetration=penetration), return_dtype=Int32)
+
+
+_cb_CDLMORNINGDOJISTAR = make_talib_cb(_ta.CDLMORNINGDOJISTAR, 4, 1)
 
 
 def CDLMORNINGDOJISTAR(open: Expr, high: Expr, low: Expr, close: Expr, penetration: float = 0.3) -> Expr:  # ['integer']
@@ -1885,7 +2250,10 @@ Parameters:
     penetration: 0.3
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLMORNINGDOJISTAR, penetration), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(partial(_cb_CDLMORNINGDOJISTAR, penetration=penetration), return_dtype=Int32)
+
+
+_cb_CDLMORNINGSTAR = make_talib_cb(_ta.CDLMORNINGSTAR, 4, 1)
 
 
 def CDLMORNINGSTAR(open: Expr, high: Expr, low: Expr, close: Expr, penetration: float = 0.3) -> Expr:  # ['integer']
@@ -1901,7 +2269,10 @@ Parameters:
     penetration: 0.3
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLMORNINGSTAR, penetration), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(partial(_cb_CDLMORNINGSTAR, penetration=penetration), return_dtype=Int32)
+
+
+_cb_CDLONNECK = make_talib_cb(_ta.CDLONNECK, 4, 1)
 
 
 def CDLONNECK(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1915,7 +2286,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLONNECK), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLONNECK, return_dtype=Int32)
+
+
+_cb_CDLPIERCING = make_talib_cb(_ta.CDLPIERCING, 4, 1)
 
 
 def CDLPIERCING(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1929,7 +2303,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLPIERCING), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLPIERCING, return_dtype=Int32)
+
+
+_cb_CDLRICKSHAWMAN = make_talib_cb(_ta.CDLRICKSHAWMAN, 4, 1)
 
 
 def CDLRICKSHAWMAN(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1943,7 +2320,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLRICKSHAWMAN), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLRICKSHAWMAN, return_dtype=Int32)
+
+
+_cb_CDLRISEFALL3METHODS = make_talib_cb(_ta.CDLRISEFALL3METHODS, 4, 1)
 
 
 def CDLRISEFALL3METHODS(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1957,7 +2337,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLRISEFALL3METHODS), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLRISEFALL3METHODS, return_dtype=Int32)
+
+
+_cb_CDLSEPARATINGLINES = make_talib_cb(_ta.CDLSEPARATINGLINES, 4, 1)
 
 
 def CDLSEPARATINGLINES(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1971,7 +2354,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLSEPARATINGLINES), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLSEPARATINGLINES, return_dtype=Int32)
+
+
+_cb_CDLSHOOTINGSTAR = make_talib_cb(_ta.CDLSHOOTINGSTAR, 4, 1)
 
 
 def CDLSHOOTINGSTAR(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1985,7 +2371,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLSHOOTINGSTAR), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLSHOOTINGSTAR, return_dtype=Int32)
+
+
+_cb_CDLSHORTLINE = make_talib_cb(_ta.CDLSHORTLINE, 4, 1)
 
 
 def CDLSHORTLINE(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -1999,7 +2388,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLSHORTLINE), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLSHORTLINE, return_dtype=Int32)
+
+
+_cb_CDLSPINNINGTOP = make_talib_cb(_ta.CDLSPINNINGTOP, 4, 1)
 
 
 def CDLSPINNINGTOP(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -2013,7 +2405,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLSPINNINGTOP), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLSPINNINGTOP, return_dtype=Int32)
+
+
+_cb_CDLSTALLEDPATTERN = make_talib_cb(_ta.CDLSTALLEDPATTERN, 4, 1)
 
 
 def CDLSTALLEDPATTERN(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -2027,7 +2422,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLSTALLEDPATTERN), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLSTALLEDPATTERN, return_dtype=Int32)
+
+
+_cb_CDLSTICKSANDWICH = make_talib_cb(_ta.CDLSTICKSANDWICH, 4, 1)
 
 
 def CDLSTICKSANDWICH(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -2041,7 +2439,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLSTICKSANDWICH), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLSTICKSANDWICH, return_dtype=Int32)
+
+
+_cb_CDLTAKURI = make_talib_cb(_ta.CDLTAKURI, 4, 1)
 
 
 def CDLTAKURI(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -2055,7 +2456,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLTAKURI), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLTAKURI, return_dtype=Int32)
+
+
+_cb_CDLTASUKIGAP = make_talib_cb(_ta.CDLTASUKIGAP, 4, 1)
 
 
 def CDLTASUKIGAP(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -2069,7 +2473,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLTASUKIGAP), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLTASUKIGAP, return_dtype=Int32)
+
+
+_cb_CDLTHRUSTING = make_talib_cb(_ta.CDLTHRUSTING, 4, 1)
 
 
 def CDLTHRUSTING(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -2083,7 +2490,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLTHRUSTING), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLTHRUSTING, return_dtype=Int32)
+
+
+_cb_CDLTRISTAR = make_talib_cb(_ta.CDLTRISTAR, 4, 1)
 
 
 def CDLTRISTAR(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -2097,7 +2507,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLTRISTAR), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLTRISTAR, return_dtype=Int32)
+
+
+_cb_CDLUNIQUE3RIVER = make_talib_cb(_ta.CDLUNIQUE3RIVER, 4, 1)
 
 
 def CDLUNIQUE3RIVER(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -2111,7 +2524,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLUNIQUE3RIVER), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLUNIQUE3RIVER, return_dtype=Int32)
+
+
+_cb_CDLUPSIDEGAP2CROWS = make_talib_cb(_ta.CDLUPSIDEGAP2CROWS, 4, 1)
 
 
 def CDLUPSIDEGAP2CROWS(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -2125,7 +2541,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLUPSIDEGAP2CROWS), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLUPSIDEGAP2CROWS, return_dtype=Int32)
+
+
+_cb_CDLXSIDEGAP3METHODS = make_talib_cb(_ta.CDLXSIDEGAP3METHODS, 4, 1)
 
 
 def CDLXSIDEGAP3METHODS(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['integer']
@@ -2139,7 +2558,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     integer (values are -100, 0 or 100)"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.CDLXSIDEGAP3METHODS), return_dtype=Int32)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_CDLXSIDEGAP3METHODS, return_dtype=Int32)
+
+
+_cb_AVGPRICE = make_talib_cb(_ta.AVGPRICE, 4, 1)
 
 
 def AVGPRICE(open: Expr, high: Expr, low: Expr, close: Expr) -> Expr:  # ['real']
@@ -2153,7 +2575,10 @@ Inputs:
     prices: ['open', 'high', 'low', 'close']
 Outputs:
     real"""
-    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.AVGPRICE), return_dtype=Float64)
+    return struct(f0=open, f1=high, f2=low, f3=close).map_batches(_cb_AVGPRICE, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_MEDPRICE = make_talib_cb(_ta.MEDPRICE, 2, 1)
 
 
 def MEDPRICE(high: Expr, low: Expr) -> Expr:  # ['real']
@@ -2167,7 +2592,10 @@ Inputs:
     prices: ['high', 'low']
 Outputs:
     real"""
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.MEDPRICE), return_dtype=Float64)
+    return struct(f0=high, f1=low).map_batches(_cb_MEDPRICE, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_TYPPRICE = make_talib_cb(_ta.TYPPRICE, 3, 1)
 
 
 def TYPPRICE(high: Expr, low: Expr, close: Expr) -> Expr:  # ['real']
@@ -2181,7 +2609,10 @@ Inputs:
     prices: ['high', 'low', 'close']
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _ta.TYPPRICE), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close).map_batches(_cb_TYPPRICE, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_WCLPRICE = make_talib_cb(_ta.WCLPRICE, 3, 1)
 
 
 def WCLPRICE(high: Expr, low: Expr, close: Expr) -> Expr:  # ['real']
@@ -2195,7 +2626,10 @@ Inputs:
     prices: ['high', 'low', 'close']
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _ta.WCLPRICE), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close).map_batches(_cb_WCLPRICE, return_dtype=Float64, is_elementwise=True)
+
+
+_cb_BETA = make_talib_cb(_ta.BETA, 2, 1)
 
 
 def BETA(high: Expr, low: Expr, timeperiod: float = 5.0) -> Expr:  # ['real']
@@ -2212,7 +2646,10 @@ Parameters:
     timeperiod: 5
 Outputs:
     real"""
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.BETA, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low).map_batches(partial(_cb_BETA, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_CORREL = make_talib_cb(_ta.CORREL, 2, 1)
 
 
 def CORREL(high: Expr, low: Expr, timeperiod: float = 30.0) -> Expr:  # ['real']
@@ -2229,7 +2666,10 @@ Parameters:
     timeperiod: 30
 Outputs:
     real"""
-    return struct(f0=high, f1=low).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.CORREL, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low).map_batches(partial(_cb_CORREL, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_LINEARREG = make_talib_cb(_ta.LINEARREG, 1, 1)
 
 
 def LINEARREG(close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -2245,7 +2685,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.LINEARREG, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_LINEARREG, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_LINEARREG_ANGLE = make_talib_cb(_ta.LINEARREG_ANGLE, 1, 1)
 
 
 def LINEARREG_ANGLE(close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -2261,7 +2704,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.LINEARREG_ANGLE, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_LINEARREG_ANGLE, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_LINEARREG_INTERCEPT = make_talib_cb(_ta.LINEARREG_INTERCEPT, 1, 1)
 
 
 def LINEARREG_INTERCEPT(close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -2277,7 +2723,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.LINEARREG_INTERCEPT, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_LINEARREG_INTERCEPT, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_LINEARREG_SLOPE = make_talib_cb(_ta.LINEARREG_SLOPE, 1, 1)
 
 
 def LINEARREG_SLOPE(close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -2293,7 +2742,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.LINEARREG_SLOPE, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_LINEARREG_SLOPE, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_STDDEV = make_talib_cb(_ta.STDDEV, 1, 1)
 
 
 def STDDEV(close: Expr, timeperiod: float = 5.0, nbdev: float = 1.0) -> Expr:  # ['real']
@@ -2310,7 +2762,10 @@ Parameters:
     nbdev: 1.0
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.STDDEV, timeperiod, nbdev), return_dtype=Float64)
+    return close.map_batches(partial(_cb_STDDEV, timeperiod=timeperiod, nbdev=nbdev), return_dtype=Float64)
+
+
+_cb_TSF = make_talib_cb(_ta.TSF, 1, 1)
 
 
 def TSF(close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -2326,7 +2781,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.TSF, timeperiod), return_dtype=Float64)
+    return close.map_batches(partial(_cb_TSF, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_VAR = make_talib_cb(_ta.VAR, 1, 1)
 
 
 def VAR(close: Expr, timeperiod: float = 5.0, nbdev: float = 1.0) -> Expr:  # ['real']
@@ -2343,7 +2801,10 @@ Parameters:
     nbdev: 1.0
 Outputs:
     real"""
-    return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _ta.VAR, timeperiod, nbdev), return_dtype=Float64)
+    return close.map_batches(partial(_cb_VAR, timeperiod=timeperiod, nbdev=nbdev), return_dtype=Float64)
+
+
+_cb_ATR = make_talib_cb(_ta.ATR, 3, 1)
 
 
 def ATR(high: Expr, low: Expr, close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -2359,7 +2820,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _ta.ATR, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close).map_batches(partial(_cb_ATR, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_NATR = make_talib_cb(_ta.NATR, 3, 1)
 
 
 def NATR(high: Expr, low: Expr, close: Expr, timeperiod: float = 14.0) -> Expr:  # ['real']
@@ -2375,7 +2839,10 @@ Parameters:
     timeperiod: 14
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _ta.NATR, timeperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close).map_batches(partial(_cb_NATR, timeperiod=timeperiod), return_dtype=Float64)
+
+
+_cb_TRANGE = make_talib_cb(_ta.TRANGE, 3, 1)
 
 
 def TRANGE(high: Expr, low: Expr, close: Expr) -> Expr:  # ['real']
@@ -2389,7 +2856,10 @@ Inputs:
     prices: ['high', 'low', 'close']
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 3, dtype=float), _ta.TRANGE), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close).map_batches(_cb_TRANGE, return_dtype=Float64)
+
+
+_cb_AD = make_talib_cb(_ta.AD, 4, 1)
 
 
 def AD(high: Expr, low: Expr, close: Expr, volume: Expr) -> Expr:  # ['real']
@@ -2403,7 +2873,10 @@ Inputs:
     prices: ['high', 'low', 'close', 'volume']
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close, f3=volume).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.AD), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close, f3=volume).map_batches(_cb_AD, return_dtype=Float64)
+
+
+_cb_ADOSC = make_talib_cb(_ta.ADOSC, 4, 1)
 
 
 def ADOSC(high: Expr, low: Expr, close: Expr, volume: Expr, fastperiod: float = 3.0, slowperiod: float = 10.0) -> Expr:  # ['real']
@@ -2420,7 +2893,10 @@ Parameters:
     slowperiod: 10
 Outputs:
     real"""
-    return struct(f0=high, f1=low, f2=close, f3=volume).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _ta.ADOSC, fastperiod, slowperiod), return_dtype=Float64)
+    return struct(f0=high, f1=low, f2=close, f3=volume).map_batches(partial(_cb_ADOSC, fastperiod=fastperiod, slowperiod=slowperiod), return_dtype=Float64)
+
+
+_cb_OBV = make_talib_cb(_ta.OBV, 2, 1)
 
 
 def OBV(close: Expr, volume: Expr) -> Expr:  # ['real']
@@ -2435,4 +2911,4 @@ Inputs:
     prices: ['volume']
 Outputs:
     real"""
-    return struct(f0=close, f1=volume).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _ta.OBV), return_dtype=Float64)
+    return struct(f0=close, f1=volume).map_batches(_cb_OBV, return_dtype=Float64)
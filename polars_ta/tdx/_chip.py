@@ -20,7 +20,7 @@ def nb_chip(high, low, avg, turnover,
     avg
         一维序列
     turnover:
-        换手率，需要在外转成0~1范围内
+        换手率，需要在外转成0~1范围内。为float32时筹码网格也用float32，内存带宽减半
     start
         开始价格
     stop
@@ -67,7 +67,7 @@ def nb_chip(high, low, avg, turnover,
     low_arg = np.argwhere(columns == _low.reshape(-1, 1))[:, 1]
 
     # 高度表
-    height = np.zeros(grid_shape)
+    height = np.zeros(grid_shape, dtype=turnover.dtype)
     for i in range(len(height)):
         la = low_arg[i]
         aa = avg_arg[i]
@@ -98,24 +98,138 @@ def nb_chip(high, low, avg, turnover,
 
 
 @numba.jit(nopython=True, nogil=True, fastmath=True, cache=True)
-def _WINNER_COST(high, low, avg, turnover, close, cost, step):
-    out, columns = nb_chip(high, low, avg, turnover, step=step)
+def _tri_height(j, la, aa, ha, th):
+    """三角分布在网格第j列的高度，与nb_chip中两段linspace的结果相同"""
+    h = 0.0
+    if la <= j <= aa:
+        h = th * (j - la) / (aa - la) if aa > la else 0.0
+    if aa <= j <= ha:
+        h = th * (ha - j) / (ha - aa) if ha > aa else th
+    return h
 
-    # WINNER
-    cheap = np.where(columns <= close.reshape(-1, 1), out, 0)
-    sum_cheap = np.sum(cheap, axis=1)
 
-    # COST
-    # cum = np.cumsum(out, axis=1)
-    cum = np.copy(out)
-    for i in range(0, out.shape[0]):
-        cum[i, :] = np.cumsum(out[i, :])
+@numba.jit(nopython=True, nogil=True, fastmath=True, cache=True)
+def _tri_weight(b, la, aa, ha, th):
+    """第b个价格格子的筹码，左右两个半格的梯形面积之和"""
+    j = 2 * b
+    return (_tri_height(j, la, aa, ha, th) + 2 * _tri_height(j + 1, la, aa, ha, th) + _tri_height(j + 2, la, aa, ha, th)) / 4
+
+
+@numba.jit(nopython=True, nogil=True, fastmath=True, cache=True)
+def _chip_grid(high, low, avg, step):
+    """每根K线三角分布在网格中的位置与高度，以及每个价格格子的价格，与nb_chip相同"""
+    left = round(np.min(low) / step) * 2 - 1
+    right = round(np.max(high) / step) * 2 + 1
+    n_bin = (right - left) // 2
+
+    _high = np.empty_like(high)
+    _low = np.empty_like(low)
+    _avg = np.empty_like(avg)
+    ha = (np.round(high / step, 0, _high) * 2 + 1 - left).astype(np.int64)
+    la = (np.round(low / step, 0, _low) * 2 - 1 - left).astype(np.int64)
+    aa = (np.round(avg / step, 0, _avg) * 2 - left).astype(np.int64)
+    tri_height = 2 / ((ha - la) // 2)
+
+    price = (step / 2) * (left + 1 + 2 * np.arange(n_bin))
+    return la, aa, ha, tri_height, price
+
 
-    prices = np.where(cum <= cost.reshape(-1, 1), columns, 0)
+@numba.jit(nopython=True, nogil=True, fastmath=True, cache=True)
+def _WINNER_COST(high, low, avg, turnover, close, cost, step, block_size=0):
+    """WINNER与COST，与`nb_chip`的筹码分布一致，但不生成N*B的筹码矩阵
+
+    每根K线只遍历一次价格格子，衰减、叠加三角分布、累计获利盘与成本价在同一个循环中完成，
+    筹码只保留当前一行，内存从O(N*B)降为O(B)
+
+    Parameters
+    ----------
+    block_size
+        按价格格子分块。大于0时每块格子先把所有K线算完再算下一块，格子很多放不进缓存时可以尝试，
+        0表示不分块
+
+    """
+    n = len(turnover)
+    la, aa, ha, tri_height, price = _chip_grid(high, low, avg, step)
+    n_bin = len(price)
+    chips = np.zeros(n_bin, dtype=turnover.dtype)
+
+    winner = np.zeros(n)
+    cum = np.zeros(n)
+    max_price = np.full(n, -np.inf)
+
+    if block_size <= 0:
+        block_size = n_bin
+    for b0 in range(0, n_bin, block_size):
+        b1 = min(b0 + block_size, n_bin)
+        for i in range(n):
+            t = turnover[i]
+            keep = 1 - t
+            if i == 0:
+                # 第一天等权，与nb_chip中out[-1] = weight[0]相同
+                for b in range(b0, b1):
+                    chips[b] = _tri_weight(b, la[0], aa[0], ha[0], tri_height[0])
+            lo, av, hi, th = la[i], aa[i], ha[i], tri_height[i]
+            s, c, m = winner[i], cum[i], max_price[i]
+            p_close, p_cost = close[i], cost[i]
+            for b in range(b0, b1):
+                v = chips[b] * keep
+                if 2 * b + 2 >= lo and 2 * b <= hi:
+                    v += _tri_weight(b, lo, av, hi, th) * t
+                chips[b] = v
+                if price[b] <= p_close:
+                    s += v
+                c += v
+                m = max(m, price[b] if c <= p_cost else 0.0)
+            winner[i], cum[i], max_price[i] = s, c, m
+
+    return winner, max_price
+
+
+# 定点数的小数位数。每格筹码不超过1，int32在此精度下最大可表示2，不会溢出。
+# 每格每天都有舍入误差，格子多时累积明显，所以小数位尽量多，而不是用16.16格式
+_FX_BITS = 30
 
-    # np.max(prices, axis=1)
-    max_price = prices[:, 0]
-    for i in range(0, out.shape[0]):
-        max_price[i] = np.max(prices[i, :])
 
-    return sum_cheap, max_price
+@numba.jit(nopython=True, nogil=True, fastmath=True, cache=True)
+def _WINNER_COST_fx(high, low, avg, turnover, close, cost, step, block_size=0):
+    """same as `_WINNER_COST`, the chips are int32 fixed-point numbers with 30 fractional bits
+    与`_WINNER_COST`相同，但筹码用30位小数的int32定点数保存，内存减半，累加为整数运算
+
+    每格每天的舍入误差约为1e-9，获利盘比例的误差随格子数与天数增加，一般在1e-5以内
+    """
+    n = len(turnover)
+    la, aa, ha, tri_height, price = _chip_grid(high, low, avg, step)
+    n_bin = len(price)
+    one = 1 << _FX_BITS
+    half = 1 << (_FX_BITS - 1)
+    chips = np.zeros(n_bin, dtype=np.int32)
+
+    winner = np.zeros(n, dtype=np.int64)
+    cum = np.zeros(n, dtype=np.int64)
+    max_price = np.full(n, -np.inf)
+
+    if block_size <= 0:
+        block_size = n_bin
+    for b0 in range(0, n_bin, block_size):
+        b1 = min(b0 + block_size, n_bin)
+        for i in range(n):
+            t = turnover[i]
+            keep = np.int64(round((1 - t) * one))
+            if i == 0:
+                for b in range(b0, b1):
+                    chips[b] = round(_tri_weight(b, la[0], aa[0], ha[0], tri_height[0]) * one)
+            lo, av, hi, th = la[i], aa[i], ha[i], tri_height[i]
+            s, c, m = winner[i], cum[i], max_price[i]
+            p_close, p_cost = close[i], np.int64(round(cost[i] * one))
+            for b in range(b0, b1):
+                v = (chips[b] * keep + half) >> _FX_BITS
+                if 2 * b + 2 >= lo and 2 * b <= hi:
+                    v += round(_tri_weight(b, lo, av, hi, th) * t * one)
+                chips[b] = v
+                if price[b] <= p_close:
+                    s += v
+                c += v
+                m = max(m, price[b] if c <= p_cost else 0.0)
+            winner[i], cum[i], max_price[i] = s, c, m
+
+    return winner / one, max_price
@@ -1,10 +1,12 @@
+import numpy as np
 from polars import Expr, Struct, Field, Float64, struct
 
-from polars_ta.tdx._chip import _WINNER_COST
+from polars_ta.tdx._chip import _WINNER_COST, _WINNER_COST_fx
 from polars_ta.utils.numba_ import batches_i2_o2, struct_to_numpy
 
 
-def ts_WINNER_COST(high: Expr, low: Expr, avg: Expr, turnover: Expr, close: Expr, cost: Expr = 0.5, step: float = 0.1) -> Expr:
+def ts_WINNER_COST(high: Expr, low: Expr, avg: Expr, turnover: Expr, close: Expr, cost: Expr = 0.5, step: float = 0.1,
+                   precision: str = 'f64', block_size: int = 0) -> Expr:
     """
     获利盘比例
         WINNER(CLOSE),表示以当前收市价卖出的获利盘比例,例如返回0.1表示10%获利盘;WINNER(10.5)表示10.5元价格的获利盘比例
@@ -28,6 +30,11 @@ def ts_WINNER_COST(high: Expr, low: Expr, avg: Expr, turnover: Expr, close: Expr
         成本比例，0~1
     step
         步长。一字涨停时，三角分布的底为1，高为2。但无法当成梯形计算面积，所以从中用半步长切开计算
+    precision
+        筹码网格的精度。`f32`时只有筹码向量以float32存储，三角分布与累加仍为float64。筹码向量只有O(B)，本就在缓存中，基本没有提速，获利盘比例的误差在1e-6以内
+        `fx32`时网格使用30位小数的int32定点数，累加为整数运算，获利盘比例的误差一般在1e-5以内
+    block_size
+        价格格子分块大小，格子数很多放不进缓存时可以尝试，0表示不分块
 
     Returns
     -------
@@ -45,5 +52,17 @@ def ts_WINNER_COST(high: Expr, low: Expr, avg: Expr, turnover: Expr, close: Expr
     该函数仅对日线分析周期有效
 
     """
+    if precision not in ('f64', 'f32', 'fx32'):
+        raise ValueError(f"precision must be 'f64', 'f32' or 'fx32', got {precision!r}")
+
+    def func(xx):
+        xx = struct_to_numpy(xx, 6, dtype=float)
+        if precision == 'f32':
+            # 网格类型跟随换手率。价格保持float64，避免价格落在格子边缘时分到相邻格子
+            xx[3] = xx[3].astype(np.float32)
+        if precision == 'fx32':
+            return batches_i2_o2(xx, _WINNER_COST_fx, step, block_size)
+        return batches_i2_o2(xx, _WINNER_COST, step, block_size)
+
     dtype = Struct([Field(f"column_{i}", Float64) for i in range(2)])
-    return struct(f0=high, f1=low, f2=avg, f3=turnover, f4=close, f5=cost).map_batches(lambda xx: batches_i2_o2(struct_to_numpy(xx, 6, dtype=float), _WINNER_COST, step), return_dtype=dtype)
+    return struct(f0=high, f1=low, f2=avg, f3=turnover, f4=close, f5=cost).map_batches(func, return_dtype=dtype)
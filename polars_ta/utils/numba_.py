@@ -6,7 +6,7 @@ from functools import lru_cache
 from typing import List
 
 import numpy as np
-from numba import jit
+from numba import jit, prange
 from numpy import full
 from numpy.lib.stride_tricks import sliding_window_view
 from polars import Series, Expr, struct, DataFrame, Float64
@@ -14,6 +14,9 @@ from polars import Series, Expr, struct, DataFrame, Float64
 """
 Series.to_numpy的操作在调用之前做，这样可控一些
 batches_i1_o1这一类的函数输入不支持Series，只支持numpy。设计成在map_batches转换更可控
+无空值的列to_numpy得到的是只读视图，再用astype(float, copy=False)避免多复制一份，所以kernel不能原地修改输入
+skip_nan=True时跳过所有输入开头都为nan的部分，只把后半段送入kernel，输出前面再补nan。
+只适用于nan当成null处理且开头的nan不改变后续结果的滚动kernel，累计类与talib的整数输出不要使用
 """
 
 
@@ -26,6 +29,27 @@ def isnan(x):
         return False
 
 
+@jit(nopython=True, nogil=True, cache=True)
+def _mean_m2(a):
+    """count, mean and sum of squared deviations of the non-nan values, two passes
+    非nan值的个数、均值与离差平方和，两遍计算。用于滚动Welford算法定期重算，清除增删留下的残余误差"""
+    n = 0
+    s = 0.0
+    for v in a:
+        if v == v:
+            n += 1
+            s += v
+    if n == 0:
+        return 0, 0.0, 0.0
+    mean = s / n
+    m2 = 0.0
+    for v in a:
+        if v == v:
+            d = v - mean
+            m2 += d * d
+    return n, mean, m2
+
+
 @jit(nopython=True, nogil=True, cache=True)
 def full_with_window_size(arr, fill_value, dtype=None, window_size: int = 1):
     """创建一个更大的数组，填充后一截数据"""
@@ -96,29 +120,153 @@ def _roll_3(x1, x2, x3, window, min_periods, func):
     return out1[:x1.shape[0]]
 
 
-def struct_to_numpy(xx, n: int, dtype=None):
+def struct_to_numpy(xx, n: int, dtype=None, out: str = 'list'):
+    """struct to numpy arrays
+
+    Parameters
+    ----------
+    xx
+    n
+        字段数
+    dtype
+    out
+        - 'list': a list of 1D arrays, one per field. Zero-copy read-only views where possible
+        - '2d': one C-contiguous `(len, n)` array. Always a copy
+
+    Notes
+    -----
+    `unnest` once and take the child columns directly, which avoids a field lookup per `xx.struct[i]`.
+    `struct(f0=x, f1=y)` only references the child buffers, so in the list mode a child column without nulls
+    whose dtype already matches `dtype` is returned as a view sharing memory with the original column.
+    Columns with nulls or of another dtype are copied. Multi-input `pl.map_batches([x, y], ...)` was measured to be no faster,
+    so the `struct` call sites are kept
+    只`unnest`一次，直接取子列，不再每次`xx.struct[i]`查找字段。`struct`只引用子列内存，
+    list模式下无空值且类型已一致的子列是与原列共享内存的只读视图，有空值或类型不同的列会复制。
+    多输入的`pl.map_batches`实测没有更快，所以保留`struct`写法
+
+    `out='2d'` always copies every field into a new array. A row holds all fields of one timestamp,
+    so kernels that read every field per step walk a single buffer instead of n separate ones
+    `out='2d'`一定会把所有字段复制到新数组。每行是同一时刻的所有字段，每步都要读全部字段的kernel只需顺序遍历一块内存
+    """
+    df = xx.struct.unnest()
+    if out == '2d':
+        # 布尔列在polars中转float比numpy的astype快很多
+        cols = [(df.to_series(i) if dtype is None else df.to_series(i).cast(dtype)).to_numpy(writable=False) for i in range(n)]
+        arr = np.empty((df.height, n), dtype=dtype or np.result_type(*cols))
+        for i, c in enumerate(cols):
+            arr[:, i] = c
+        return arr
     if dtype is None:
-        return [xx.struct[i].to_numpy() for i in range(n)]
+        return [df.to_series(i).to_numpy(writable=False) for i in range(n)]
     else:
-        return [xx.struct[i].to_numpy().astype(dtype) for i in range(n)]
+        return [df.to_series(i).to_numpy(writable=False).astype(dtype, copy=False) for i in range(n)]
 
 
-def batches_i1_o1(x1: np.ndarray, func, *args, dtype=None) -> Series:
+@jit(nopython=True, nogil=True, cache=True)
+def _first_not_nan(x1):
+    """第一个不为nan的位置，全为nan时返回长度"""
+    for i in range(x1.shape[0]):
+        if x1[i] == x1[i]:
+            return i
+    return x1.shape[0]
+
+
+def _nan_prefix(xx: List[np.ndarray]) -> int:
+    """所有输入开头都为nan的长度。整数与布尔类型没有nan，直接返回0"""
+    k = xx[0].shape[0]
+    for x in xx:
+        if x.dtype.kind != 'f':
+            return 0
+        k = min(k, _first_not_nan(x[:k]))
+    return k
+
+
+def _pad_nan(out: np.ndarray, k: int) -> np.ndarray:
+    """在kernel输出前补回k个nan"""
+    arr = full(out.shape[0] + k, np.nan, dtype=np.float64)
+    arr[k:] = out
+    return arr
+
+
+def batches_i1_o1(x1: np.ndarray, func, *args, dtype=None, skip_nan: bool = False) -> Series:
+    k = _nan_prefix([x1]) if skip_nan else 0
+    if 0 < k < x1.shape[0]:
+        return Series(_pad_nan(func(x1[k:], *args), k), nan_to_null=True, dtype=dtype)
     return Series(func(x1, *args), nan_to_null=True, dtype=dtype)
 
 
-def batches_i2_o1(xx: List[np.ndarray], func, *args, dtype=None) -> Series:
+def batches_i2_o1(xx: List[np.ndarray], func, *args, dtype=None, skip_nan: bool = False) -> Series:
+    k = _nan_prefix(xx) if skip_nan else 0
+    if 0 < k < xx[0].shape[0]:
+        return Series(_pad_nan(func(*[x[k:] for x in xx], *args), k), nan_to_null=True, dtype=dtype)
     return Series(func(*xx, *args), nan_to_null=True, dtype=dtype)
 
 
-def batches_i1_o2(x1: np.ndarray, func, *args, dtype=None) -> Series:
+def batches_i1_o2(x1: np.ndarray, func, *args, dtype=None, skip_nan: bool = False) -> Series:
+    k = _nan_prefix([x1]) if skip_nan else 0
+    if 0 < k < x1.shape[0]:
+        return DataFrame([_pad_nan(out, k) for out in func(x1[k:], *args)], nan_to_null=True).to_struct()
     return DataFrame(func(x1, *args), nan_to_null=True).to_struct()
 
 
-def batches_i2_o2(xx: List[np.ndarray], func, *args, dtype=None) -> Series:
+def batches_i2_o2(xx: List[np.ndarray], func, *args, dtype=None, skip_nan: bool = False) -> Series:
+    k = _nan_prefix(xx) if skip_nan else 0
+    if 0 < k < xx[0].shape[0]:
+        return DataFrame([_pad_nan(out, k) for out in func(*[x[k:] for x in xx], *args)], nan_to_null=True).to_struct()
     return DataFrame(func(*xx, *args), nan_to_null=True).to_struct()
 
 
+_BATCHES_SRC = {
+    1: """
+def {name}(xx, func, *args, dtype=None, skip_nan=False):
+    {xs} = xx
+    k = _nan_prefix(xx) if skip_nan else 0
+    if 0 < k < x0.shape[0]:
+        return Series(_pad_nan(func({xk}, *args), k), nan_to_null=True, dtype=dtype)
+    return Series(func({xs}, *args), nan_to_null=True, dtype=dtype)
+""",
+    2: """
+def {name}(xx, func, *args, dtype=None, skip_nan=False):
+    {xs} = xx
+    k = _nan_prefix(xx) if skip_nan else 0
+    if 0 < k < x0.shape[0]:
+        return DataFrame([_pad_nan(out, k) for out in func({xk}, *args)], nan_to_null=True).to_struct()
+    return DataFrame(func({xs}, *args), nan_to_null=True).to_struct()
+""",
+}
+
+
+@lru_cache
+def make_batches_dispatcher(n_in: int, n_out: int):
+    """`batches_i2_o1`/`batches_i2_o2` specialized for `n_in` inputs, the unpacking is written out instead of `*xx`
+    按输入个数生成专用的`batches_i2_o*`，用`exec`展开参数，省去每次调用时列表解包的开销
+
+    Parameters
+    ----------
+    n_in
+        输入个数
+    n_out
+        1表示单输出，2表示多输出(struct)
+
+    """
+    name = f'batches_i2_o{n_out}_n{n_in}'
+    xs = ', '.join(f'x{i}' for i in range(n_in))
+    xk = ', '.join(f'x{i}[k:]' for i in range(n_in))
+    ns = {'Series': Series, 'DataFrame': DataFrame, '_nan_prefix': _nan_prefix, '_pad_nan': _pad_nan}
+    exec(_BATCHES_SRC[n_out].format(name=name, xs=xs, xk=xk), ns)
+    return ns[name]
+
+
+batches_i2_o1_n2 = make_batches_dispatcher(2, 1)
+batches_i2_o1_n3 = make_batches_dispatcher(3, 1)
+batches_i2_o1_n4 = make_batches_dispatcher(4, 1)
+batches_i2_o1_n5 = make_batches_dispatcher(5, 1)
+batches_i2_o2_n2 = make_batches_dispatcher(2, 2)
+batches_i2_o2_n3 = make_batches_dispatcher(3, 2)
+batches_i2_o2_n4 = make_batches_dispatcher(4, 2)
+batches_i2_o2_n5 = make_batches_dispatcher(5, 2)
+
+
 def batches_i2_o2_v2(xx: List[np.ndarray], func, *args, dtype=None) -> Series:
     """此写法也能用，速度差异不大"""
     out = func(*xx, *args)
@@ -155,6 +303,27 @@ def nb_roll_cov(x1, x2, window):
     return out
 
 
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def nb_roll_apply_par(x1, window, min_periods, func, args):
+    """`func(window_values, *args)` for every row, rows are split across numba threads with `prange`.
+    Only worth it for O(window) functions such as moments; O(1) running updates are memory bound and do not scale.
+    每行独立计算一个窗口，用prange多线程并行。只适合每个窗口需要完整计算的函数，递推类的滚动算法受内存带宽限制，并行无收益
+
+    窗口不足时用已有数据，有效值个数不少于min_periods才计算，与`sliding_window_with_min_periods`的结果一致。
+    在`over`/`group_by`中会被polars的多个线程同时调用，numba的线程层需要是`tbb`或`omp`，`workqueue`不支持并发调用
+    """
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    for i in prange(x1.shape[0]):
+        a1 = x1[max(0, i - window + 1):i + 1]
+        c = 0
+        for v in a1:
+            if v == v:
+                c += 1
+        if c >= min_periods and c > 0:
+            out[i] = func(a1, *args)
+    return out
+
+
 def roll_sum(x: Expr, n: int) -> Expr:
     return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy(), nb_roll_sum, n), return_dtype=Float64)
 
@@ -0,0 +1,41 @@
+"""
+TA-Lib回调的生成
+
+codegen_talib.py生成的每个函数在模块级创建一次回调，表达式构建时不再生成新的lambda，
+相同函数的多个表达式共用同一个回调对象。有参数的函数用`partial`按名字绑定参数
+"""
+from functools import partial
+
+from polars import Series
+
+from polars_ta.utils.numba_ import batches_i1_o1, batches_i1_o2, make_batches_dispatcher, struct_to_numpy
+
+
+def make_talib_cb(func, n_in: int, n_out: int):
+    """`map_batches` callback for a TA-Lib function, parameters are passed by keyword
+    为TA-Lib函数生成`map_batches`的回调，参数按名字传入，如`partial(cb, timeperiod=5)`
+
+    Parameters
+    ----------
+    func
+        TA-Lib函数，如`talib.SMA`
+    n_in
+        输入个数。多于1个时输入为struct
+    n_out
+        输出个数。多于1个时输出为struct
+
+    """
+    if n_in == 1 and n_out == 1:
+        def cb(x1: Series, **kwargs) -> Series:
+            return batches_i1_o1(x1.to_numpy(writable=False).astype(float, copy=False), partial(func, **kwargs) if kwargs else func)
+    elif n_in == 1:
+        def cb(x1: Series, **kwargs) -> Series:
+            return batches_i1_o2(x1.to_numpy(writable=False).astype(float, copy=False), partial(func, **kwargs) if kwargs else func)
+    else:
+        batches = make_batches_dispatcher(n_in, 1 if n_out == 1 else 2)
+
+        def cb(xx: Series, **kwargs) -> Series:
+            return batches(struct_to_numpy(xx, n_in, dtype=float), partial(func, **kwargs) if kwargs else func)
+
+    cb.__name__ = cb.__qualname__ = f'_cb_{func.__name__}'
+    return cb
@@ -1,103 +1,295 @@
 import numpy as np
-from numba import jit, float64, boolean
-from numpy import argmax, argmin, full, vstack, corrcoef, nanprod, nanmean, nanstd
-from numpy.lib.stride_tricks import sliding_window_view
+from numba import jit, guvectorize, float64, boolean, int64, types
+from numpy import full, vstack, corrcoef, nanmean
 
-from polars_ta.utils.numba_ import isnan, full_with_window_size, sliding_window_with_min_periods
+from polars_ta.utils.numba_ import isnan, full_with_window_size, sliding_window_with_min_periods, _mean_m2
 
+# fastmath without nnan/ninf: `v == v` null checks still work, results may differ from strict mode in the last few ulps
+# 不含nnan/ninf的fastmath，允许重排与融合浮点运算，但保留`v == v`的空值判断。结果与严格模式可能有末位误差
+_FASTMATH = {'nsz', 'arcp', 'contract', 'reassoc'}
 
-@jit(nopython=True, nogil=True, cache=True)
-def roll_argmax(x1, window, min_periods, reverse):
-    out1 = full_with_window_size(x1, np.nan, dtype=np.float64, window_size=window)
-    a1 = sliding_window_with_min_periods(out1, window, min_periods)
-    out1[:] = np.nan
 
-    for i, v1 in enumerate(a1):
-        if np.isnan(v1[-min_periods:]).any():
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_arg_extreme(x1, window, min_periods, reverse, is_max):
+    """position of the window extreme counted over valid values, kept by a monotonic deque, O(1) per step
+    单调队列维护窗口极值的位置，位置按有效值计数。reverse时并列取最近的，否则取最远的"""
+    out = full(x1.shape[0], np.nan, dtype=np.float64)
+    q = np.empty(window, dtype=np.int64)
+    cnt = np.empty(x1.shape[0], dtype=np.int64)  # 累计有效值个数
+    head, n = 0, 0
+    c = 0
+    run = 0  # 连续有效值个数
+    for i in range(x1.shape[0]):
+        while n > 0 and q[head] <= i - window:
+            head = (head + 1) % window
+            n -= 1
+        v = x1[i]
+        if v == v:
+            c += 1
+            run += 1
+            while n > 0:
+                b = x1[q[(head + n - 1) % window]]
+                if is_max:
+                    drop = b <= v if reverse else b < v
+                else:
+                    drop = b >= v if reverse else b > v
+                if not drop:
+                    break
+                n -= 1
+            q[(head + n) % window] = i
+            n += 1
+        else:
+            run = 0
+        cnt[i] = c
+        # 最近min_periods个值都有效时才输出
+        if run < min_periods or min_periods > window:
             continue
+        f = q[head]
         if reverse:
-            v1 = v1[::-1]
-        out1[i] = argmax(v1[~np.isnan(v1)])
+            out[i] = cnt[i] - cnt[f]
+        else:
+            start = i - window + 1
+            out[i] = cnt[f] - (cnt[start - 1] if start > 0 else 0) - 1
+    return out
 
-    return out1[:x1.shape[0]]
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_arg_extreme_scan(x1, window, min_periods, reverse, is_max):
+    """same as `_roll_arg_extreme`, rescanning the whole window each step, O(d) per step
+    与`_roll_arg_extreme`结果相同，每步重新扫描整个窗口。小窗口时没有队列的分支与取模，反而更快"""
+    out = full(x1.shape[0], np.nan, dtype=np.float64)
+    run = 0  # 连续有效值个数
+    for i in range(x1.shape[0]):
+        v = x1[i]
+        if v == v:
+            run += 1
+        else:
+            run = 0
+        if run < min_periods or min_periods > window:
+            continue
+        best = v
+        pos = 0  # 极值之前的有效值个数
+        m = 0  # 窗口内有效值个数
+        for j in range(max(i - window + 1, 0), i + 1):
+            v = x1[j]
+            if v != v:
+                continue
+            if m == 0:
+                take = True
+            elif is_max:
+                take = v >= best if reverse else v > best
+            else:
+                take = v <= best if reverse else v < best
+            if take:
+                best = v
+                pos = m
+            m += 1
+        out[i] = m - pos - 1 if reverse else pos
+    return out
+
+
+# 窗口不超过此值时直接扫描，否则用单调队列。实测5e6个数据时两者在14附近持平，d=16时单调队列已快约10%
+_SCAN_WINDOW = 14
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def roll_argmax(x1, window, min_periods, reverse):
+    if window <= _SCAN_WINDOW:
+        return _roll_arg_extreme_scan(x1, window, min_periods, reverse, True)
+    return _roll_arg_extreme(x1, window, min_periods, reverse, True)
 
 
 @jit(nopython=True, nogil=True, cache=True)
 def roll_argmin(x1, window, min_periods, reverse):
-    out1 = full_with_window_size(x1, np.nan, dtype=np.float64, window_size=window)
-    a1 = sliding_window_with_min_periods(out1, window, min_periods)
-    out1[:] = np.nan
+    if window <= _SCAN_WINDOW:
+        return _roll_arg_extreme_scan(x1, window, min_periods, reverse, False)
+    return _roll_arg_extreme(x1, window, min_periods, reverse, False)
 
-    for i, v1 in enumerate(a1):
-        if np.isnan(v1[-min_periods:]).any():
-            continue
-        if reverse:
-            v1 = v1[::-1]
-        out1[i] = argmin(v1[~np.isnan(v1)])
 
-    return out1[:x1.shape[0]]
+@jit(nopython=True, nogil=True, cache=True)
+def roll_rank(x1, window, min_periods):
+    """rolling average rank of the last value divided by the number of valid values, a sorted buffer is kept across steps
+    维护窗口内的有序数组，新值二分插入，旧值二分删除，不再每个窗口重新排序"""
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    buf = np.empty(window, dtype=np.float64)
+    n = 0
+    for i in range(x1.shape[0]):
+        if i >= window:
+            v = x1[i - window]
+            if v == v:
+                n -= 1
+                for j in range(np.searchsorted(buf[:n + 1], v), n):
+                    buf[j] = buf[j + 1]
+        v = x1[i]
+        if v != v:
+            continue
+        lo = np.searchsorted(buf[:n], v, side='left')
+        hi = np.searchsorted(buf[:n], v, side='right')
+        for j in range(n, hi, -1):
+            buf[j] = buf[j - 1]
+        buf[hi] = v
+        n += 1
+        if n >= min_periods:
+            # 并列取平均名次
+            out[i] = (lo + hi + 2) / 2 / n
+    return out
 
 
 @jit(nopython=True, nogil=True, cache=True)
 def roll_prod(x1, window, min_periods):
-    out1 = full_with_window_size(x1, np.nan, dtype=np.float64, window_size=window)
-    a1 = sliding_window_with_min_periods(out1, window, min_periods)
-    out1[:] = np.nan
-    for i, v1 in enumerate(a1):
-        if np.isnan(v1).all():
+    """rolling product of the non-nan values from a running sum of log|x|, the count of negatives, zeros and infs
+    滚动乘积。维护log|x|之和、负数、零与无穷的个数，不再逐窗口连乘。log|x|之和每隔window步重算一次，防止误差累积"""
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    lg = np.zeros(window, dtype=np.float64)  # 窗口内有限非零值的log|x|，其它为0
+    s = 0.0
+    n = 0  # 有效值个数
+    n_neg = 0
+    n_zero = 0
+    n_inf = 0
+    for i in range(x1.shape[0]):
+        if i >= window:
+            v = x1[i - window]
+            if v == v:
+                n -= 1
+                if v < 0:
+                    n_neg -= 1
+                if v == 0:
+                    n_zero -= 1
+                elif np.isinf(v):
+                    n_inf -= 1
+        k = i % window
+        v = x1[i]
+        s -= lg[k]
+        lg[k] = 0.0
+        if v == v:
+            n += 1
+            if v < 0:
+                n_neg += 1
+            if v == 0:
+                n_zero += 1
+            elif np.isinf(v):
+                n_inf += 1
+            else:
+                lg[k] = np.log(np.abs(v))
+        if k == window - 1:
+            s = lg.sum()
+        else:
+            s += lg[k]
+        if n < min_periods or n == 0:
             continue
-        out1[i] = nanprod(v1)
-    return out1[:x1.shape[0]]
+        if n_zero > 0:
+            r = np.nan if n_inf > 0 else 0.0
+        elif n_inf > 0:
+            r = np.inf
+        else:
+            r = np.exp(s)
+        out[i] = -r if n_neg % 2 else r
+    return out
 
 
-@jit(nopython=True, nogil=True, cache=True)
-def _co_kurtosis(a1, a2):
-    t1 = a1 - nanmean(a1)
-    t2 = a2 - nanmean(a2)
-    t3 = nanstd(a1)
-    t4 = nanstd(a2)
-    return nanmean(t1 * (t2 ** 3)) / (t3 * (t4 ** 3))
+@jit(nopython=True, nogil=True, fastmath=_FASTMATH, error_model='numpy', cache=True)
+def _co_moment_update(x, y, sx, sy, p, sign, own_x, own_y, pair):
+    """add (sign=1) or remove (sign=-1) one pair, values are shifted by sx/sy to reduce cancellation
+    增删一对数据。先减去偏移量再累加，减少高阶矩的相消误差"""
+    if x == x:
+        dx = x - sx
+        own_x[0] += sign
+        own_x[1] += sign * dx
+        own_x[2] += sign * dx * dx
+    if y == y:
+        dy = y - sy
+        own_y[0] += sign
+        own_y[1] += sign * dy
+        own_y[2] += sign * dy * dy
+    if x == x and y == y:
+        yk = 1.0
+        for k in range(p + 1):
+            pair[0, k] += sign * yk
+            pair[1, k] += sign * dx * yk
+            yk *= dy
 
 
 @jit(nopython=True, nogil=True, cache=True)
-def roll_co_kurtosis(x1, x2, window, min_periods):
-    out1 = full_with_window_size(x1, np.nan, dtype=np.float64, window_size=window)
-    out2 = full_with_window_size(x2, np.nan, dtype=np.float64, window_size=window)
-    a1 = sliding_window_with_min_periods(out1, window, min_periods)
-    a2 = sliding_window_with_min_periods(out2, window, min_periods)
-    out1[:] = np.nan
-    for i, (v1, v2) in enumerate(zip(a1, a2)):
-        if np.isnan(v1).all():
+def _track_run(v, run, k):
+    """run[k, 0] counts the latest consecutive equal valid values, run[k, 1] is the latest valid value
+    记录最近连续相同的有效值个数与最近的有效值。个数不少于窗口内有效值个数时窗口为常数，方差精确为0"""
+    if v == v:
+        run[k, 0] = run[k, 0] + 1 if v == run[k, 1] else 1
+        run[k, 1] = v
+
+
+@jit(nopython=True, nogil=True, fastmath=_FASTMATH, error_model='numpy', cache=True)
+def _window_mean(x1, start, end, default):
+    s = 0.0
+    n = 0
+    for j in range(start, end):
+        v = x1[j]
+        if v == v:
+            s += v
+            n += 1
+    return s / n if n > 0 else default
+
+
+@jit(nopython=True, nogil=True, fastmath=_FASTMATH, error_model='numpy', cache=True)
+def _roll_co_moment(x1, x2, window, min_periods, p):
+    """E[(x-mean(x))*(y-mean(y))^p] / (std(x)*std(y)^p), running sums updated per step
+    滚动协偏度(p=2)与协峰度(p=3)。均值与标准差各自按有效值计算，乘积项按成对有效值计算
+
+    The sums are rebuilt around the window means every `window` steps, so the cost stays O(1) per step
+    每隔window步以窗口均值为偏移量重建一次累加和，防止误差累积，均摊后每步仍为O(1)
+    """
+    out = full(x1.shape[0], np.nan, dtype=np.float64)
+    own_x = np.zeros(3)
+    own_y = np.zeros(3)
+    pair = np.zeros((2, p + 1))
+    run = np.zeros((2, 2))
+    run[:, 1] = np.nan
+    sx = 0.0
+    sy = 0.0
+    for i in range(x1.shape[0]):
+        start = max(i - window + 1, 0)
+        _track_run(float(x1[i]), run, 0)
+        _track_run(float(x2[i]), run, 1)
+        if i % window == 0:
+            sx = _window_mean(x1, start, i + 1, sx)
+            sy = _window_mean(x2, start, i + 1, sy)
+            own_x[:] = 0
+            own_y[:] = 0
+            pair[:] = 0
+            for j in range(start, i + 1):
+                _co_moment_update(float(x1[j]), float(x2[j]), sx, sy, p, 1.0, own_x, own_y, pair)
+        else:
+            _co_moment_update(float(x1[i]), float(x2[i]), sx, sy, p, 1.0, own_x, own_y, pair)
+            if i >= window:
+                _co_moment_update(float(x1[i - window]), float(x2[i - window]), sx, sy, p, -1.0, own_x, own_y, pair)
+        n_x, n_y, n_p = own_x[0], own_y[0], pair[0, 0]
+        if n_x < min_periods or n_y < min_periods or n_p == 0:
             continue
-        if np.isnan(v2).all():
+        a = own_x[1] / n_x
+        b = own_y[1] / n_y
+        var_x = own_x[2] / n_x - a * a
+        var_y = own_y[2] / n_y - b * b
+        # 常数窗口的方差按增删计算会留下残余误差，不为0
+        if var_x <= 0 or var_y <= 0 or run[0, 0] >= n_x or run[1, 0] >= n_y:
             continue
-        out1[i] = _co_kurtosis(v1, v2)
-    return out1[:x1.shape[0]]
+        # E[(x-a)(y-b)^p] = sum_k C(p,k) (-b)^(p-k) (E[x y^k] - a E[y^k])
+        num = 0.0
+        c = 1.0
+        for k in range(p + 1):
+            num += c * (-b) ** (p - k) * (pair[1, k] - a * pair[0, k]) / n_p
+            c = c * (p - k) / (k + 1)
+        out[i] = num / (np.sqrt(var_x) * np.sqrt(var_y) ** p)
+    return out
 
 
 @jit(nopython=True, nogil=True, cache=True)
-def _co_skewness(a1, a2):
-    t1 = a1 - nanmean(a1)
-    t2 = a2 - nanmean(a2)
-    t3 = nanstd(a1)
-    t4 = nanstd(a2)
-    return nanmean(t1 * (t2 ** 2)) / (t3 * (t4 ** 2))
+def roll_co_kurtosis(x1, x2, window, min_periods):
+    return _roll_co_moment(x1, x2, window, min_periods, 3)
 
 
 @jit(nopython=True, nogil=True, cache=True)
 def roll_co_skewness(x1, x2, window, min_periods):
-    out1 = full_with_window_size(x1, np.nan, dtype=np.float64, window_size=window)
-    out2 = full_with_window_size(x2, np.nan, dtype=np.float64, window_size=window)
-    a1 = sliding_window_with_min_periods(out1, window, min_periods)
-    a2 = sliding_window_with_min_periods(out2, window, min_periods)
-    out1[:] = np.nan
-    for i, (v1, v2) in enumerate(zip(a1, a2)):
-        if np.isnan(v1).all():
-            continue
-        if np.isnan(v2).all():
-            continue
-        out1[i] = _co_skewness(v1, v2)
-    return out1[:x1.shape[0]]
+    return _roll_co_moment(x1, x2, window, min_periods, 2)
 
 
 @jit(nopython=True, nogil=True, cache=True)
@@ -119,6 +311,465 @@ def roll_moment(x1, window, min_periods, k):
     return out1[:x1.shape[0]]
 
 
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_mean_std(x1, window, min_periods):
+    """rolling mean and population std with Welford's add/remove update, one pass
+    Welford算法增删窗口数据，一次循环同时得到均值与标准差"""
+    out1 = full(x1.shape, np.nan, dtype=np.float64)
+    out2 = full(x1.shape, np.nan, dtype=np.float64)
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    run = 0  # 最近连续相同的有效值个数
+    last = np.nan
+    for i in range(x1.shape[0]):
+        v = x1[i]
+        if v == v:
+            n += 1
+            d = v - mean
+            mean += d / n
+            m2 += d * (v - mean)
+            run = run + 1 if v == last else 1
+            last = v
+        if i >= window:
+            v = x1[i - window]
+            if v == v:
+                n -= 1
+                if n == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    d = v - mean
+                    mean -= d / n
+                    m2 -= d * (v - mean)
+        if run >= n > 0:
+            # 窗口内的值全部相同，直接置为精确值，否则增删的残余误差会让标准差不为0
+            mean, m2 = last, 0.0
+        elif (i + 1) % window == 0:
+            # 每隔window步用窗口内的数据重算一次，防止误差累积
+            n, mean, m2 = _mean_m2(x1[i + 1 - window:i + 1])
+        if n >= min_periods and n > 0:
+            out1[i] = mean
+            out2[i] = np.sqrt(max(m2, 0.0) / n)
+    return out1, out2
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_zscore_ir(x1, window, min_periods, is_ir):
+    """is_ir为True时输出mean/std，否则输出(x-mean)/std。标准差为0时输出nan"""
+    mean, std = _roll_mean_std(x1, window, min_periods)
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    for i in range(x1.shape[0]):
+        if std[i] > 0:
+            out[i] = (mean[i] if is_ir else x1[i] - mean[i]) / std[i]
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_logret_std(x1, window, min_periods):
+    """rolling population std of log returns, the log is taken once per value
+    对数收益率的滚动标准差，每个值只取一次对数，不再生成log与diff两列中间结果"""
+    r = full(x1.shape, np.nan, dtype=np.float64)
+    last = np.nan
+    for i in range(x1.shape[0]):
+        v = np.log(x1[i])
+        r[i] = v - last
+        last = v
+    return _roll_mean_std(r, window, min_periods)[1]
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_count_true(x1, window, min_periods):
+    """rolling_sum over a 0/1 column, nan is treated as null
+    对0/1数据滚动计数，输入为UInt8一字节视图，不再转成UInt32"""
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    s, c = 0, 0
+    for i in range(x1.shape[0]):
+        v = x1[i]
+        if v == v:
+            s += v != 0
+            c += 1
+        if i >= window:
+            v = x1[i - window]
+            if v == v:
+                s -= v != 0
+                c -= 1
+        if c >= min_periods:
+            out[i] = s
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_count_n(x1, window, n, min_periods, is_ge):
+    """(rolling_sum(x, n) == n) & (rolling_sum(x, window) ==/>= n), two running counters in one pass
+    两个窗口的计数在一次循环中维护。输出1/0/nan，nan表示null，与polars的三值逻辑一致"""
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    s_n, c_n = 0, 0  # 短窗口的和与有效个数
+    s_d, c_d = 0, 0  # 长窗口的和与有效个数
+    for i in range(x1.shape[0]):
+        v = x1[i]
+        if v == v:
+            s_n += v
+            c_n += 1
+            s_d += v
+            c_d += 1
+        if i >= n:
+            v = x1[i - n]
+            if v == v:
+                s_n -= v
+                c_n -= 1
+        if i >= window:
+            v = x1[i - window]
+            if v == v:
+                s_d -= v
+                c_d -= 1
+        # null为-1
+        a = -1 if c_n < n else int(s_n == n)
+        if c_d < min_periods:
+            b = -1
+        elif is_ge:
+            b = int(s_d >= n)
+        else:
+            b = int(s_d == n)
+        if a == 0 or b == 0:
+            out[i] = 0.0
+        elif a == 1 and b == 1:
+            out[i] = 1.0
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_count_eq(x1, window, n, min_periods):
+    """(rolling_sum(x, n) == n) & (rolling_sum(x, window) == n)"""
+    return _roll_count_n(x1, window, n, min_periods, False)
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_count_ge(x1, window, n, min_periods):
+    """(rolling_sum(x, n) == n) & (rolling_sum(x, window) >= n)"""
+    return _roll_count_n(x1, window, n, min_periods, True)
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_l2norm(x1, window, min_periods):
+    """sqrt(rolling_sum(x**2)), the squares are added on entry and subtracted on exit
+    滚动平方和，新值加入旧值移出，不生成平方的中间列"""
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    s = 0.0
+    n = 0
+    for i in range(x1.shape[0]):
+        v = x1[i]
+        if v == v:
+            s += v * v
+            n += 1
+        if i >= window:
+            v = x1[i - window]
+            if v == v:
+                s -= v * v
+                n -= 1
+        if n == 0:
+            # 窗口内无有效值时清零，防止累积误差
+            s = 0.0
+        if n >= min_periods and n > 0:
+            out[i] = np.sqrt(max(s, 0.0))
+    return out
+
+
+@jit(nopython=True, nogil=True, fastmath=_FASTMATH, error_model='numpy', cache=True)
+def _roll_weighted_mean(x1, w1, window, min_periods):
+    """rolling_sum(x*w) / rolling_sum(w), both sums rolled in one pass
+    分子分母在一次循环中同时滚动，不生成x*w的中间列。分子只计x与w都有效的位置，分母计w有效的位置"""
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    s_xw, n_xw = 0.0, 0
+    s_w, n_w = 0.0, 0
+    for i in range(x1.shape[0]):
+        v, w = x1[i], w1[i]
+        if w == w:
+            s_w += w
+            n_w += 1
+            if v == v:
+                s_xw += v * w
+                n_xw += 1
+        if i >= window:
+            v, w = x1[i - window], w1[i - window]
+            if w == w:
+                s_w -= w
+                n_w -= 1
+                if v == v:
+                    s_xw -= v * w
+                    n_xw -= 1
+        if n_w == 0:
+            # 窗口内无有效值时清零，防止累积误差
+            s_xw, s_w = 0.0, 0.0
+        if n_xw >= min_periods and n_w >= min_periods and n_xw > 0:
+            out[i] = s_xw / s_w
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_zscore(x1, window, min_periods):
+    """(x - rolling_mean) / rolling_std(ddof=0)"""
+    return _roll_zscore_ir(x1, window, min_periods, False)
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_ir(x1, window, min_periods):
+    """rolling_mean / rolling_std(ddof=0)"""
+    return _roll_zscore_ir(x1, window, min_periods, True)
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _ols_1_moments(y1, x1):
+    """count, means and co-moments of the rows where both x and y are valid, two passes
+    x与y都有效的行的个数、均值与协方差，两遍计算。用于滚动回归定期重算，清除增删留下的残余误差"""
+    n = 0
+    mx, my = 0.0, 0.0
+    for k in range(y1.shape[0]):
+        y, x = y1[k], x1[k]
+        if y == y and x == x:
+            n += 1
+            mx += x
+            my += y
+    if n == 0:
+        return 0, 0.0, 0.0, 0.0, 0.0
+    mx /= n
+    my /= n
+    sxx, sxy = 0.0, 0.0
+    for k in range(y1.shape[0]):
+        y, x = y1[k], x1[k]
+        if y == y and x == x:
+            sxx += (x - mx) * (x - mx)
+            sxy += (x - mx) * (y - my)
+    return n, mx, my, sxx, sxy
+
+
+# x的离差平方和相对于n*mean(x)^2小于此值时视为x为常数
+_OLS_SXX_RTOL = 1e-14
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_ols_1_fill(y1, x1, window, min_periods, slope, intercept, resid, pred):
+    """rolling `y = slope * x + intercept`, means and co-moments are kept by Welford's add/remove update.
+    Outputs passed as empty arrays are skipped
+    一元滚动回归，Welford算法增删窗口数据维护均值与协方差。输出数组长度为0时表示不需要，跳过不写
+
+    空值的处理与polars-ols的`null_policy='drop_window'`一致:
+
+    1. 只使用窗口内x与y都有效的行，有效行数不少于min_periods时重新估计
+    2. 有效行数不足时沿用上一次的斜率与截距
+    3. x或y为空的行，残差与预测值为空
+
+    窗口内x为常数时斜率与截距为nan。polars-ols此时的结果只是数值噪声，这里不沿用。
+    min_periods等于window且第一个窗口有空值时，polars-ols第一次估计用到了超过window行的数据，这里严格只用窗口内的行
+    """
+    n = 0
+    mx, my = 0.0, 0.0
+    sxx, sxy = 0.0, 0.0
+    run = 0  # 最近连续相同的有效x个数
+    last = np.nan
+    b, a = np.nan, np.nan  # 最近一次的估计
+    for i in range(y1.shape[0]):
+        y, x = y1[i], x1[i]
+        if y == y and x == x:
+            n += 1
+            dx = x - mx
+            mx += dx / n
+            my += (y - my) / n
+            sxx += dx * (x - mx)
+            sxy += dx * (y - my)
+            run = run + 1 if x == last else 1
+            last = x
+        if i >= window:
+            y, x = y1[i - window], x1[i - window]
+            if y == y and x == x:
+                n -= 1
+                if n == 0:
+                    mx, my = 0.0, 0.0
+                    sxx, sxy = 0.0, 0.0
+                else:
+                    dx = x - mx
+                    mx -= dx / n
+                    sxx -= dx * (x - mx)
+                    sxy -= (x - mx) * (y - my)
+                    my -= (y - my) / n
+        if run >= n > 0:
+            # 窗口内x全部相同，置为精确值，否则增删的残余误差会让x的方差不为0
+            mx, sxx, sxy = last, 0.0, 0.0
+        elif (i + 1) % window == 0:
+            # 每隔window步用窗口内的数据重算一次，防止误差累积
+            n, mx, my, sxx, sxy = _ols_1_moments(y1[i + 1 - window:i + 1], x1[i + 1 - window:i + 1])
+        if n >= min_periods and n > 0:
+            ok = sxx > _OLS_SXX_RTOL * n * mx * mx and sxx > 0
+            # 除数不为0，防止编译器提前计算0/0触发gufunc的浮点异常警告
+            b = sxy / (sxx if ok else 1.0)
+            a = my - b * mx
+            if not ok:
+                b, a = np.nan, np.nan
+        p = b * x1[i] + a
+        if y1[i] != y1[i]:
+            p = np.nan
+        if slope.shape[0] > 0:
+            slope[i] = b
+        if intercept.shape[0] > 0:
+            intercept[i] = a
+        if pred.shape[0] > 0:
+            pred[i] = p
+        if resid.shape[0] > 0:
+            resid[i] = y1[i] - p
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_ols_1(y1, x1, window, min_periods):
+    """slope, intercept, resid and pred in one pass
+    一次循环同时得到斜率、截距、残差与预测值"""
+    slope = np.empty(y1.shape, dtype=np.float64)
+    intercept = np.empty(y1.shape, dtype=np.float64)
+    resid = np.empty(y1.shape, dtype=np.float64)
+    pred = np.empty(y1.shape, dtype=np.float64)
+    _roll_ols_1_fill(y1, x1, window, min_periods, slope, intercept, resid, pred)
+    return slope, intercept, resid, pred
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_ols_1_coefs(y1, x1, window, min_periods):
+    """slope and intercept only, resid and pred are neither allocated nor computed
+    只返回斜率与截距，残差与预测值不分配也不计算"""
+    slope = np.empty(y1.shape, dtype=np.float64)
+    intercept = np.empty(y1.shape, dtype=np.float64)
+    empty = np.empty(0, dtype=np.float64)
+    _roll_ols_1_fill(y1, x1, window, min_periods, slope, intercept, empty, empty)
+    return slope, intercept
+
+
+@guvectorize([(float64[:], float64[:], int64, int64, float64[:])], '(n),(n),(),()->(n)', nopython=True, cache=True)
+def gu_roll_resid(y1, x1, window, min_periods, out):
+    """rolling residual of `y = slope * x + intercept`. As a gufunc, 2D input of shape (asset, time) runs every row in one call
+    一元滚动回归的残差。gufunc可以直接传入(资产, 时间)的二维数组，所有资产在一次调用中算完"""
+    empty = np.empty(0, dtype=np.float64)
+    _roll_ols_1_fill(y1, x1, window, min_periods, empty, empty, out, empty)
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _cholesky(a, L):
+    """Cholesky factor of `a` written into the lower triangle of `L`, returns False when `a` is (nearly) singular.
+    Columns dependent on the previous ones are dropped, their column in `L` is zero
+    Cholesky分解写入L的下三角，矩阵不正定或接近奇异时返回False。与前面列线性相关的列被剔除，L中该列为0，仍可用于求解"""
+    p = a.shape[0]
+    full_rank = True
+    for j in range(p):
+        s = a[j, j]
+        for k in range(j):
+            s -= L[j, k] * L[j, k]
+        if s <= a[j, j] * 1e-12:
+            full_rank = False
+            for i in range(j, p):
+                L[i, j] = 0.0
+            continue
+        L[j, j] = np.sqrt(s)
+        for i in range(j + 1, p):
+            t = a[i, j]
+            for k in range(j):
+                t -= L[i, k] * L[j, k]
+            L[i, j] = t / L[j, j]
+    return full_rank
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _cholesky_rank1(L, v, sign):
+    """update (sign=1) or downdate (sign=-1) the factor in place to that of `L @ L.T + sign * v @ v.T`, O(p^2)
+    Cholesky因子的秩1更新与降秩，原地修改L与v。降秩后不再正定时返回False，需要重新分解"""
+    p = L.shape[0]
+    for k in range(p):
+        d = L[k, k]
+        r2 = d * d + sign * v[k] * v[k]
+        if r2 <= d * d * 1e-8:
+            return False
+        r = np.sqrt(r2)
+        c = r / d
+        t = v[k] / d
+        L[k, k] = r
+        for j in range(k + 1, p):
+            L[j, k] = (L[j, k] + sign * t * v[j]) / c
+            v[j] = c * v[j] - t * L[j, k]
+    return True
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _roll_ols_k(y1, x2, window, min_periods, is_resid):
+    """rolling least squares of `y1` on the columns of `x2` without intercept, residuals or predictions
+    多元滚动回归，不含截距。X'X的Cholesky因子随窗口增删行做秩1更新与降秩，每步O(p^2)。
+    降秩失败时以及每隔window步由X'X重新分解，防止误差累积。
+
+    空值的处理与polars-ols的`null_policy='drop_window'`一致:
+    只使用y与x都有效的行，有效行数不足min_periods时沿用上一次的系数，y或x为空的行输出nan。
+    X'X奇异时剔除线性相关的列再求解，残差与预测值与最小范数解相同"""
+    out = full(y1.shape, np.nan, dtype=np.float64)
+    p = x2.shape[1]
+    xtx = np.zeros((p, p), dtype=np.float64)
+    xty = np.zeros(p, dtype=np.float64)
+    L = np.zeros((p, p), dtype=np.float64)
+    v = np.empty(p, dtype=np.float64)
+    beta = full(p, np.nan, dtype=np.float64)
+    valid = np.empty(y1.shape[0], dtype=np.bool_)
+    n = 0
+    ok = False  # L是否为当前窗口X'X的满秩因子
+    for i in range(y1.shape[0]):
+        f = y1[i] == y1[i]
+        for a in range(p):
+            f = f and x2[i, a] == x2[i, a]
+        valid[i] = f
+        if f:
+            n += 1
+            for a in range(p):
+                xty[a] += x2[i, a] * y1[i]
+                for b in range(p):
+                    xtx[a, b] += x2[i, a] * x2[i, b]
+            if ok:
+                v[:] = x2[i]
+                ok = _cholesky_rank1(L, v, 1.0)
+        if i >= window and valid[i - window]:
+            j = i - window
+            n -= 1
+            for a in range(p):
+                xty[a] -= x2[j, a] * y1[j]
+                for b in range(p):
+                    xtx[a, b] -= x2[j, a] * x2[j, b]
+            if n == 0:
+                xtx[:] = 0.0
+                xty[:] = 0.0
+            if ok:
+                v[:] = x2[j]
+                ok = _cholesky_rank1(L, v, -1.0)
+        if n < min_periods or n == 0:
+            ok = False
+        else:
+            if not ok or i % window == 0:
+                ok = _cholesky(xtx, L)
+            # L z = X'y, L' beta = z，被剔除的列系数为0
+            for a in range(p):
+                if L[a, a] == 0.0:
+                    beta[a] = 0.0
+                    continue
+                t = xty[a]
+                for b in range(a):
+                    t -= L[a, b] * beta[b]
+                beta[a] = t / L[a, a]
+            for a in range(p - 1, -1, -1):
+                if L[a, a] == 0.0:
+                    continue
+                t = beta[a]
+                for b in range(a + 1, p):
+                    t -= L[b, a] * beta[b]
+                beta[a] = t / L[a, a]
+        if not f:
+            continue
+        pred = 0.0
+        for a in range(p):
+            pred += x2[i, a] * beta[a]
+        out[i] = y1[i] - pred if is_resid else pred
+    return out
+
+
 @jit(nopython=True, nogil=True, cache=True)
 def _partial_corr(a1, a2, a3):
     """TODO 不知是否正确，需要检查"""
@@ -153,117 +804,224 @@ def roll_partial_corr(x1, x2, x3, window, min_periods):
 
 
 @jit(nopython=True, nogil=True, cache=True)
-def _triple_corr(a1, a2, a3):
-    t1 = a1 - nanmean(a1)
-    t2 = a2 - nanmean(a2)
-    t3 = a3 - nanmean(a3)
-    t4 = nanstd(a1)
-    t5 = nanstd(a2)
-    t6 = nanstd(a3)
-    return nanmean(t1 * t2 * t3) / (t4 * t5 * t6)
+def _triple_corr_update(x, y, z, sx, sy, sz, sign, own, tri):
+    """add (sign=1) or remove (sign=-1) one triple
+    增删一组数据。own为各自的个数、和、平方和，tri为三者同时有效时的各项和"""
+    v = (x, y, z)
+    s = (sx, sy, sz)
+    for k in range(3):
+        if v[k] == v[k]:
+            d = v[k] - s[k]
+            own[k, 0] += sign
+            own[k, 1] += sign * d
+            own[k, 2] += sign * d * d
+    if x == x and y == y and z == z:
+        dx, dy, dz = x - sx, y - sy, z - sz
+        tri[0] += sign
+        tri[1] += sign * dx
+        tri[2] += sign * dy
+        tri[3] += sign * dz
+        tri[4] += sign * dx * dy
+        tri[5] += sign * dx * dz
+        tri[6] += sign * dy * dz
+        tri[7] += sign * dx * dy * dz
 
 
 @jit(nopython=True, nogil=True, cache=True)
 def roll_triple_corr(x1, x2, x3, window, min_periods):
-    out1 = full_with_window_size(x1, np.nan, dtype=np.float64, window_size=window)
-    out2 = full_with_window_size(x2, np.nan, dtype=np.float64, window_size=window)
-    out3 = full_with_window_size(x3, np.nan, dtype=np.float64, window_size=window)
-    a1 = sliding_window_with_min_periods(out1, window, min_periods)
-    a2 = sliding_window_with_min_periods(out2, window, min_periods)
-    a3 = sliding_window_with_min_periods(out3, window, min_periods)
-    out1[:] = np.nan
-    for i, (v1, v2, v3) in enumerate(zip(a1, a2, a3)):
-        if np.isnan(v1).all():
+    """E[(x-mean(x))(y-mean(y))(z-mean(z))] / (std(x)*std(y)*std(z)), running sums updated per step
+    均值与标准差各自按有效值计算，乘积项按三者同时有效的值计算。每隔window步重建一次累加和"""
+    out = full(x1.shape[0], np.nan, dtype=np.float64)
+    own = np.zeros((3, 3))
+    tri = np.zeros(8)
+    run = np.zeros((3, 2))
+    run[:, 1] = np.nan
+    sx, sy, sz = 0.0, 0.0, 0.0
+    for i in range(x1.shape[0]):
+        start = max(i - window + 1, 0)
+        _track_run(float(x1[i]), run, 0)
+        _track_run(float(x2[i]), run, 1)
+        _track_run(float(x3[i]), run, 2)
+        if i % window == 0:
+            sx = _window_mean(x1, start, i + 1, sx)
+            sy = _window_mean(x2, start, i + 1, sy)
+            sz = _window_mean(x3, start, i + 1, sz)
+            own[:] = 0
+            tri[:] = 0
+            for j in range(start, i + 1):
+                _triple_corr_update(float(x1[j]), float(x2[j]), float(x3[j]), sx, sy, sz, 1.0, own, tri)
+        else:
+            _triple_corr_update(float(x1[i]), float(x2[i]), float(x3[i]), sx, sy, sz, 1.0, own, tri)
+            if i >= window:
+                j = i - window
+                _triple_corr_update(float(x1[j]), float(x2[j]), float(x3[j]), sx, sy, sz, -1.0, own, tri)
+        if own[0, 0] < min_periods or own[1, 0] < min_periods or own[2, 0] < min_periods or tri[0] == 0:
             continue
-        if np.isnan(v2).all():
+        a = own[0, 1] / own[0, 0]
+        b = own[1, 1] / own[1, 0]
+        c = own[2, 1] / own[2, 0]
+        var_x = own[0, 2] / own[0, 0] - a * a
+        var_y = own[1, 2] / own[1, 0] - b * b
+        var_z = own[2, 2] / own[2, 0] - c * c
+        if var_x <= 0 or var_y <= 0 or var_z <= 0:
             continue
-        if np.isnan(v3).all():
+        if run[0, 0] >= own[0, 0] or run[1, 0] >= own[1, 0] or run[2, 0] >= own[2, 0]:
             continue
-        out1[i] = _triple_corr(v1, v2, v3)
-    return out1[:x1.shape[0]]
+        n = tri[0]
+        num = (tri[7] - a * tri[6] - b * tri[5] - c * tri[4] + a * b * tri[3] + a * c * tri[2] + b * c * tri[1]) / n - a * b * c
+        out[i] = num / np.sqrt(var_x * var_y * var_z)
+    return out
 
 
 @jit(nopython=True, nogil=True, fastmath=True, cache=True)
-def _cum_prod_by(r, by):
-    out = full(by.shape, 0, dtype=np.float64)
-    out[:] = by
-    for i in range(1, r.shape[0]):
+def _cum_prod_by(xx):
+    # 每行为(r, by)。astype一次完成分配与复制
+    out = xx[:, 1].astype(np.float64)
+    for i in range(1, xx.shape[0]):
         if isnan(out[i]):
-            out[i] = r[i] * out[i - 1]
+            out[i] = xx[i, 0] * out[i - 1]
     return out
 
 
 @jit(nopython=True, nogil=True, fastmath=True, cache=True)
-def _cum_sum_by(r, by):
-    out = full(by.shape, 0, dtype=np.float64)
-    out[:] = by
-    for i in range(1, r.shape[0]):
+def _cum_sum_by(xx):
+    # 每行为(r, by)。astype一次完成分配与复制
+    out = xx[:, 1].astype(np.float64)
+    for i in range(1, xx.shape[0]):
         if isnan(out[i]):
-            out[i] = r[i] + out[i - 1]
+            out[i] = xx[i, 0] + out[i - 1]
     return out
 
 
 @jit(nopython=True, nogil=True, fastmath=True, cache=True)
 def _cum_sum_reset(a):
-    last = 0
-    out = full(a.shape, 0, dtype=np.float64)
+    """accepts int, float and bool input directly, no cast to float beforehand
+    可直接输入整数、浮点、布尔，不用提前转成浮点"""
+    last = 0.0
+    out = np.empty(a.shape, dtype=np.float64)
     for i in range(0, a.shape[0]):
-        curr = 0 if isnan(a[i]) else a[i]
+        curr = 0.0 if isnan(a[i]) else float(a[i])
+        # 同号才累加，0、nan、反号时重置。用乘法代替分支，收益率正负随机时避免分支预测失败
+        same = ((curr > 0) & (last > 0)) | ((curr < 0) & (last < 0))
+        last = curr + last * same
+        out[i] = last
+    return out
 
-        if curr == 0:
-            out[i] = 0
-        elif curr > 0:
-            if last <= 0:
-                out[i] = curr
-            else:
-                out[i] = curr + last
-        elif curr < 0:
-            if last >= 0:
-                out[i] = curr
-            else:
-                out[i] = curr + last
 
-        last = out[i]
-    return out
+@jit(nopython=True, nogil=True, cache=True)
+def _select_kth(a, m, k):
+    """k-th smallest of a[:m], in-place quickselect, no allocation
+    原地快速选择，不分配内存"""
+    lo, hi = 0, m - 1
+    while lo < hi:
+        p = a[(lo + hi) // 2]
+        i, j = lo, hi
+        while i <= j:
+            while a[i] < p:
+                i += 1
+            while a[j] > p:
+                j -= 1
+            if i <= j:
+                a[i], a[j] = a[j], a[i]
+                i += 1
+                j -= 1
+        if k <= j:
+            hi = j
+        elif k >= i:
+            lo = i
+        else:
+            break
+    return a[k]
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _sum_by_threshold(x1, x2, start, end, t, n, is_top):
+    """sum x1 where x2 is beyond threshold t, then fill up to n with ties and nan by index order
+    先取严格越过阈值的，再按位置顺序补足相等的与nan，与稳定排序取前n个的结果一致"""
+    s = 0.0
+    c = 0
+    for j in range(start, end):
+        v = x2[j]
+        if (v > t) if is_top else (v < t):
+            s += x1[j]
+            c += 1
+    for j in range(start, end):
+        if c >= n:
+            break
+        if x2[j] == t:
+            s += x1[j]
+            c += 1
+    for j in range(start, end):
+        if c >= n:
+            break
+        if x2[j] != x2[j]:
+            s += x1[j]
+            c += 1
+    return s
 
 
 @jit(nopython=True, nogil=True, cache=True)
 def _sum_split_by(x1, x2, window=10, n=2):
+    """quickselect instead of sorting each window, O(d) per window
+    每个窗口用快速选择找第n小与第n大的阈值，不再整体排序"""
     out1 = np.full(x1.shape[0], np.nan, dtype=np.float64)
     out2 = np.full(x1.shape[0], np.nan, dtype=np.float64)
     if len(x1) < window:
         return out1, out2
-    a1 = sliding_window_view(x1, window)
-    a2 = sliding_window_view(x2, window)
-    for i, (v1, v2) in enumerate(zip(a1, a2)):
-        # 排序两次，解决nan的问题
-        b1 = np.argsort(v2)[:n]
-        b2 = np.argsort(-v2)[:n]
-        out1[i + window - 1] = np.sum(v1[b1])
-        out2[i + window - 1] = np.sum(v1[b2])
+    buf = np.empty(window, dtype=np.float64)
+    for i in range(window - 1, x1.shape[0]):
+        start = i - window + 1
+        m = 0
+        for j in range(start, i + 1):
+            v = x2[j]
+            if v == v:
+                buf[m] = v
+                m += 1
+        if m > n:
+            t1 = _select_kth(buf, m, n - 1)
+            t2 = _select_kth(buf, m, m - n)
+        else:
+            # 有效值不足n个，全部取用，再用nan位置补足
+            t1 = np.inf
+            t2 = -np.inf
+        out1[i] = _sum_by_threshold(x1, x2, start, i + 1, t1, n, False)
+        out2[i] = _sum_by_threshold(x1, x2, start, i + 1, t2, n, True)
     return out1, out2
 
 
-@jit(float64[:](boolean[:], boolean[:], boolean[:], boolean[:], boolean, boolean),
-     nopython=True, nogil=True, cache=True)
-def _signals_to_size(is_long_entry: np.ndarray, is_long_exit: np.ndarray,
-                     is_short_entry: np.ndarray, is_short_exit: np.ndarray,
+def _signals_table() -> np.ndarray:
+    """(是否累计, 持仓方向, 信号组合) -> 持仓变化
+
+    信号组合为`long_entry | long_exit << 1 | short_entry << 2 | short_exit << 3`，持仓方向0空仓、1多头、2空头
+    """
+    t = np.zeros((2, 3, 16), dtype=np.int64)
+    for acc in range(2):
+        for sig in range(16):
+            le, lx, se, sx = sig & 1, sig >> 1 & 1, sig >> 2 & 1, sig >> 3 & 1
+            # 空仓时多头信号优先级高于空头信号
+            t[acc, 0, sig] = 1 if le else -1 if se else 0
+            t[acc, 1, sig] = -1 if lx else 1 if le and acc else 0
+            t[acc, 2, sig] = 1 if sx else -1 if se and acc else 0
+    return t
+
+
+_SIGNALS_DELTA = _signals_table()
+
+
+@jit(nopython=True, nogil=True, error_model='numpy', cache=True)
+def _signals_to_size(xx: np.ndarray,
                      accumulate: bool = False,
                      action: bool = False) -> np.ndarray:
     """将4路信号转换成持仓状态。适合按资产分组后的长表,参考于`vectorbt`
 
+    4路信号组合成0~15的编号，与持仓方向一起查表得到持仓变化，循环内没有分支
+
     在`LongOnly`场景下，`is_short_entry`和`is_short_exit`输入数据值都为`False`即可
 
     Parameters
     ----------
-    is_long_entry: np.ndarray
-        是否多头入场
-    is_long_exit: np.ndarray
-        是否多头出场
-    is_short_entry: np.ndarray
-        是否空头入场
-    is_short_exit: np.ndarray
-        是否空头出场
+    xx: np.ndarray
+        C连续的(n, 4)数组，每行依次为是否多头入场、多头出场、空头入场、空头出场
     accumulate: bool
         遇到重复信号时是否累计
     action: bool
@@ -282,37 +1040,22 @@ def _signals_to_size(is_long_entry: np.ndarray, is_long_exit: np.ndarray,
     short_entry = np.array([False, False, True, False, False])
     short_exit = np.array([False, False, False, True, False])
 
-    amount = signals_to_amount(long_entry, long_exit, short_entry, short_exit, accumulate=True, action=False)
+    xx = np.column_stack([long_entry, long_exit, short_entry, short_exit]).astype(float)
+    amount = _signals_to_size(xx, accumulate=True, action=False)
     ```
 
     """
-    _amount: float = 0.0  # 持仓状态
-    _action: float = 0.0  # 下单方向
-    out = np.zeros(len(is_long_entry), dtype=np.float64)
-    for i in range(len(is_long_entry)):
-        if _amount == 0.0:
-            # 多头信号优先级高于空头信号
-            if is_long_entry[i]:
-                _amount += 1.0
-                _action = 1.0
-            elif is_short_entry[i]:
-                _amount -= 1.0
-                _action = -1.0
-        elif _amount > 0.0:
-            if is_long_exit[i]:
-                _amount -= 1.0
-                _action = -1.0
-            elif is_long_entry[i] and accumulate:
-                _amount += 1.0
-                _action = 1.0
-        else:
-            if is_short_exit[i]:
-                _amount += 1.0
-                _action = 1.0
-            elif is_short_entry[i] and accumulate:
-                _amount -= 1.0
-                _action = -1.0
-
+    tab = _SIGNALS_DELTA[1 if accumulate else 0]
+    _amount = 0  # 持仓状态
+    _action = 0  # 下单方向
+    out = np.zeros(xx.shape[0], dtype=np.float64)
+    for i in range(xx.shape[0]):
+        x = xx[i]
+        sig = (x[0] != 0) | (x[1] != 0) << 1 | (x[2] != 0) << 2 | (x[3] != 0) << 3
+        delta = tab[(_amount > 0) + (_amount < 0) * 2, sig]
+        _amount += delta
+        # 没有下单时保持上一次的方向
+        _action += (delta - _action) * (delta != 0)
         out[i] = _action if action else _amount
     return out
 
@@ -322,7 +1065,7 @@ def _roll_decay_linear(x1, window, min_periods):
     """
     def ts_decay_linear(x: Expr, d: int = 30, min_samples: Optional[int] = None) -> Expr:
         minp = min_samples or polars_ta.MIN_SAMPLES or d
-        return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _roll_decay_linear, d, minp), return_dtype=Float64)
+        return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _roll_decay_linear, d, minp, skip_nan=True), return_dtype=Float64)
 
     """
     weights = np.arange(1., window + 1)
@@ -343,7 +1086,7 @@ def _roll_decay_exp_window(x1, window, min_periods, factor):
     """
     def ts_decay_exp_window(x: Expr, d: int = 30, factor: float = 1.0, min_samples: Optional[int] = None) -> Expr:
         minp = min_samples or polars_ta.MIN_SAMPLES or d
-        return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _roll_decay_exp_window, d, minp, factor), return_dtype=Float64)
+        return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _roll_decay_exp_window, d, minp, factor, skip_nan=True), return_dtype=Float64)
 
     """
     weights = factor ** np.arange(window - 1, -1, -1)
@@ -357,3 +1100,81 @@ def _roll_decay_exp_window(x1, window, min_periods, factor):
         mask = ~np.isnan(v1)
         out1[i] = np.average(v1[mask], weights=weights[mask])
     return out1[:x1.shape[0]]
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _top_bottom(a, k):
+    """dense rank to -1/0/1, the k smallest ranks are -1 and the k largest are 1
+    由dense排名直接得到标记，排名前k为-1，后k为1"""
+    out = full(a.shape, np.nan, dtype=np.float64)
+    n = -np.inf
+    for i in range(a.shape[0]):
+        if a[i] > n:
+            n = a[i]
+    for i in range(a.shape[0]):
+        if a[i] == a[i]:
+            out[i] = np.int8(n - a[i] < k) - np.int8(a[i] <= k)
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _dense_rank_pct_if(cond, x1, scale):
+    """(dense rank - 1) * scale / max(max(dense rank) - 1, 1), only where `cond` is True, nan is skipped
+    只对满足条件的数据dense排名后归一化，一次排序完成"""
+    out = full(x1.shape, np.nan, dtype=np.float64)
+    idx = np.argsort(x1, kind='mergesort')
+    r = -1
+    last = np.nan
+    for i in idx:
+        v = x1[i]
+        if v != v:
+            break
+        if not cond[i]:
+            continue
+        if r < 0 or v != last:
+            r += 1
+            last = v
+        out[i] = r
+    m = max(r, 1)
+    for i in idx:
+        if out[i] == out[i]:
+            out[i] = out[i] * scale / m
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _dense_rank_pct(x1, scale):
+    """(dense rank - 1) * scale / max(max(dense rank) - 1, 1), nan is skipped
+    dense排名后归一化，一次排序完成"""
+    return _dense_rank_pct_if(np.ones(x1.shape, dtype=np.bool_), x1, scale)
+
+
+# 无空值的列to_numpy得到只读视图，有空值时得到可写的副本，两种都预先编译
+_F8_1D = (float64[::1], types.Array(float64, 1, 'C', readonly=True))
+# struct_to_numpy(out='2d')得到的总是可写的副本
+_F8_2D = float64[:, ::1]
+
+
+def precompile():
+    """compile the hot kernels for contiguous float64 input ahead of the first call, or load them from the on-disk cache
+    按连续float64输入预先编译热点kernel，已有磁盘缓存时直接加载，避免第一次计算时才等待编译
+
+    Notes
+    -----
+    The signatures are not fixed on the decorators, which would reject read-only views and other dtypes.
+    Inputs of other types still compile lazily on first use
+    签名没有写死在装饰器上，否则只读视图与其它类型的输入会报错。其它类型仍然在第一次使用时编译
+    """
+    for a in _F8_1D:
+        roll_argmax.compile((a, int64, int64, boolean))
+        roll_argmin.compile((a, int64, int64, boolean))
+        roll_moment.compile((a, int64, int64, int64))
+        roll_prod.compile((a, int64, int64))
+        roll_co_kurtosis.compile((a, a, int64, int64))
+        roll_co_skewness.compile((a, a, int64, int64))
+        roll_triple_corr.compile((a, a, a, int64, int64))
+        _cum_sum_reset.compile((a,))
+        _sum_split_by.compile((a, a, int64, int64))
+    _cum_prod_by.compile((_F8_2D,))
+    _cum_sum_by.compile((_F8_2D,))
+    _signals_to_size.compile((_F8_2D, boolean, boolean))
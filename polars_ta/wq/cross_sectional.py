@@ -5,15 +5,20 @@
 
 """
 import polars_ols as pls
-from polars import Expr, when, max_horizontal, UInt16, Int8, Utf8
+from polars import Expr, Series, when, UInt16, Int8, Float64, Boolean, struct, lit, min_horizontal, max_horizontal
 from polars_ols import OLSKwargs
 
+from polars_ta.utils.numba_ import batches_i1_o1, batches_i2_o1
+from polars_ta.wq._nb import _top_bottom, _dense_rank_pct, _dense_rank_pct_if
+
 # In the original version, the function names are not prefixed with `cs_`,
 # here we add it to prevent confusion
 # 原版函数名都没有加`cs_`, 这里统一加一防止混淆
 
 
 _ols_kwargs = OLSKwargs(null_policy='drop', solve_method='svd')
+# 一元回归(带截距)用QR分解即可，不必SVD
+_ols_kwargs_qr = OLSKwargs(null_policy='drop', solve_method='qr')
 
 
 def cs_one_side(x: Expr, is_long: bool = True) -> Expr:
@@ -49,10 +54,11 @@ def cs_one_side(x: Expr, is_long: bool = True) -> Expr:
     ```
 
     """
+    # 与0比较后直接相减，不需要when/otherwise分支
     if is_long:
-        return when(x.min() < 0).then(x - x.min()).otherwise(x)
+        return x - min_horizontal(x.min(), 0)
     else:
-        return when(x.max() > 0).then(x - x.max()).otherwise(x)
+        return x - max_horizontal(x.max(), 0)
 
 
 def cs_scale(x: Expr, scale_: float = 1, long_scale: float = 1, short_scale: float = 1) -> Expr:
@@ -91,13 +97,16 @@ def cs_scale(x: Expr, scale_: float = 1, long_scale: float = 1, short_scale: flo
 
     """
     if long_scale != 1 or short_scale != 1:
-        L = x.clip(lower_bound=0)  # 全正数
-        S = x.clip(upper_bound=0)  # 全负数
-        L = when(L.sum() == 0).then(0).otherwise(L / L.sum())
-        S = when(S.sum() == 0).then(0).otherwise(S / S.sum())  # 负数/负数=正数
-        return L * long_scale - S * short_scale
+        L = x.clip(lower_bound=0).sum()  # 正数之和
+        S = x.clip(upper_bound=0).sum()  # 负数之和
+        # 正数只除以正数之和，负数只除以负数之和，和为0时不会进入对应分支。0与null保持原样
+        return when(x > 0).then(x * (long_scale / L)).when(x < 0).then(x * (-short_scale / S)).otherwise(x)
     else:
-        return (x / x.abs().sum()).fill_nan(0) * scale_
+        expr = x / x.abs().sum()
+        # 默认scale_=1时不必再乘一遍
+        if scale_ != 1:
+            expr = expr * scale_
+        return expr.fill_nan(0)
 
 
 def cs_scale_down(x: Expr, constant: int = 0) -> Expr:
@@ -167,6 +176,15 @@ def cs_truncate(x: Expr, max_percent: float = 0.01) -> Expr:
     ----------
     https://platform.worldquantbrain.com/learn/operators/detailed-operator-descriptions#truncatexmaxpercent001
 
+    Notes
+    -----
+    `x.sum()` is evaluated once per cross-section and `clip` reads `x` once more, so there is no real double pass.
+    `min_horizontal(x, x.sum() * max_percent)` fills `null` with the bound and casts integers to float,
+    and keeping `null` with an extra `when` makes it slower than `clip`
+
+    `x.sum()`每个截面只计算一次，`clip`再读一次`x`，并不存在多余的遍历。
+    `min_horizontal`会把`null`填成上限值且整数变成浮点，用`when`保留`null`后反而比`clip`慢
+
     """
     return x.clip(upper_bound=x.sum() * max_percent)
 
@@ -230,12 +248,35 @@ def cs_fill_null(x: Expr, value: float = 0) -> Expr:
 
 def cs_regression_neut(y: Expr, x: Expr) -> Expr:
     """横截面上，一元回归残差"""
-    return pls.compute_least_squares(y, x, add_intercept=True, mode='residuals', ols_kwargs=_ols_kwargs)
+    return pls.compute_least_squares(y, x, add_intercept=True, mode='residuals', ols_kwargs=_ols_kwargs_qr)
 
 
 def cs_regression_proj(y: Expr, x: Expr) -> Expr:
     """横截面上，一元回归预测"""
-    return pls.compute_least_squares(y, x, add_intercept=True, mode='predictions', ols_kwargs=_ols_kwargs)
+    return pls.compute_least_squares(y, x, add_intercept=True, mode='predictions', ols_kwargs=_ols_kwargs_qr)
+
+
+def _rank_pct(x1: Series, scale: float) -> Series:
+    """(dense rank - 1) * scale / max(max(dense rank) - 1, 1)
+
+    数值与布尔类型转成float后用kernel一次排序完成，nan当成null。字符串等其它类型仍用polars的`rank`
+    """
+    if x1.dtype == Boolean:
+        x1 = x1.cast(Float64)
+    if x1.dtype.is_numeric():
+        return batches_i1_o1(x1.to_numpy(), _dense_rank_pct, scale)
+    r = x1.rank(method='dense') - 1
+    return r * scale / max(r.max() or 0, 1)
+
+
+def _rank_pct_if(xx: Series, scale: float) -> Series:
+    """只对满足条件的数据排名，其余为null。类型处理与`_rank_pct`相同"""
+    cond, x1 = xx.struct.unnest().get_columns()
+    if x1.dtype == Boolean:
+        x1 = x1.cast(Float64)
+    if x1.dtype.is_numeric():
+        return batches_i2_o1([cond.to_numpy(), x1.to_numpy()], _dense_rank_pct_if, scale)
+    return _rank_pct(x1.scatter((~cond).arg_true(), None), scale)
 
 
 def cs_rank(x: Expr, pct: bool = True) -> Expr:
@@ -276,6 +317,10 @@ def cs_rank(x: Expr, pct: bool = True) -> Expr:
     └──────┴──────────┴──────┘
     ```
 
+    Notes
+    -----
+    `pct=True`时`NaN`当成`null`，不参与排名，结果为`null`。`x.rank`会把`NaN`排在最大，所以与之前的结果不同
+
     References
     ----------
     https://platform.worldquantbrain.com/learn/operators/detailed-operator-descriptions#rankx-rate2
@@ -283,8 +328,7 @@ def cs_rank(x: Expr, pct: bool = True) -> Expr:
     """
     if pct:
         # (x-x.min)/(x.max-x.min)
-        r = x.rank(method='dense') - 1
-        return r / max_horizontal(r.max(), 1)
+        return x.map_batches(lambda x1: _rank_pct(x1, 1), return_dtype=Float64)
     else:
         return x.rank(method='dense')
 
@@ -334,7 +378,13 @@ def cs_rank_if(condition: Expr, x: Expr, pct: bool = True) -> Expr:
     已经产生了新的`None`，尽量避免之后再进行`ts_`时序计算。或按需调整`over_null`
     或配合`cs_fill_null`等将`null`填充
 
+    `pct=True`时`NaN`当成`null`，不参与排名，结果为`null`
+
     """
+    if pct:
+        # 条件不满足的数据在排序时直接跳过，不再生成一列带`null`的中间数据
+        cond = lit(condition) if isinstance(condition, bool) else condition
+        return struct(f0=cond.fill_null(False), f1=x).map_batches(lambda xx: _rank_pct_if(xx, 1), return_dtype=Float64)
     return cs_rank(when(condition).then(x).otherwise(None), pct)
 
 
@@ -378,9 +428,10 @@ def _cs_qcut_rank(x: Expr, q: int = 10) -> Expr:
     -----
     使用`rank`来实现`qcut`的效果
 
+    `NaN`当成`null`，不参与排名，结果为`null`
+
     """
-    r = x.rank(method='dense') - 1
-    return (r * q / max_horizontal(r.max(), 1)).cast(UInt16)
+    return x.map_batches(lambda x1: _rank_pct(x1, q), return_dtype=Float64).cast(UInt16)
 
 
 def cs_qcut(x: Expr, q: int = 10) -> Expr:
@@ -429,8 +480,15 @@ def cs_qcut(x: Expr, q: int = 10) -> Expr:
     """
     # 实测直接to_physical()无法用于over,相当于with pl.StringCache():
     # return x.qcut(q, allow_duplicates=True).to_physical()
+    # return x.qcut(q, allow_duplicates=True, labels=[f'{i}' for i in range(q)]).cast(Utf8).cast(UInt16)
 
-    return x.qcut(q, allow_duplicates=True, labels=[f'{i}' for i in range(q)]).cast(Utf8).cast(UInt16)
+    # 与qcut的分割点一致，区间左开右闭。直接二分查找得到箱号，不再生成字符串标签
+    # NaN当成null，否则quantile会把NaN算进去，分割点整体偏移
+    x = x.fill_nan(None)
+    breaks = x.quantile(1 / q, interpolation='linear')
+    for i in range(2, q):
+        breaks = breaks.append(x.quantile(i / q, interpolation='linear'))
+    return when(x.is_not_null()).then(breaks.search_sorted(x, side='left')).cast(UInt16)
 
 
 def cs_top_bottom(x: Expr, k: int = 10) -> Expr:
@@ -467,5 +525,4 @@ def cs_top_bottom(x: Expr, k: int = 10) -> Expr:
 
     # 值越小排第一，用来做空
     a = x.rank(method='dense')
-    b = a.max() - a
-    return (b < k).cast(Int8) - (a <= k).cast(Int8)
+    return a.map_batches(lambda x1: batches_i1_o1(x1.to_numpy(), _top_bottom, k, dtype=Int8), return_dtype=Int8)
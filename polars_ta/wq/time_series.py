@@ -1,17 +1,19 @@
 import itertools
-from typing import Optional
+import operator
+from functools import lru_cache, partial, reduce
+from typing import Optional, Sequence
 
 import more_itertools
 import numpy as np
 import polars_ols as pls
-from polars import Expr, UInt16, struct, when, Struct, Field, Float64, Boolean, UInt32, all_horizontal, any_horizontal
+from polars import Expr, Series, UInt8, UInt16, struct, when, Struct, Field, Float64, Boolean, UInt32, any_horizontal, sum_horizontal
 from polars import rolling_corr, rolling_cov
 from polars_ols import RollingKwargs
 
 import polars_ta
-from polars_ta.utils.numba_ import batches_i1_o1, batches_i2_o1, batches_i2_o2, struct_to_numpy
-from polars_ta.wq._nb import roll_argmax, roll_argmin, roll_co_kurtosis, roll_co_skewness, roll_moment, roll_partial_corr, roll_triple_corr, _cum_prod_by, _cum_sum_by, _signals_to_size, \
-    _cum_sum_reset, _sum_split_by, roll_prod
+from polars_ta.utils.numba_ import batches_i1_o1, batches_i2_o1, batches_i2_o2, struct_to_numpy, nb_roll_apply_par
+from polars_ta.wq._nb import roll_argmax, roll_argmin, roll_rank, roll_co_kurtosis, roll_co_skewness, roll_moment, roll_partial_corr, roll_triple_corr, _cum_prod_by, _cum_sum_by, _signals_to_size, \
+    _cum_sum_reset, _sum_split_by, roll_prod, _roll_zscore, _roll_ir, _roll_l2norm, _roll_count_eq, _roll_count_ge, _roll_count_true, _roll_logret_std, _roll_weighted_mean, _roll_ols_1, _roll_ols_1_coefs, _roll_ols_k, _moment, gu_roll_resid
 
 
 def ts_arg_max(x: Expr, d: int = 5, reverse: bool = True, min_samples: Optional[int] = None) -> Expr:
@@ -67,7 +69,7 @@ def ts_arg_max(x: Expr, d: int = 5, reverse: bool = True, min_samples: Optional[
 
     """
     minp = min_samples or polars_ta.MIN_SAMPLES or d
-    return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy(), roll_argmax, d, minp, reverse, dtype=UInt16), return_dtype=UInt16)
+    return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy(), roll_argmax, d, minp, reverse, dtype=UInt16, skip_nan=True), return_dtype=UInt16)
 
 
 def ts_arg_min(x: Expr, d: int = 5, reverse: bool = True, min_samples: Optional[int] = None) -> Expr:
@@ -119,7 +121,7 @@ def ts_arg_min(x: Expr, d: int = 5, reverse: bool = True, min_samples: Optional[
 
     """
     minp = min_samples or polars_ta.MIN_SAMPLES or d
-    return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy(), roll_argmin, d, minp, reverse, dtype=UInt16), return_dtype=UInt16)
+    return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy(), roll_argmin, d, minp, reverse, dtype=UInt16, skip_nan=True), return_dtype=UInt16)
 
 
 def ts_co_kurtosis(x: Expr, y: Expr, d: int = 5, ddof: int = 0, min_samples: Optional[int] = None) -> Expr:
@@ -193,6 +195,9 @@ def ts_count(x: Expr, d: int = 30, min_samples: Optional[int] = None) -> Expr:
     ```
 
     """
+    if polars_ta.USE_NUMBA:
+        minp = min_samples or polars_ta.MIN_SAMPLES or d
+        return x.cast(Boolean).cast(UInt8).map_batches(lambda x1: batches_i1_o1(x1.to_numpy(), _roll_count_true, d, minp, dtype=UInt32), return_dtype=UInt32)
     minp = min_samples or polars_ta.MIN_SAMPLES
     return x.cast(Boolean).cast(UInt32).rolling_sum(d, min_samples=minp)
 
@@ -209,6 +214,10 @@ def ts_count_eq(x: Expr, d: int = 30, n: int = 10, min_samples: Optional[int] =
         连续出现次数
 
     """
+    if polars_ta.USE_NUMBA:
+        # 两个窗口的计数一次循环完成
+        minp = min_samples or polars_ta.MIN_SAMPLES or d
+        return x.cast(Boolean).cast(UInt8).map_batches(lambda x1: batches_i1_o1(x1.to_numpy(), _roll_count_eq, d, n, minp, dtype=Boolean), return_dtype=Boolean)
     minp = min_samples or polars_ta.MIN_SAMPLES
     xx = x.cast(Boolean).cast(UInt32)
     return (xx.rolling_sum(n) == n) & (xx.rolling_sum(d, min_samples=minp) == n)
@@ -226,11 +235,33 @@ def ts_count_ge(x: Expr, d: int = 30, n: int = 10, min_samples: Optional[int] =
         至少连续出现次数
 
     """
+    if polars_ta.USE_NUMBA:
+        # 两个窗口的计数一次循环完成
+        minp = min_samples or polars_ta.MIN_SAMPLES or d
+        return x.cast(Boolean).cast(UInt8).map_batches(lambda x1: batches_i1_o1(x1.to_numpy(), _roll_count_ge, d, n, minp, dtype=Boolean), return_dtype=Boolean)
     minp = min_samples or polars_ta.MIN_SAMPLES
     xx = x.cast(Boolean).cast(UInt32)
     return (xx.rolling_sum(n) == n) & (xx.rolling_sum(d, min_samples=minp) >= n)
 
 
+def _roll_count_batch(m: Optional[Series], n: int, d: int, minp: int) -> Series:
+    """滚动计数。m为None表示全部为False且无空值，不用逐个计数，直接生成结果"""
+    if m is None:
+        out = np.zeros(n)
+        out[:min(minp - 1, n) if minp <= d else n] = np.nan
+        return Series(out, nan_to_null=True, dtype=UInt32)
+    return batches_i1_o1(m.cast(UInt8).to_numpy(), _roll_count_true, d, minp, dtype=UInt32)
+
+
+def _nan_mask(x1: Series) -> Optional[Series]:
+    """非浮点列不可能有nan，无空值时返回None"""
+    if x1.dtype.is_float():
+        return x1.is_nan()
+    if x1.has_nulls():
+        return x1.cast(Float64).is_nan()
+    return None
+
+
 def ts_count_nans(x: Expr, d: int = 5, min_samples: Optional[int] = None) -> Expr:
     """时序滚动统计nan出现次数
 
@@ -266,6 +297,10 @@ def ts_count_nans(x: Expr, d: int = 5, min_samples: Optional[int] = None) -> Exp
     ```
 
     """
+    if polars_ta.USE_NUMBA:
+        minp = min_samples or polars_ta.MIN_SAMPLES or d
+        # 批数据的类型与空值个数已知，整数、布尔列不用再判断nan
+        return x.map_batches(lambda x1: _roll_count_batch(_nan_mask(x1), len(x1), d, minp), return_dtype=UInt32)
     minp = min_samples or polars_ta.MIN_SAMPLES
     return x.is_nan().cast(UInt32).rolling_sum(d, min_samples=minp)
 
@@ -305,6 +340,10 @@ def ts_count_nulls(x: Expr, d: int = 5, min_samples: Optional[int] = None) -> Ex
     ```
 
     """
+    if polars_ta.USE_NUMBA:
+        minp = min_samples or polars_ta.MIN_SAMPLES or d
+        # 无空值的列不用再逐个判断
+        return x.map_batches(lambda x1: _roll_count_batch(x1.is_null() if x1.has_nulls() else None, len(x1), d, minp), return_dtype=UInt32)
     minp = min_samples or polars_ta.MIN_SAMPLES
     return x.is_null().cast(UInt32).rolling_sum(d, min_samples=minp)
 
@@ -469,7 +508,19 @@ def ts_cum_sum_reset(x: Expr) -> Expr:
     ```
 
     """
-    return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), _cum_sum_reset), return_dtype=Float64)
+    return x.map_batches(lambda x1: batches_i1_o1((x1.cast(UInt8) if x1.dtype == Boolean else x1).to_numpy(), _cum_sum_reset), return_dtype=Float64)
+
+
+@lru_cache(maxsize=512)
+def _linear_weights(d: int) -> list:
+    """线性衰减权重，按d缓存，避免每次构建表达式都重新生成"""
+    return np.arange(1, d + 1, dtype=float).tolist()
+
+
+@lru_cache(maxsize=512)
+def _exp_weights(d: int, factor: float) -> list:
+    """指数衰减权重，按(d, factor)缓存"""
+    return (np.repeat(factor, d) ** np.arange(d - 1, -1, -1)).tolist()
 
 
 def ts_decay_exp_window(x: Expr, d: int = 30, factor: float = 1.0, min_samples: Optional[int] = None) -> Expr:
@@ -515,7 +566,7 @@ def ts_decay_exp_window(x: Expr, d: int = 30, factor: float = 1.0, min_samples:
 
     """
     minp = min_samples or polars_ta.MIN_SAMPLES
-    weights = np.repeat(factor, d) ** np.arange(d - 1, -1, -1)
+    weights = _exp_weights(d, factor)
     # print(weights)
     # pyo3_runtime.PanicException: weights not yet supported on array with null values
     return x.fill_null(np.nan).rolling_mean(d, weights=weights, min_samples=minp).fill_nan(None)
@@ -558,7 +609,7 @@ def ts_decay_linear(x: Expr, d: int = 30, min_samples: Optional[int] = None) ->
 
     """
     minp = min_samples or polars_ta.MIN_SAMPLES
-    weights = np.arange(1, d + 1)
+    weights = _linear_weights(d)
     # print(weights)
     # pyo3_runtime.PanicException: weights not yet supported on array with null values
     # null换成NaN就不报错了，再换回来
@@ -628,7 +679,18 @@ def ts_fill_null(x: Expr, limit: int = None) -> Expr:
 def ts_ir(x: Expr, d: int = 1, min_samples: Optional[int] = None) -> Expr:
     """时序滚动信息系数
 
-    rolling information ratio"""
+    rolling information ratio
+
+    Notes
+    -----
+    When `polars_ta.USE_NUMBA` is set, mean and std are computed in one numba pass.
+    Windows with zero std give `null` instead of `inf`
+    设置`polars_ta.USE_NUMBA`后均值与标准差在一次numba循环中完成，标准差为0时返回`null`
+
+    """
+    if polars_ta.USE_NUMBA:
+        minp = min_samples or polars_ta.MIN_SAMPLES or d
+        return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _roll_ir, d, minp, skip_nan=True), return_dtype=Float64)
     return ts_mean(x, d, min_samples) / ts_std_dev(x, d, 0, min_samples)
 
 
@@ -683,7 +745,15 @@ def ts_l2_norm(x: Expr, d: int = 5, min_samples: Optional[int] = None) -> Expr:
     """欧几里得范数
 
     Euclidean norm
+
+    Notes
+    -----
+    When `polars_ta.USE_NUMBA` is set, the sum of squares is rolled in one numba pass
+    设置`polars_ta.USE_NUMBA`后平方和在一次numba循环中完成
     """
+    if polars_ta.USE_NUMBA:
+        minp = min_samples or polars_ta.MIN_SAMPLES or d
+        return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _roll_l2norm, d, minp, skip_nan=True), return_dtype=Float64)
     minp = min_samples or polars_ta.MIN_SAMPLES
     return x.pow(2).rolling_sum(d, min_samples=minp).sqrt()
 
@@ -760,9 +830,16 @@ def ts_moment(x: Expr, d: int, k: int = 0, min_samples: Optional[int] = None) ->
     k
     min_samples
 
+    Notes
+    -----
+    When `polars_ta.NUMBA_PARALLEL` is set, the windows are computed in parallel with numba `prange`
+    设置`polars_ta.NUMBA_PARALLEL`后各窗口用numba多线程并行计算
+
     """
     minp = min_samples or polars_ta.MIN_SAMPLES or d
-    return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy(), roll_moment, d, minp, k), return_dtype=Float64)
+    if polars_ta.NUMBA_PARALLEL:
+        return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), nb_roll_apply_par, d, minp, _moment, (k,), skip_nan=True), return_dtype=Float64)
+    return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy(), roll_moment, d, minp, k, skip_nan=True), return_dtype=Float64)
 
 
 def ts_partial_corr(x: Expr, y: Expr, z: Expr, d: int, min_samples: Optional[int] = None) -> Expr:
@@ -792,26 +869,70 @@ def ts_percentage(x: Expr, d: int, percentage: float = 0.5, min_samples: Optiona
     return x.rolling_quantile(percentage, window_size=d, min_samples=minp)
 
 
-def ts_product(x: Expr, d: int = 5, min_samples: Optional[int] = None) -> Expr:
-    """时序滚动乘"""
+def ts_product(x: Expr, d: int = 5, min_samples: Optional[int] = None, positive: bool = False) -> Expr:
+    """时序滚动乘
+
+    Parameters
+    ----------
+    x
+    d
+    min_samples
+    positive
+        已知x全为正数时设为True，改用`exp(rolling_sum(log(x)))`，全部由polars完成。此时`NaN`不会被跳过
+
+    """
     minp = min_samples or polars_ta.MIN_SAMPLES or d
-    return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy(), roll_prod, d, minp), return_dtype=Float64)
+    if positive:
+        return x.log().rolling_sum(d, min_samples=minp).exp()
+    return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), roll_prod, d, minp, skip_nan=True), return_dtype=Float64)
 
 
 def ts_rank(x: Expr, d: int = 5, min_samples: Optional[int] = None) -> Expr:
-    """时序滚动排名"""
+    """时序滚动排名
+
+    Notes
+    -----
+    `rolling_rank` is unstable and missing in older polars. The numba version is used for those,
+    or when `polars_ta.USE_NUMBA` is set. The numba version treats `NaN` as `null`, `rolling_rank` ranks it as a value
+    `rolling_rank`还不稳定，旧版polars中没有，此时或设置`polars_ta.USE_NUMBA`后使用numba实现。numba版`NaN`当成`null`处理，`rolling_rank`当成数值参与排名
+
+    """
+    if polars_ta.USE_NUMBA or not hasattr(Expr, 'rolling_rank'):
+        minp = min_samples or polars_ta.MIN_SAMPLES or d
+        return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), roll_rank, d, minp, skip_nan=True), return_dtype=Float64)
     minp = min_samples or polars_ta.MIN_SAMPLES
     return x.rolling_rank(d, min_samples=minp) / x.is_not_null().cast(UInt32).rolling_sum(d, min_samples=minp)
 
 
 def ts_realized_volatility(close: Expr, d: int = 5, min_samples: Optional[int] = None) -> Expr:
-    """已实现波动率"""
+    """已实现波动率
+
+    Notes
+    -----
+    When `polars_ta.USE_NUMBA` is set, log returns and their std are computed in one numba pass,
+    and `NaN` is treated as `null`
+    设置`polars_ta.USE_NUMBA`后对数收益率与标准差在一次numba循环中完成，`NaN`当成`null`处理
+
+    """
     minp = min_samples or polars_ta.MIN_SAMPLES or d
+    if polars_ta.USE_NUMBA:
+        return close.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _roll_logret_std, d, minp, skip_nan=True), return_dtype=Float64)
     return ts_log_diff(close, 1).rolling_std(d, ddof=0, min_samples=minp)
 
 
-def ts_returns(x: Expr, d: int = 1) -> Expr:
-    """简单收益率"""
+def ts_returns(x: Expr, d: int = 1, log: bool = False) -> Expr:
+    """简单收益率
+
+    Parameters
+    ----------
+    x
+    d
+    log
+        True时返回对数收益率`log(x) - log(x[t-d])`，只有一次对数与一次减法，收益率较小时与简单收益率近似
+
+    """
+    if log:
+        return ts_log_diff(x, d)
     return x.pct_change(d)
 
 
@@ -865,7 +986,8 @@ def ts_shifts_v1(*args) -> Expr:
     ```
 
     """
-    return all_horizontal(arg.shift(i) for i, arg in enumerate(args))
+    # 直接用&串联，与all_horizontal的Kleene逻辑一致
+    return reduce(operator.and_, (arg.shift(i) for i, arg in enumerate(args)))
 
 
 def ts_shifts_v2(*args) -> Expr:
@@ -954,11 +1076,26 @@ def ts_shifts_v3(*args) -> Expr:
     ```
 
     """
-    exprs = [a for a, b, c in more_itertools.chunked(args, 3)]
-    ranges = [range(b, c + 1) for a, b, c in more_itertools.chunked(args, 3)]
-    # 参数整理成col,repeat模式
-    outputs = [itertools.chain.from_iterable(zip(exprs, d)) for d in itertools.product(*ranges)]
-    return any_horizontal(ts_shifts_v2(*_) for _ in outputs)
+    # 不再展开成笛卡尔积。按已占用的平移天数记录前缀条件，相同前缀只算一次，落在同一天数的分支先合并
+    # None表示前面没有条件
+    states = {0: None}
+    for a, b, c in more_itertools.chunked(args, 3):
+        new_states = {}
+        for shift, prefix in states.items():
+            run = prefix
+            for k in range(c + 1):
+                if k >= b:
+                    t = shift + k
+                    if t not in new_states:
+                        new_states[t] = run
+                    elif run is None or new_states[t] is None:
+                        new_states[t] = None
+                    else:
+                        new_states[t] = new_states[t] | run
+                if k < c:
+                    run = a.shift(shift + k) if run is None else run & a.shift(shift + k)
+        states = new_states
+    return any_horizontal(states.values())
 
 
 def ts_skewness(x: Expr, d: int = 5, bias: bool = False, min_samples: Optional[int] = None) -> Expr:
@@ -1081,16 +1218,45 @@ def ts_weighted_decay(x: Expr, k: float = 0.5, min_samples: Optional[int] = None
         衰减系数
     min_samples
 
+    Notes
+    -----
+    Written as `x * k + ts_delay(x, 1) * (1 - k)` rather than a 2-wide weighted `rolling_sum`,
+    which also accepts columns with nulls
+    直接用平移相加代替宽度为2的加权滚动求和，同时支持含null的列
+
     """
-    minp = min_samples or polars_ta.MIN_SAMPLES
-    return x.rolling_sum(2, weights=[1 - k, k], min_samples=minp)
+    minp = min_samples or polars_ta.MIN_SAMPLES or 2
+    x1 = x.shift(1)
+    if minp >= 2:
+        return x * k + x1 * (1 - k)
+    # 只要有一个有效值就输出
+    return when(x.is_not_null() | x1.is_not_null()).then(sum_horizontal(x * k, x1 * (1 - k)))
 
 
 def ts_zscore(x: Expr, d: int = 5, min_samples: Optional[int] = None) -> Expr:
-    """时序滚动zscore"""
+    """时序滚动zscore
+
+    Notes
+    -----
+    When `polars_ta.USE_NUMBA` is set, mean and std are computed in one numba pass.
+    Windows with zero std give `null` instead of `NaN`
+    设置`polars_ta.USE_NUMBA`后均值与标准差在一次numba循环中完成，标准差为0时返回`null`
+
+    """
+    if polars_ta.USE_NUMBA:
+        minp = min_samples or polars_ta.MIN_SAMPLES or d
+        return x.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float, copy=False), _roll_zscore, d, minp, skip_nan=True), return_dtype=Float64)
     return (x - ts_mean(x, d, min_samples)) / ts_std_dev(x, d, 0, min_samples)
 
 
+def _cb_cum_prod_by(xx: Series) -> Series:
+    return batches_i1_o1(struct_to_numpy(xx, 2, dtype=float, out='2d'), _cum_prod_by)
+
+
+def _cb_cum_sum_by(xx: Series) -> Series:
+    return batches_i1_o1(struct_to_numpy(xx, 2, dtype=float, out='2d'), _cum_sum_by)
+
+
 def ts_cum_prod_by(r: Expr, v: Expr) -> Expr:
     """带设置的累乘
 
@@ -1142,7 +1308,7 @@ def ts_cum_prod_by(r: Expr, v: Expr) -> Expr:
 
 
     """
-    return struct(f0=r, f1=v).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2), _cum_prod_by), return_dtype=Float64)
+    return struct(f0=r, f1=v).map_batches(_cb_cum_prod_by, return_dtype=Float64)
 
 
 def ts_cum_sum_by(r: Expr, v: Expr) -> Expr:
@@ -1190,12 +1356,69 @@ def ts_cum_sum_by(r: Expr, v: Expr) -> Expr:
 
     ```
 
+    Notes
+    -----
+    The whole column is handed to the kernel at once. `map_batches` has no state argument,
+    and marking a cumulative function as elementwise would let the streaming engine feed it chunks out of order.
+    The two inputs are copied once into one `(len, 2)` array by `struct_to_numpy(..., out='2d')`,
+    so each step of the kernel reads `r` and `v` from the same row
+    整列一次送入kernel。`map_batches`没有状态参数，累计函数标记为逐元素后流式引擎可能乱序分块调用。
+    两列输入由`struct_to_numpy(..., out='2d')`复制一次，拼成`(len, 2)`的数组，kernel每步从同一行读取`r`与`v`
+
     """
-    return struct(f0=r, f1=v).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2), _cum_sum_by), return_dtype=Float64)
+    return struct(f0=r, f1=v).map_batches(_cb_cum_sum_by, return_dtype=Float64)
+
+
+def ts_regression_all(y: Expr, x: Expr, d: int, min_samples: Optional[int] = None) -> Expr:
+    """时序滚动一元回归，一次计算同时得到斜率、截距、残差与预测值
+
+    Parameters
+    ----------
+    y
+    x
+    d
+    min_samples
+
+    Returns
+    -------
+    Expr
+        struct, fields are `slope`, `intercept`, `resid`, `pred`
+
+    Notes
+    -----
+    Nulls follow polars-ols `null_policy='drop_window'`, and `NaN` is treated as `null`:
+    only rows where both `x` and `y` are valid are used, a window with fewer than `min_samples`
+    such rows keeps the previous `slope` and `intercept`, and `resid`/`pred` are `null` where `y` is `null`.
+    Windows where `x` is constant give `null` instead of the numerical noise of polars-ols.
+    When `min_samples == d` and the first window has nulls, polars-ols fits its first estimate on
+    more than `d` rows and carries it forward, so the two differ until the next complete window
+
+    空值处理与polars-ols的`null_policy='drop_window'`一致，`NaN`当成`null`处理:
+    只使用x与y都有效的行，有效行数不足`min_samples`时沿用上一次的斜率与截距，y为空的行残差与预测值为空。
+    窗口内x为常数时返回`null`，而polars-ols返回的是数值噪声。
+    `min_samples == d`且第一个窗口有空值时，polars-ols第一次估计用到了超过`d`行的数据并一直沿用，两者在下一个完整窗口之前不同
+
+    """
+    minp = min_samples or polars_ta.MIN_SAMPLES or d
+    names = ['slope', 'intercept', 'resid', 'pred']
+    dtype = Struct([Field(f"column_{i}", Float64) for i in range(4)])
+    return struct(f0=y, f1=x).map_batches(lambda xx: batches_i2_o2(struct_to_numpy(xx, 2, dtype=float), _roll_ols_1, d, minp, skip_nan=True),
+                                          return_dtype=dtype).struct.rename_fields(names)
 
 
 def ts_regression_resid(y: Expr, x: Expr, d: int, min_samples: Optional[int] = None) -> Expr:
-    """时序滚动回归取残差"""
+    """时序滚动回归取残差
+
+    Notes
+    -----
+    When `polars_ta.USE_NUMBA` is set, the gufunc `gu_roll_resid` is used and only the residual is allocated.
+    For wide data, `gu_roll_resid(Y, X, d, minp)` on 2D (asset, time) arrays handles all assets in one call
+    设置`polars_ta.USE_NUMBA`后使用gufunc`gu_roll_resid`，只生成残差一列。宽表数据可以直接对(资产, 时间)的二维数组调用
+
+    """
+    if polars_ta.USE_NUMBA:
+        minp = min_samples or polars_ta.MIN_SAMPLES or d
+        return struct(f0=y, f1=x).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), gu_roll_resid, d, minp, skip_nan=True), return_dtype=Float64)
     minp = min_samples or polars_ta.MIN_SAMPLES or d
     return pls.compute_rolling_least_squares(y, x, mode='residuals', add_intercept=True, rolling_kwargs=RollingKwargs(window_size=d, min_periods=minp))
 
@@ -1203,21 +1426,67 @@ def ts_regression_resid(y: Expr, x: Expr, d: int, min_samples: Optional[int] = N
 def ts_regression_pred(y: Expr, x: Expr, d: int, min_samples: Optional[int] = None) -> Expr:
     """时序滚动回归取y的预测值
     """
+    if polars_ta.USE_NUMBA:
+        return ts_regression_all(y, x, d, min_samples).struct.field('pred')
     minp = min_samples or polars_ta.MIN_SAMPLES or d
     return pls.compute_rolling_least_squares(y, x, mode='predictions', add_intercept=True, rolling_kwargs=RollingKwargs(window_size=d, min_periods=minp))
 
 
+def ts_regression_coefs(y: Expr, x: Expr, d: int, min_samples: Optional[int] = None) -> Expr:
+    """时序滚动回归取斜率与截距
+
+    Notes
+    -----
+    When `polars_ta.USE_NUMBA` is set, nulls are handled as in `ts_regression_all`
+    设置`polars_ta.USE_NUMBA`后空值处理与`ts_regression_all`相同
+
+    Returns
+    -------
+    Expr
+        struct, fields are `slope`, `intercept`
+
+    Examples
+    --------
+    polars evaluates the regression once per selected field, even for `.struct.unnest()`.
+    Keep the struct as a column and unnest the frame to run it once
+    polars每取一个字段就计算一次回归，`.struct.unnest()`也一样。先存成一列再对DataFrame展开才只计算一次
+
+    ```python
+    df = df.with_columns(
+        coefs=ts_regression_coefs(pl.col('y'), pl.col('x'), 20),
+    ).unnest('coefs')
+    ```
+
+    """
+    if polars_ta.USE_NUMBA:
+        minp = min_samples or polars_ta.MIN_SAMPLES or d
+        dtype = Struct([Field(f"column_{i}", Float64) for i in range(2)])
+        return struct(f0=y, f1=x).map_batches(lambda xx: batches_i2_o2(struct_to_numpy(xx, 2, dtype=float), _roll_ols_1_coefs, d, minp, skip_nan=True),
+                                              return_dtype=dtype).struct.rename_fields(['slope', 'intercept'])
+    minp = min_samples or polars_ta.MIN_SAMPLES or d
+    return pls.compute_rolling_least_squares(y, x, mode='coefficients', add_intercept=True, rolling_kwargs=RollingKwargs(window_size=d, min_periods=minp)).struct.rename_fields(['slope', 'intercept'])
+
+
 def ts_regression_intercept(y: Expr, x: Expr, d: int, min_samples: Optional[int] = None) -> Expr:
     """时序滚动回归取截距
     """
-    minp = min_samples or polars_ta.MIN_SAMPLES or d
-    return pls.compute_rolling_least_squares(y, x, mode='coefficients', add_intercept=True, rolling_kwargs=RollingKwargs(window_size=d, min_periods=minp)).struct[1]
+    return ts_regression_coefs(y, x, d, min_samples).struct.field('intercept')
 
 
 def ts_regression_slope(y: Expr, x: Expr, d: int, min_samples: Optional[int] = None) -> Expr:
     """时序滚动回归取斜率"""
-    minp = min_samples or polars_ta.MIN_SAMPLES or d
-    return pls.compute_rolling_least_squares(y, x, mode='coefficients', add_intercept=True, rolling_kwargs=RollingKwargs(window_size=d, min_periods=minp)).struct[0]
+    return ts_regression_coefs(y, x, d, min_samples).struct.field('slope')
+
+
+def _roll_lstsq(y: Expr, more_x: Sequence[Expr], d: int, minp: int, is_resid: bool) -> Expr:
+    """多元滚动回归，x拼成二维数组后送入kernel"""
+    k = len(more_x)
+
+    def func(xx: Series) -> Series:
+        yy, *xs = struct_to_numpy(xx, k + 1, dtype=float)
+        return batches_i2_o1([yy, np.column_stack(xs)], _roll_ols_k, d, minp, is_resid)
+
+    return struct(**{f'f{i}': e for i, e in enumerate((y,) + tuple(more_x))}).map_batches(func, return_dtype=Float64)
 
 
 def ts_resid(y: Expr, *more_x: Expr, d: int = 30, min_samples: Optional[int] = None) -> Expr:
@@ -1231,8 +1500,19 @@ def ts_resid(y: Expr, *more_x: Expr, d: int = 30, min_samples: Optional[int] = N
     d
     min_samples
 
+    Notes
+    -----
+    When `polars_ta.USE_NUMBA` is set, the Cholesky factor of X'X is updated and downdated as rows enter and leave the window.
+    Nulls follow polars-ols `null_policy='drop_window'` as in `ts_regression_all`.
+    When X'X is singular, dependent columns are dropped, which gives the same projection as the minimum norm solution,
+    while polars-ols gives `null` on some of these rows
+    设置`polars_ta.USE_NUMBA`后X'X的Cholesky因子随窗口增删行做秩1更新与降秩。空值处理与`ts_regression_all`相同。
+    X'X奇异时剔除线性相关的列，结果与最小范数解相同，而polars-ols在其中部分行返回`null`
+
     """
     minp = min_samples or polars_ta.MIN_SAMPLES or d
+    if polars_ta.USE_NUMBA:
+        return _roll_lstsq(y, more_x, d, minp, True)
     return pls.compute_rolling_least_squares(y, *more_x, mode='residuals', rolling_kwargs=RollingKwargs(window_size=d, min_periods=minp))
 
 
@@ -1247,13 +1527,33 @@ def ts_pred(y: Expr, *more_x: Expr, d: int = 30, min_samples: Optional[int] = No
     d
     min_samples
 
+    Notes
+    -----
+    When `polars_ta.USE_NUMBA` is set, the Cholesky factor of X'X is updated and downdated as rows enter and leave the window.
+    Nulls follow polars-ols `null_policy='drop_window'` as in `ts_regression_all`.
+    When X'X is singular, dependent columns are dropped, which gives the same projection as the minimum norm solution,
+    while polars-ols gives `null` on some of these rows
+    设置`polars_ta.USE_NUMBA`后X'X的Cholesky因子随窗口增删行做秩1更新与降秩。空值处理与`ts_regression_all`相同。
+    X'X奇异时剔除线性相关的列，结果与最小范数解相同，而polars-ols在其中部分行返回`null`
+
     """
     minp = min_samples or polars_ta.MIN_SAMPLES or d
+    if polars_ta.USE_NUMBA:
+        return _roll_lstsq(y, more_x, d, minp, False)
     return pls.compute_rolling_least_squares(y, *more_x, mode='predictions', rolling_kwargs=RollingKwargs(window_size=d, min_periods=minp))
 
 
 def ts_weighted_mean(x: Expr, w: Expr, d: int, min_samples: Optional[int] = None) -> Expr:
-    """时序滚动加权平均"""
+    """时序滚动加权平均
+
+    Notes
+    -----
+    When `polars_ta.USE_NUMBA` is set, the weighted sum and the sum of weights are rolled in one numba pass
+    设置`polars_ta.USE_NUMBA`后加权和与权重和在一次numba循环中完成
+    """
+    if polars_ta.USE_NUMBA:
+        minp = min_samples or polars_ta.MIN_SAMPLES or d
+        return struct(f0=x, f1=w).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, 2, dtype=float), _roll_weighted_mean, d, minp, skip_nan=True), return_dtype=Float64)
     minp = min_samples or polars_ta.MIN_SAMPLES
     return (x * w).rolling_sum(d, min_samples=minp) / w.rolling_sum(d, min_samples=minp)
 
@@ -1264,6 +1564,16 @@ def ts_weighted_sum(x: Expr, w: Expr, d: int, min_samples: Optional[int] = None)
     return (x * w).rolling_sum(d, min_samples=minp)
 
 
+def _cb_signals_to_size(xx: Series, accumulate: bool, action: bool) -> Series:
+    return batches_i1_o1(struct_to_numpy(xx, 4, dtype=float, out='2d'), _signals_to_size, accumulate, action)
+
+
+@lru_cache(maxsize=8)
+def _signals_to_size_cb(accumulate: bool, action: bool):
+    """按参数缓存回调，相同参数构建的表达式共用同一个回调对象"""
+    return partial(_cb_signals_to_size, accumulate=accumulate, action=action)
+
+
 def ts_signals_to_size(long_entry: Expr, long_exit: Expr,
                        short_entry: Expr, short_exit: Expr,
                        accumulate: bool = False,
@@ -1285,6 +1595,11 @@ def ts_signals_to_size(long_entry: Expr, long_exit: Expr,
     action
         返回持仓状态还是下单操作
 
+    Notes
+    -----
+    Signals are tested against 0, so `null` and `NaN` count as a signal. Use `fill_null(False)` beforehand if needed
+    信号按是否不为0判断，`null`与`NaN`都视为有信号。需要时提前`fill_null(False)`
+
     """
     return struct(f0=long_entry, f1=long_exit, f2=short_entry, f3=short_exit).map_batches(
-        lambda xx: batches_i2_o1(struct_to_numpy(xx, 4, dtype=float), _signals_to_size, accumulate, action), return_dtype=Float64)
+        _signals_to_size_cb(bool(accumulate), bool(action)), return_dtype=Float64)
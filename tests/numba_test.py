@@ -4,7 +4,10 @@ import numpy as np
 import polars as pl
 from numba import jit
 
-from polars_ta.utils.numba_ import nb_roll_sum, batches_i1_o1, roll_sum, roll_cov, roll_split_i2_o2
+from numpy.lib.stride_tricks import sliding_window_view
+from polars import Float64, Series
+
+from polars_ta.utils.numba_ import nb_roll_sum, batches_i1_o1, roll_sum, roll_cov
 from polars_ta.wq.time_series import ts_co_kurtosis
 
 
@@ -13,6 +16,26 @@ def nb_sum(x):
     return np.sum(x)
 
 
+@jit(nopython=True, nogil=True, cache=True)
+def nb_roll_sum_mask(x1, window):
+    """same as `nb_roll_sum`, with a validity mask for `batches_i1_o1_mask`
+    与nb_roll_sum相同，同时输出有效标记。和为nan时无效，与nan_to_null的结果一致"""
+    out = np.full(x1.shape, np.nan, dtype=np.float64)
+    if len(x1) < window:
+        return out, out == out
+    a1 = sliding_window_view(x1, window)
+    for i, v1 in enumerate(a1):
+        out[i + window - 1] = np.sum(v1)
+    return out, out == out
+
+
+def batches_i1_o1_mask(x1: np.ndarray, func, *args) -> Series:
+    """`func` returns values and a validity mask, nulls come from the mask instead of scanning the output for nan
+    kernel同时返回值与有效标记，直接用标记构建空值，不再扫描一遍输出找nan。`_from_buffers`是polars的私有接口，只用于测速"""
+    values, valid = func(x1, *args)
+    return Series._from_buffers(Float64, Series(values), Series(valid))
+
+
 df = pl.DataFrame({'A': range(100000), 'B': range(100000)})
 a = df.with_columns([
     pl.col('A').rolling_sum(10).alias('a1'),
@@ -23,7 +46,6 @@ a = df.with_columns([
     pl.rolling_cov(pl.col('A'), pl.col('B'), window_size=10).alias('a6'),
     roll_cov(pl.col('A'), pl.col('B'), 10).alias('a7'),
     ts_co_kurtosis(pl.col('A'), pl.col('B'), 10).alias('a8'),
-    roll_split_i2_o2(pl.col('A'), pl.col('B'), 10, 2).alias('a10'),
 ])
 print(a)
 
@@ -54,7 +76,7 @@ print(t2 - t1)
 t1 = time.perf_counter()
 for i in range(10):
     a = df.with_columns([
-        pl.col('A').map_batches(lambda x: pl.Series(nb_roll_sum(x.to_numpy(), 10), nan_to_null=True)).alias('a4'),
+        pl.col('A').map_batches(lambda x: batches_i1_o1_mask(x.to_numpy(), nb_roll_sum_mask, 10)).alias('a4'),
     ])
 t2 = time.perf_counter()
 print(t2 - t1)
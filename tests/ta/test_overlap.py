@@ -72,6 +72,27 @@ class TestDemoClass:
 
         assert np.allclose(result1, result3, equal_nan=True)
 
+    def test_DEMA_TEMA_chained(self):
+        from polars_ta.ta.overlap import DEMA, TEMA
+
+        # 与旧版嵌套的`ewm_mean(adjust=False)`对比，含前导null与中间null
+        n = 200
+        df = pl.DataFrame({'c': np.cumsum(np.random.randn(n)) + 100})
+        df = df.with_columns(pl.when((pl.int_range(n) % 17 != 3) & (pl.int_range(n) >= 4)).then(pl.col('c')).alias('c'))
+
+        def ema(x, d):
+            return x.ewm_mean(span=d, adjust=False, min_samples=d)
+
+        for d in (1, 3, 10):
+            e1 = ema(pl.col('c'), d)
+            e2 = ema(e1, d)
+            e3 = ema(e2, d)
+            result1 = df.select((e1 * 2 - e2).alias('dema'), ((e1 - e2) * 3 + e3).alias('tema'))
+            result2 = df.select(DEMA(pl.col('c'), d).alias('dema'), TEMA(pl.col('c'), d).alias('tema'))
+            for c in ('dema', 'tema'):
+                assert result1[c].null_count() == result2[c].null_count()
+                assert np.allclose(result1[c].to_numpy(), result2[c].to_numpy(), equal_nan=True)
+
     def test_TRIMA(self):
         from polars_ta.ta.overlap import TRIMA
 
@@ -84,20 +105,17 @@ class TestDemoClass:
 
         assert np.allclose(result1, result3, equal_nan=True)
 
-    # def test_KAMA(self):
-    #     # !!! 此处非常重要，有部分函数受此影响
-    #     talib.set_compatibility(1)
-    #
-    #     from polars_ta.talib.overlap import KAMA
-    #
-    #     result1 = talib.KAMA(self.close_np, timeperiod=5)
-    #     result2 = self.df_pl.select(KAMA(pl.col("close"), timeperiod=5))
-    #     result3 = result2['close'].to_numpy()
-    #     # print()
-    #     # print(result1)
-    #     # print(result3)
-    #
-    #     assert np.allclose(result1, result3, equal_nan=True)
+    def test_KAMA(self):
+        from polars_ta.ta.overlap import KAMA
+
+        result1 = talib.KAMA(self.high_np, timeperiod=5)
+        result2 = self.df_pl.select(KAMA(pl.col("high"), timeperiod=5))
+        result3 = result2['high'].to_numpy()
+        # print()
+        # print(result1)
+        # print(result3)
+
+        assert np.allclose(result1, result3, equal_nan=True)
 
     def test_BBANDS(self):
         from polars_ta.ta.overlap import BBANDS
@@ -108,6 +126,19 @@ class TestDemoClass:
 
         assert np.allclose(result1, result3, equal_nan=True)
 
+    def test_BBANDS_flat(self):
+        from polars_ta.ta.overlap import BBANDS
+
+        # 大数值之后接一段常数，窗口内的增删不能留下残余的标准差
+        close = np.concatenate([np.random.rand(50) * 100 + 1000, np.full(30, 47.0), np.random.rand(20)])
+        df = pl.DataFrame({'close': close})
+        result2 = df.select(BBANDS(pl.col("close"), timeperiod=10)).unnest('close')
+
+        for i, result1 in enumerate(talib.BBANDS(close, timeperiod=10)):
+            assert np.allclose(result1, result2.to_series(i).to_numpy(), equal_nan=True)
+        assert (result2.to_series(0).to_numpy()[59:80] == 47.0).all()
+        assert (result2.to_series(2).to_numpy()[59:80] == 47.0).all()
+
     def test_MIDPOINT(self):
         from polars_ta.ta.overlap import MIDPOINT
 
@@ -125,3 +156,46 @@ class TestDemoClass:
         result3 = result2['high'].to_numpy()
 
         assert np.allclose(result1, result3, equal_nan=True)
+
+    def _nulls_df(self):
+        n = 120
+        df = pl.DataFrame({'h': np.random.randn(n) + 6, 'l': np.random.randn(n) + 4, 'i': np.random.randint(0, 9, n)})
+        return df.with_columns(
+            hn=pl.when(pl.int_range(n) % 11 != 4).then(pl.col('h')),
+            ln=pl.when(pl.int_range(n) % 7 != 2).then(pl.col('l')),
+        )
+
+    def _assert_same(self, result1, result2):
+        for c in result1.columns:
+            assert (result1[c].is_null() == result2[c].is_null()).all()
+            assert np.allclose(result1[c].to_numpy(), result2[c].to_numpy(), equal_nan=True)
+
+    def test_numba_rolling(self, monkeypatch):
+        import polars_ta
+        from polars_ta.ta.overlap import SMA, MIDPOINT, MIDPRICE
+
+        def exprs(d):
+            ee = [SMA(pl.col(c), d).alias(f'sma_{c}') for c in ('h', 'hn', 'i')]
+            ee += [SMA(pl.col(c), d, 3).alias(f'sma3_{c}') for c in ('h', 'hn', 'i')]
+            ee += [MIDPOINT(pl.col(c), d).alias(f'mid_{c}') for c in ('h', 'hn', 'i')]
+            ee += [MIDPRICE(pl.col(h), pl.col(l), d).alias(f'price_{h}') for h, l in (('h', 'l'), ('hn', 'ln'))]
+            return ee
+
+        df = self._nulls_df()
+        for min_samples in (None, 2):
+            monkeypatch.setattr(polars_ta, 'MIN_SAMPLES', min_samples)
+            for d in (3, 10):
+                result1 = df.select(exprs(d))
+                with monkeypatch.context() as m:
+                    m.setattr(polars_ta, 'USE_NUMBA', True)
+                    result2 = df.select(exprs(d))
+                self._assert_same(result1, result2)
+
+    def test_numba_ewm(self):
+        from polars_ta.ta.overlap import EMA, RMA
+
+        df = self._nulls_df()
+        for d in (1, 5, 20):
+            result1 = df.select([f(pl.col(c), d).alias(f'{f.__name__}_{c}') for f in (EMA, RMA) for c in ('h', 'hn', 'i')])
+            result2 = df.select([f(pl.col(c), d, use_numba=True).alias(f'{f.__name__}_{c}') for f in (EMA, RMA) for c in ('h', 'hn', 'i')])
+            self._assert_same(result1, result2)
@@ -0,0 +1,34 @@
+import numpy as np
+import polars as pl
+import pytest
+
+
+class TestDemoClass:
+    df_pl = None
+
+    def setup_class(self):
+        rng = np.random.default_rng(1)
+        close = np.round(10 * np.exp(np.cumsum(rng.standard_normal(500) * 0.02)), 2)
+        high = np.round(close * (1 + rng.random(500) * 0.02), 2)
+        low = np.round(close * (1 - rng.random(500) * 0.02), 2)
+        avg = np.round((high + low + close) / 3, 2)
+        turnover = rng.random(500) * 0.1
+
+        self.df_pl = pl.DataFrame({'high': high, 'low': low, 'avg': avg, 'turnover': turnover, 'close': close})
+
+    def _winner_cost(self, precision):
+        from polars_ta.tdx.pattern import ts_WINNER_COST
+
+        return self.df_pl.select(a=ts_WINNER_COST(pl.col('high'), pl.col('low'), pl.col('avg'), pl.col('turnover'), pl.col('close'), 0.5,
+                                                  step=0.01, precision=precision)).unnest('a')
+
+    def test_WINNER_COST_precision(self):
+        result1 = self._winner_cost('f64')
+        # 文档中的误差：f32约1e-6，fx32在1e-5以内
+        for precision, atol in (('f32', 1e-6), ('fx32', 1e-5)):
+            result2 = self._winner_cost(precision)
+            for c in result1.columns:
+                assert np.allclose(result1[c].to_numpy(), result2[c].to_numpy(), rtol=0, atol=atol, equal_nan=True)
+
+        with pytest.raises(ValueError):
+            self._winner_cost('f16')
@@ -0,0 +1,68 @@
+import numpy as np
+import polars as pl
+
+
+class TestDemoClass:
+    df_pl = None
+
+    def setup_class(self):
+        rng = np.random.default_rng(0)
+        close = 100 + np.cumsum(rng.standard_normal(300))
+        close[100:120] = close[99]  # 平盘
+        high = close + rng.random(300)
+        low = close - rng.random(300)
+        high[100:120] = low[100:120] = close[100:120]
+        self.df_pl = pl.DataFrame({'high': high, 'low': low, 'close': close})
+        self.df_pl = self.df_pl.with_columns(
+            pl.when(pl.int_range(300) % 37 != i).then(pl.col(c)).alias(c) for i, c in enumerate(['high', 'low', 'close']))
+        # 开头的空值
+        self.df_pl = self.df_pl.with_columns(pl.when(pl.int_range(300) >= 5).then(pl.all()).name.keep())
+
+    def _np(self, c):
+        return self.df_pl[c].fill_null(np.nan).to_numpy()
+
+    def test_ts_fractal_dimension(self):
+        from polars_ta.noise import ts_fractal_dimension
+
+        high, low, close = self._np('high'), self._np('low'), self._np('close')
+        for n in (5, 14):
+            # 书中公式逐窗口计算：L为n项sqrt((1/n)^2 + (diff(close)/(HH-LL))^2)之和，每项的HH/LL为该项所在位置的窗口
+            term = np.full(300, np.nan)
+            for j in range(n - 1, 300):
+                hh = high[j + 1 - n:j + 1].max()
+                ll = low[j + 1 - n:j + 1].min()
+                if j > 0 and hh != ll:
+                    term[j] = np.sqrt((1 / n) ** 2 + ((close[j] - close[j - 1]) / (hh - ll)) ** 2)
+            result1 = np.full(300, np.nan)
+            for i in range(n - 1, 300):
+                L = term[i + 1 - n:i + 1].sum()
+                result1[i] = 1 + (np.log(L) + np.log(2)) / np.log(2 * n)
+            result2 = self.df_pl.select(ts_fractal_dimension(pl.col('high'), pl.col('low'), pl.col('close'), n)).to_series()
+            assert np.allclose(result1, result2.fill_null(np.nan).to_numpy(), equal_nan=True)
+            assert result2.is_nan().sum() == 0
+
+    def test_ts_efficiency_ratio(self):
+        from polars_ta.noise import ts_efficiency_ratio
+
+        close = pl.col('close')
+        for n in (5, 14):
+            # 原表达式，路程为0时为NaN，现在为null
+            result1 = self.df_pl.select(close.diff(n).abs() / close.diff(1).abs().rolling_sum(n)).to_series().fill_nan(None)
+            result2 = self.df_pl.select(ts_efficiency_ratio(close, n)).to_series()
+            assert (result1.is_null() == result2.is_null()).all()
+            assert np.allclose(result1.drop_nulls().to_numpy(), result2.drop_nulls().to_numpy())
+            # 平盘的窗口
+            assert result2[100 + n:120].is_null().all()
+
+    def test_ts_price_density(self):
+        from polars_ta.noise import ts_price_density
+
+        high, low = pl.col('high'), pl.col('low')
+        for n in (5, 14):
+            # 原表达式，最高最低价相同时为NaN或inf，现在为null
+            result1 = self.df_pl.select((high - low).rolling_sum(n) / (high.rolling_max(n) - low.rolling_min(n))).to_series()
+            result1 = result1.fill_nan(None).replace([np.inf, -np.inf], None)
+            result2 = self.df_pl.select(ts_price_density(high, low, n)).to_series()
+            assert (result1.is_null() == result2.is_null()).all()
+            assert np.allclose(result1.drop_nulls().to_numpy(), result2.drop_nulls().to_numpy())
+            assert result2[100 + n:120].is_null().all()
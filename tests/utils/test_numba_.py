@@ -0,0 +1,50 @@
+import numpy as np
+import polars as pl
+from polars.testing import assert_series_equal
+
+
+class TestDemoClass:
+    xx = None
+
+    def setup_class(self):
+        rng = np.random.default_rng(0)
+        self.xx = [rng.standard_normal(100) for _ in range(5)]
+        for x in self.xx:
+            x[:7] = np.nan
+            x[rng.random(100) < 0.1] = np.nan
+
+    def test_make_batches_dispatcher(self):
+        from polars_ta.utils.numba_ import batches_i2_o1, batches_i2_o2, make_batches_dispatcher
+
+        def f1(*xs):
+            return np.nansum(xs, axis=0) + np.where(np.isnan(xs[0]), np.nan, 0)
+
+        def f2(*xs):
+            return f1(*xs), np.max(xs, axis=0)
+
+        for n_in in (2, 3, 4, 5):
+            xx = self.xx[:n_in]
+            assert make_batches_dispatcher(n_in, 1) is make_batches_dispatcher(n_in, 1)
+            for skip_nan in (False, True):
+                result1 = batches_i2_o1(xx, f1, skip_nan=skip_nan)
+                result2 = make_batches_dispatcher(n_in, 1)(xx, f1, skip_nan=skip_nan)
+                assert_series_equal(result1, result2)
+                result1 = batches_i2_o2(xx, f2, skip_nan=skip_nan)
+                result2 = make_batches_dispatcher(n_in, 2)(xx, f2, skip_nan=skip_nan)
+                assert_series_equal(result1, result2)
+
+        # 全为nan时不跳过
+        xx = [np.full(10, np.nan), np.full(10, np.nan)]
+        assert_series_equal(batches_i2_o1(xx, f1, skip_nan=True), make_batches_dispatcher(2, 1)(xx, f1, skip_nan=True))
+
+    def test_struct_to_numpy(self):
+        from polars_ta.utils.numba_ import struct_to_numpy
+
+        df = pl.DataFrame({'f': self.xx[0], 'i': np.arange(100), 'b': self.xx[1] > 0})
+        df = df.with_columns(pl.col('f').fill_nan(None), pl.when(pl.int_range(100) % 9 != 0).then(pl.col('b')).alias('b'))
+        xx = df.select(pl.struct(pl.all())).to_series()
+        arr = struct_to_numpy(xx, 3, dtype=float, out='2d')
+        assert arr.flags.c_contiguous and arr.shape == (100, 3)
+        for i, x in enumerate(struct_to_numpy(xx, 3, dtype=float)):
+            assert np.array_equal(arr[:, i], x, equal_nan=True)
+            assert np.array_equal(x, df.to_series(i).cast(pl.Float64).fill_null(np.nan).to_numpy(), equal_nan=True)
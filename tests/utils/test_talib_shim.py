@@ -0,0 +1,48 @@
+import numpy as np
+import polars as pl
+import talib
+
+
+class TestDemoClass:
+    df_pl = None
+
+    def setup_class(self):
+        rng = np.random.default_rng(0)
+        close = 100 + np.cumsum(rng.standard_normal(200))
+        self.df_pl = pl.DataFrame({
+            'open': close + rng.standard_normal(200) * 0.3,
+            'high': close + rng.random(200),
+            'low': close - rng.random(200),
+            'close': close,
+            'close_i': np.round(close).astype(np.int64),
+            'volume': rng.integers(100, 1000, 200),
+        })
+        self.df_pl = self.df_pl.with_columns(close_n=pl.when(pl.int_range(200) != 50).then(pl.col('close')))
+
+    def _np(self, c):
+        return self.df_pl[c].cast(pl.Float64).fill_null(np.nan).to_numpy()
+
+    def _check(self, result, expected):
+        if isinstance(expected, tuple):
+            for c, e in zip(result.struct.unnest().get_columns(), expected):
+                self._check(c, e)
+        else:
+            assert np.allclose(result.fill_null(np.nan).to_numpy(), expected, equal_nan=True)
+
+    def test_make_talib_cb(self):
+        from polars_ta import talib as T
+
+        for c in ('close', 'close_i', 'close_n'):
+            # 单输入单输出
+            self._check(self.df_pl.select(T.SMA(pl.col(c), 10)).to_series(), talib.SMA(self._np(c), timeperiod=10))
+            # 单输入多输出
+            self._check(self.df_pl.select(T.BBANDS(pl.col(c), 20, 1.5, 2)).to_series(), talib.BBANDS(self._np(c), timeperiod=20, nbdevup=1.5, nbdevdn=2))
+            # 多输入
+            self._check(self.df_pl.select(T.ATR(pl.col('high'), pl.col('low'), pl.col(c), 14)).to_series(),
+                        talib.ATR(self._np('high'), self._np('low'), self._np(c), timeperiod=14))
+            self._check(self.df_pl.select(T.STOCH(pl.col('high'), pl.col('low'), pl.col(c))).to_series(),
+                        talib.STOCH(self._np('high'), self._np('low'), self._np(c)))
+        self._check(self.df_pl.select(T.OBV(pl.col('close'), pl.col('volume'))).to_series(), talib.OBV(self._np('close'), self._np('volume')))
+
+        # 相同函数的表达式共用模块级回调
+        assert T._cb_SMA.__name__ == '_cb_SMA'
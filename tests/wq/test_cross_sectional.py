@@ -0,0 +1,81 @@
+import numpy as np
+import polars as pl
+from polars import max_horizontal
+from polars.testing import assert_series_equal
+
+
+def _rank_pct_ref(x: pl.Expr, scale=1) -> pl.Expr:
+    # 原polars写法
+    r = x.rank(method='dense') - 1
+    return (r * scale / max_horizontal(r.max(), 1)).alias('out')
+
+
+class TestDemoClass:
+    df_pl = None
+
+    def setup_class(self):
+        self.df_pl = pl.DataFrame({
+            'f': [1.0, np.nan, 3, None, 5, 2, 4, 6, 7, 8],
+            'i': [None, 1, 1, 1, 2, 2, 3, 10, 4, 4],
+            'b': [True, None, False, True, False, None, True, True, False, True],
+            's': ['a', None, 'c', 'b', 'b', 'z', None, 'a', 'd', 'e'],
+            'c': [True, True, False, True, True, True, None, True, True, False],
+        })
+
+    def test_cs_rank(self):
+        from polars_ta.wq.cross_sectional import cs_rank
+
+        for c in 'fibs':
+            x = pl.col(c)
+            x = {'f': x.fill_nan(None), 'b': x.cast(pl.Float64)}.get(c, x)
+            result1 = self.df_pl.select(_rank_pct_ref(x))['out']
+            result2 = self.df_pl.select(cs_rank(pl.col(c)).alias('out'))['out']
+            assert_series_equal(result1, result2, check_dtypes=False)
+
+    def test_cs_rank_if(self):
+        from polars_ta.wq.cross_sectional import cs_rank_if
+
+        for c in 'fibs':
+            x = pl.col(c)
+            x = {'f': x.fill_nan(None), 'b': x.cast(pl.Float64)}.get(c, x)
+            result1 = self.df_pl.select(_rank_pct_ref(pl.when(pl.col('c')).then(x)))['out']
+            result2 = self.df_pl.select(cs_rank_if(pl.col('c'), pl.col(c)).alias('out'))['out']
+            assert_series_equal(result1, result2, check_dtypes=False)
+
+    def test_cs_qcut(self):
+        from polars_ta.wq.cross_sectional import cs_qcut, _cs_qcut_rank
+
+        for c in 'fi':
+            x = pl.col(c).fill_nan(None) if c == 'f' else pl.col(c)
+            labels = [f'{i}' for i in range(4)]
+            result1 = self.df_pl.select(x.qcut(4, allow_duplicates=True, labels=labels).cast(pl.Utf8).cast(pl.UInt16))[c]
+            result2 = self.df_pl.select(cs_qcut(pl.col(c), 4))[c]
+            assert_series_equal(result1, result2)
+
+            result1 = self.df_pl.select(_rank_pct_ref(x, 4).cast(pl.UInt16))['out']
+            result2 = self.df_pl.select(_cs_qcut_rank(pl.col(c), 4).alias('out'))['out']
+            assert_series_equal(result1, result2)
+
+        # NaN与null一样不参与分箱
+        assert self.df_pl.select(cs_qcut(pl.col('f'), 4))['f'].to_list() == [0, None, 1, None, 2, 0, 1, 2, 3, 3]
+
+    def test_cs_scale(self):
+        from polars_ta.wq.cross_sectional import cs_scale
+
+        df = pl.DataFrame({
+            'a': [None, -15, -7, 0, 20],
+            'p': [None, 1, 0, 3, None],  # 没有负数
+            'z': [None, 0, 0, None, 0],  # 全为0
+        })
+        for c in 'ap':
+            # 原polars写法
+            L = pl.col(c).clip(lower_bound=0)
+            S = pl.col(c).clip(upper_bound=0)
+            L = pl.when(L.sum() == 0).then(0).otherwise(L / L.sum())
+            S = pl.when(S.sum() == 0).then(0).otherwise(S / S.sum())
+            result1 = df.select((L * 2 - S * 3).alias('out'))['out']
+            result2 = df.select(cs_scale(pl.col(c), 1, 2, 3).alias('out'))['out']
+            assert_series_equal(result1, result2, check_dtypes=False)
+
+        # 全为0时null不再变成0
+        assert df.select(cs_scale(pl.col('z'), 1, 2, 3))['z'].to_list() == [None, 0, 0, None, 0]
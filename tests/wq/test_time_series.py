@@ -31,6 +31,26 @@ class TestDemoClass:
         # 底层一样，结果就应当一样
         assert_frame_equal(result1, result2.to_pandas())
 
+    def test_ts_rank_numba(self, monkeypatch):
+        import polars_ta
+        from polars_ta.wq.time_series import ts_rank
+
+        rng = np.random.default_rng(0)
+        f = np.round(rng.standard_normal(200), 1)
+        f[rng.random(200) < 0.05] = np.nan
+        f[50:70] = 1.0
+        df = pl.DataFrame({'f': f, 'i': rng.integers(0, 5, 200), 'b': rng.random(200) < 0.5})
+        df = df.with_columns(pl.when(pl.int_range(200) % 9 != 0).then(pl.col(c)).alias(c) for c in 'ib')
+        for c in 'fib':
+            for d, minp in ((5, 5), (10, 3)):
+                # numba版NaN当成null
+                x = pl.col(c).fill_nan(None) if c == 'f' else pl.col(c)
+                result1 = df.select(ts_rank(x, d, minp))
+                with monkeypatch.context() as m:
+                    m.setattr(polars_ta, 'USE_NUMBA', True)
+                    result2 = df.select(ts_rank(pl.col(c), d, minp))
+                assert_frame_equal(result1.to_pandas(), result2.to_pandas())
+
     def test_ts_skewness(self):
         from polars_ta.wq.time_series import ts_skewness
 
@@ -52,6 +72,68 @@ class TestDemoClass:
         # 底层一样，结果就应当一样
         assert_frame_equal(result1, result2.to_pandas())
 
+    def test_ts_co_moment(self):
+        import warnings
+        from polars_ta.wq.time_series import ts_co_kurtosis, ts_co_skewness, ts_triple_corr
+
+        def roll_ref(func, arrs, d, minp):
+            # 原逐窗口nanmean/nanstd写法
+            out = np.full(arrs[0].shape[0], np.nan)
+            with np.errstate(all='ignore'), warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                for i in range(out.shape[0]):
+                    w = [a[max(0, i + 1 - d):i + 1] for a in arrs]
+                    if all((~np.isnan(v)).sum() >= minp for v in w):
+                        out[i] = func(*w)
+            out[~np.isfinite(out)] = np.nan
+            return out
+
+        def co_moment(a, b, p):
+            return np.nanmean((a - np.nanmean(a)) * (b - np.nanmean(b)) ** p) / (np.nanstd(a) * np.nanstd(b) ** p)
+
+        def triple_corr(a, b, c):
+            return np.nanmean((a - np.nanmean(a)) * (b - np.nanmean(b)) * (c - np.nanmean(c))) / (np.nanstd(a) * np.nanstd(b) * np.nanstd(c))
+
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal(300) + 100
+        y = rng.standard_normal(300) * 3
+        z = rng.integers(0, 10, 300)
+        x[rng.random(300) < 0.05] = np.nan
+        y[rng.random(300) < 0.05] = np.nan
+        # 常数窗口输出null
+        x[100:130] = 100.5
+        y[200:230] = -1.0
+        # x中为NaN，y中为null，z为整数
+        df = pl.DataFrame({'x': x, 'y': y, 'z': z}).with_columns(pl.col('y').fill_nan(None))
+        z = z.astype(float)
+        for d, minp in ((10, 10), (20, 5)):
+            for result2, result1 in (
+                    (ts_co_kurtosis(pl.col('x'), pl.col('y'), d, min_samples=minp), roll_ref(lambda a, b: co_moment(a, b, 3), [x, y], d, minp)),
+                    (ts_co_skewness(pl.col('x'), pl.col('y'), d, min_samples=minp), roll_ref(lambda a, b: co_moment(a, b, 2), [x, y], d, minp)),
+                    (ts_triple_corr(pl.col('x'), pl.col('y'), pl.col('z'), d, min_samples=minp), roll_ref(triple_corr, [x, y, z], d, minp)),
+            ):
+                result2 = df.select(result2).to_series().fill_null(np.nan).to_numpy()
+                assert np.allclose(result1, result2, rtol=1e-9, atol=1e-12, equal_nan=True)
+                assert np.isnan(result2[99 + d:130]).all()
+
+    def test_ts_moment_parallel(self, monkeypatch):
+        import polars_ta
+        from polars_ta.wq.time_series import ts_moment
+
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal(300) + 100
+        x[rng.random(300) < 0.05] = np.nan
+        x[:5] = np.nan
+        x[100:130] = 100.5
+        df = pl.DataFrame({'x': x, 'i': rng.integers(0, 10, 300)})
+        for c in 'xi':
+            for d, minp, k in ((10, 10, 3), (20, 5, 4)):
+                result1 = df.select(ts_moment(pl.col(c), d, k, min_samples=minp))
+                with monkeypatch.context() as m:
+                    m.setattr(polars_ta, 'NUMBA_PARALLEL', True)
+                    result2 = df.select(ts_moment(pl.col(c), d, k, min_samples=minp))
+                assert_frame_equal(result1.to_pandas(), result2.to_pandas(), rtol=1e-12)
+
     def test_ts_corr(self):
         from polars_ta.wq.time_series import ts_corr
 
@@ -82,6 +164,298 @@ class TestDemoClass:
         # result1 = df.select(ts_decay_linear(pl.col('B'), 3))
         # print(result1)
 
+    def test_ts_zscore_numba(self, monkeypatch):
+        import polars_ta
+        from polars_ta.wq.time_series import ts_zscore, ts_ir
+
+        x = np.concatenate([np.random.rand(50) * 100 + 1000, np.full(30, 47.0), np.random.rand(20)])
+        x[[3, 60, 90]] = np.nan
+        df = pl.DataFrame({'x': x}).with_columns(pl.col('x').fill_nan(None))
+        with monkeypatch.context() as m:
+            m.setattr(polars_ta, 'USE_NUMBA', True)
+            result2 = df.select(a=ts_zscore(pl.col('x'), 10), b=ts_ir(pl.col('x'), 10))
+        mean = pl.col('x').rolling_mean(10)
+        std = pl.col('x').rolling_std(10, ddof=0)
+        result1 = df.select(a=(pl.col('x') - mean) / std, b=mean / std)
+        result1 = result1.with_columns(pl.all().fill_nan(None).replace([np.inf, -np.inf], None))
+
+        # 常数窗口的标准差为0，numba版输出null
+        assert result2['a'][59:80].is_null().all()
+        assert result2['b'][59:80].is_null().all()
+        for c in 'ab':
+            m = result1[c].is_not_null() & result1[c].abs().lt(1e6)
+            assert np.allclose(result1[c].filter(m).to_numpy(), result2[c].filter(m).to_numpy())
+            assert (result2[c].is_null() == (result1[c].is_null() | ~m)).all()
+
+    def _numba_data(self):
+        rng = np.random.default_rng(7)
+        n = 120
+        df = pl.DataFrame({
+            'f': rng.standard_normal(n) + 5,
+            'i': rng.integers(-3, 4, n),
+            'b': rng.random(n) > 0.5,
+            'w': rng.random(n) + 0.1,
+        })
+        # 各列在不同位置插入null，fnan插入NaN
+        return df.with_columns(
+            fn=pl.when(pl.int_range(n) % 11 != 4).then(pl.col('f')),
+            inn=pl.when(pl.int_range(n) % 13 != 2).then(pl.col('i')),
+            bn=pl.when(pl.int_range(n) % 7 != 1).then(pl.col('b')),
+            fnan=pl.when(pl.int_range(n) % 9 != 5).then(pl.col('f')).otherwise(float('nan')),
+        )
+
+    def _assert_numba_equal(self, monkeypatch, df, func, cols):
+        import polars_ta
+
+        for c in cols:
+            for d, minp in ((5, None), (10, 3)):
+                # 多列输入的numba版经过struct，列名为f0，这里统一命名
+                result1 = df.select(func(pl.col(c), d, minp).alias(c))
+                with monkeypatch.context() as m:
+                    m.setattr(polars_ta, 'USE_NUMBA', True)
+                    result2 = df.select(func(pl.col(c), d, minp).alias(c))
+                assert_frame_equal(result1.to_pandas(), result2.to_pandas())
+
+    def test_ts_l2_norm_numba(self, monkeypatch):
+        from polars_ta.wq.time_series import ts_l2_norm
+
+        self._assert_numba_equal(monkeypatch, self._numba_data(), ts_l2_norm, ['f', 'i', 'fn', 'inn'])
+
+    def test_ts_count_eq_ge_numba(self, monkeypatch):
+        from polars_ta.wq.time_series import ts_count_eq, ts_count_ge
+
+        df = self._numba_data()
+        self._assert_numba_equal(monkeypatch, df, lambda x, d, minp: ts_count_eq(x, d, 3, minp), ['b', 'i', 'bn', 'inn'])
+        self._assert_numba_equal(monkeypatch, df, lambda x, d, minp: ts_count_ge(x, d, 3, minp), ['b', 'i', 'bn', 'inn'])
+
+    def test_ts_count_numba(self, monkeypatch):
+        from polars_ta.wq.time_series import ts_count, ts_count_nans, ts_count_nulls
+
+        df = self._numba_data()
+        self._assert_numba_equal(monkeypatch, df, ts_count, ['f', 'i', 'b', 'fn', 'inn', 'bn'])
+        # 布尔列不支持is_nan，只比较数值列
+        self._assert_numba_equal(monkeypatch, df, ts_count_nans, ['f', 'i', 'fn', 'inn', 'fnan'])
+        self._assert_numba_equal(monkeypatch, df, ts_count_nulls, ['f', 'i', 'b', 'fn', 'inn', 'bn', 'fnan'])
+
+    def test_ts_count_short_circuit(self, monkeypatch):
+        import polars_ta
+        from polars_ta.wq.time_series import _roll_count_batch, ts_count_nans, ts_count_nulls
+
+        # 无空值时跳过逐个计数，结果应与全False的掩码相同
+        for n, d, minp in ((20, 5, 5), (20, 5, 2), (20, 5, 8), (3, 5, 5), (0, 5, 5)):
+            result1 = _roll_count_batch(pl.Series([False] * n), n, d, minp)
+            result2 = _roll_count_batch(None, n, d, minp)
+            assert result1.dtype == result2.dtype
+            assert result1.to_list() == result2.to_list()
+
+        # 布尔列不可能有nan，polars版is_nan会报错，numba版直接全为0
+        df = self._numba_data()
+        with monkeypatch.context() as m:
+            m.setattr(polars_ta, 'USE_NUMBA', True)
+            result = df.select(a=ts_count_nans(pl.col('b'), 5), b=ts_count_nans(pl.col('bn'), 5), c=ts_count_nulls(pl.col('f'), 5))
+        for c in 'abc':
+            assert result[c][:4].is_null().all()
+            assert (result[c][4:] == 0).all()
+
+    def test_ts_realized_volatility_numba(self, monkeypatch):
+        from polars_ta.wq.time_series import ts_realized_volatility
+
+        # 对数收益率要求正数
+        df = self._numba_data().with_columns(
+            wn=pl.when(pl.int_range(pl.len()) % 11 != 4).then(pl.col('w')),
+            ip=pl.col('i') + 5,
+            ipn=pl.col('inn') + 5,
+        )
+        self._assert_numba_equal(monkeypatch, df, ts_realized_volatility, ['w', 'wn', 'ip', 'ipn'])
+
+    def test_ts_weighted_mean_numba(self, monkeypatch):
+        from polars_ta.wq.time_series import ts_weighted_mean
+
+        df = self._numba_data().with_columns(wn=pl.when(pl.int_range(pl.len()) % 8 != 6).then(pl.col('w')))
+        for w in ('w', 'wn', 'i'):
+            self._assert_numba_equal(monkeypatch, df, lambda x, d, minp: ts_weighted_mean(x, pl.col(w), d, minp), ['f', 'i', 'fn', 'inn'])
+
+    def test_ts_weighted_decay(self):
+        from polars_ta.wq.time_series import ts_weighted_decay
+
+        df = pl.DataFrame({'x': [1.0, 2, 3, 4, 5, 6], 'n': [1.0, None, 3, 4, None, None]})
+        for minp in (None, 1, 2):
+            # 原polars写法，不支持含null的列
+            result1 = df.select(pl.col('x').rolling_sum(2, weights=[0.7, 0.3], min_samples=minp))['x']
+            result2 = df.select(ts_weighted_decay(pl.col('x'), 0.3, minp))['x']
+            assert np.allclose(result1.fill_null(np.nan).to_numpy(), result2.fill_null(np.nan).to_numpy(), equal_nan=True)
+
+        # 含null时min_samples=1只要有一个有效值就输出
+        result = df.select(a=ts_weighted_decay(pl.col('n'), 0.3), b=ts_weighted_decay(pl.col('n'), 0.3, 1))
+        assert np.allclose(result['a'].fill_null(np.nan).to_numpy(), [np.nan, np.nan, np.nan, 3.3, np.nan, np.nan], equal_nan=True)
+        assert np.allclose(result['b'].fill_null(np.nan).to_numpy(), [0.3, 0.7, 0.9, 3.3, 2.8, np.nan], equal_nan=True)
+
+    def _ols_data(self):
+        rng = np.random.default_rng(42)
+        n = 300
+        x = rng.standard_normal(n)
+        y = 0.5 * x + rng.standard_normal(n) * 0.3
+        y[rng.random(n) < 0.05] = np.nan
+        x[rng.random(n) < 0.05] = np.nan
+        y[:20] = x[:20] = 1.0 + np.arange(20) % 3  # 开头无空值
+        x[130:200] = np.sin(np.arange(70))  # 常数x段前后无空值，不沿用常数段的null
+        y[130:200] = 0.5 * x[130:200] + np.cos(np.arange(70)) * 0.3
+        x[150:170] = 2.0
+        df = pl.DataFrame({'y': y, 'x': x})
+        # x整数列与y中的NaN
+        df = df.with_columns(pl.col('x').fill_nan(None))
+        df = df.with_columns(i=(pl.col('x') * 10).round().cast(pl.Int64))
+        return df
+
+    def _ols_ref(self, df, x, d, minp, mode):
+        import polars_ols as pls
+        from polars_ols import RollingKwargs
+        # polars-ols不认NaN
+        return df.select(r=pls.compute_rolling_least_squares(pl.col('y').fill_nan(None), pl.col(x).cast(pl.Float64), mode=mode, add_intercept=True,
+                                                              rolling_kwargs=RollingKwargs(window_size=d, min_periods=minp)))['r']
+
+    def _assert_ols(self, r1, r2, d):
+        # 常数x的窗口polars-ols只是数值噪声，numba版为null
+        cst = np.zeros(r1.len(), dtype=bool)
+        cst[150:169 + d] = True
+        assert r2.filter(pl.Series(cst)).slice(d - 1, 20 - d + 1).is_null().all()
+        m = pl.Series(~cst)
+        r1, r2 = r1.filter(m), r2.filter(m)
+        assert (r1.is_null() == r2.is_null()).all()
+        assert np.allclose(r1.drop_nulls().to_numpy(), r2.drop_nulls().to_numpy(), rtol=0, atol=1e-12)
+
+    def test_ts_regression_all(self, monkeypatch):
+        import polars_ta
+        from polars_ta.wq.time_series import ts_regression_all, ts_regression_resid, ts_regression_pred
+
+        df = self._ols_data()
+        for x in ('x', 'i'):
+            for d, minp in ((10, 10), (10, 5), (20, 3)):
+                result2 = df.select(a=ts_regression_all(pl.col('y'), pl.col(x), d, minp)).unnest('a')
+                coefs = self._ols_ref(df, x, d, minp, 'coefficients').struct.unnest()
+                self._assert_ols(coefs[x], result2['slope'], d)
+                self._assert_ols(coefs['const'], result2['intercept'], d)
+                self._assert_ols(self._ols_ref(df, x, d, minp, 'residuals'), result2['resid'], d)
+                self._assert_ols(self._ols_ref(df, x, d, minp, 'predictions'), result2['pred'], d)
+
+                with monkeypatch.context() as m:
+                    m.setattr(polars_ta, 'USE_NUMBA', True)
+                    result3 = df.select(resid=ts_regression_resid(pl.col('y'), pl.col(x), d, minp),
+                                        pred=ts_regression_pred(pl.col('y'), pl.col(x), d, minp))
+                assert_frame_equal(result3.to_pandas(), result2.select('resid', 'pred').to_pandas())
+
+    def test_ts_regression_coefs_numba(self, monkeypatch):
+        import polars_ta
+        from polars_ta.wq.time_series import ts_regression_coefs, ts_regression_slope, ts_regression_intercept
+
+        df = self._ols_data()
+        for x in ('x', 'i'):
+            for d, minp in ((10, 10), (10, 5), (20, 3)):
+                with monkeypatch.context() as m:
+                    m.setattr(polars_ta, 'USE_NUMBA', True)
+                    result2 = df.select(a=ts_regression_coefs(pl.col('y'), pl.col(x), d, minp)).unnest('a')
+                    result3 = df.select(slope=ts_regression_slope(pl.col('y'), pl.col(x), d, minp),
+                                        intercept=ts_regression_intercept(pl.col('y'), pl.col(x), d, minp))
+                coefs = self._ols_ref(df, x, d, minp, 'coefficients').struct.unnest()
+                self._assert_ols(coefs[x], result2['slope'], d)
+                self._assert_ols(coefs['const'], result2['intercept'], d)
+                assert_frame_equal(result3.to_pandas(), result2.to_pandas())
+
+    def test_ts_resid_numba(self, monkeypatch):
+        import polars_ols as pls
+        from polars_ols import RollingKwargs
+        import polars_ta
+        from polars_ta.wq.time_series import ts_resid, ts_pred
+
+        rng = np.random.default_rng(0)
+        n = 300
+        x1 = rng.standard_normal(n)
+        x2 = rng.standard_normal(n)
+        y = x1 - 0.5 * x2 + rng.standard_normal(n) * 0.3
+        for a in (x1, x2, y):
+            a[20:][rng.random(n - 20) < 0.04] = np.nan
+        df = pl.DataFrame({'y': y, 'x1': x1, 'x2': x2}).with_columns(pl.all().fill_nan(None))
+        # x3与x1共线
+        df = df.with_columns(x3=pl.col('x1') * 2, c=pl.lit(1.0))
+
+        for xs in (('x1', 'x2', 'c'), ('x1', 'x3', 'c')):
+            xs = [pl.col(c) for c in xs]
+            for d, minp in ((10, 10), (10, 5), (20, 4)):
+                for mode, func in (('residuals', ts_resid), ('predictions', ts_pred)):
+                    result1 = df.select(r=pls.compute_rolling_least_squares(pl.col('y'), *xs, mode=mode,
+                                                                            rolling_kwargs=RollingKwargs(window_size=d, min_periods=minp)))['r']
+                    with monkeypatch.context() as m:
+                        m.setattr(polars_ta, 'USE_NUMBA', True)
+                        result2 = df.select(r=func(pl.col('y'), *xs, d=d, min_samples=minp))['r']
+                    if xs[1].meta.output_name() == 'x2':
+                        assert (result1.is_null() == result2.is_null()).all()
+                    else:
+                        # 共线时polars-ols部分行为null，其余行与剔除共线列的结果相同
+                        assert (result2.is_not_null() | result1.is_null()).all()
+                    m = result1.is_not_null()
+                    assert np.allclose(result1.filter(m).to_numpy(), result2.filter(m).to_numpy(), rtol=0, atol=1e-12)
+
+    def test_ts_shifts_v3(self):
+        import itertools
+        from polars_ta.wq.time_series import ts_shifts_v2, ts_shifts_v3
+
+        def ts_shifts_v3_ref(*args):
+            # 原笛卡尔积写法
+            exprs = args[0::3]
+            ranges = [range(b, c + 1) for b, c in zip(args[1::3], args[2::3])]
+            outputs = [itertools.chain.from_iterable(zip(exprs, d)) for d in itertools.product(*ranges)]
+            return pl.any_horizontal(ts_shifts_v2(*_) for _ in outputs)
+
+        rng = np.random.default_rng(0)
+        df = pl.DataFrame({c: rng.random(200) < 0.6 for c in 'abc'})
+        df = df.with_columns(pl.when(pl.int_range(200) % (7 + i) != 0).then(pl.col(c)).alias(c) for i, c in enumerate('abc'))
+        a, b, c = pl.col('a'), pl.col('b'), pl.col('c')
+        for args in ((a, 1, 3, b, 2, 2), (a, 0, 2, b, 1, 3, c, 1, 2), (a, 2, 2, c, 0, 0), (b, 1, 4)):
+            result1 = df.select(out=ts_shifts_v3_ref(*args))
+            result2 = df.select(out=ts_shifts_v3(*args))
+            assert_frame_equal(result1.to_pandas(), result2.to_pandas())
+
+    def test_ts_signals_to_size(self):
+        from polars_ta.wq.time_series import ts_signals_to_size
+
+        def signals_to_size_ref(le, lx, se, sx, accumulate, action):
+            # 原逐行分支写法
+            _amount, _action = 0.0, 0.0
+            out = np.zeros(len(le))
+            for i in range(len(le)):
+                if _amount == 0.0:
+                    if le[i]:
+                        _amount, _action = _amount + 1, 1.0
+                    elif se[i]:
+                        _amount, _action = _amount - 1, -1.0
+                elif _amount > 0.0:
+                    if lx[i]:
+                        _amount, _action = _amount - 1, -1.0
+                    elif le[i] and accumulate:
+                        _amount, _action = _amount + 1, 1.0
+                else:
+                    if sx[i]:
+                        _amount, _action = _amount + 1, 1.0
+                    elif se[i] and accumulate:
+                        _amount, _action = _amount - 1, -1.0
+                out[i] = _action if action else _amount
+            return out
+
+        rng = np.random.default_rng(0)
+        names = ['le', 'lx', 'se', 'sx']
+        df = pl.DataFrame({c: rng.random(400) < 0.15 for c in names})
+        df = df.with_columns(pl.when(pl.int_range(400) % 13 != i).then(pl.col(c)).alias(c) for i, c in enumerate(names))
+        # 整数信号
+        df = df.with_columns(i=pl.col('le').cast(pl.Int64) * 3)
+        for le in ('le', 'i'):
+            # null视为有信号
+            xs = [df[c].cast(pl.Float64).fill_null(np.nan).to_numpy() for c in [le] + names[1:]]
+            for accumulate in (False, True):
+                for action in (False, True):
+                    result1 = signals_to_size_ref(*xs, accumulate, action)
+                    result2 = df.select(ts_signals_to_size(*[pl.col(c) for c in [le] + names[1:]], accumulate, action)).to_series().to_numpy()
+                    assert np.array_equal(result1, result2)
+
     def test_ts_weighted_delay(self):
         from polars_ta.wq.time_series import ts_weighted_delay
 
@@ -116,6 +490,30 @@ class TestDemoClass:
         t2 = time.perf_counter()
         print(t2 - t1)
 
+    def test_ts_product_nan(self):
+        from polars_ta.wq.time_series import ts_product
+
+        rng = np.random.default_rng(0)
+        f = rng.choice([-2, -1.5, -0.5, 0.5, 1.1, 2, 3], 300)
+        f[rng.random(300) < 0.05] = np.nan
+        f[[40, 41, 150]] = 0
+        f[[100, 200]] = np.inf
+        f[201] = -np.inf
+        df = pl.DataFrame({'f': f, 'i': rng.integers(-3, 4, 300), 'b': rng.random(300) < 0.7})
+        df = df.with_columns(pl.when(pl.int_range(300) % 11 != 0).then(pl.col(c)).alias(c) for c in 'fib')
+        for c in 'fib':
+            x = df[c].cast(pl.Float64).fill_null(np.nan).to_numpy()
+            for d, minp in ((5, 5), (10, 3)):
+                # 原逐窗口nanprod写法
+                result1 = np.full(300, np.nan)
+                for i in range(300):
+                    w = x[max(0, i + 1 - d):i + 1]
+                    if (~np.isnan(w)).sum() >= minp:
+                        with np.errstate(invalid='ignore'):
+                            result1[i] = np.nanprod(w)
+                result2 = df.select(ts_product(pl.col(c), d, minp)).to_series().fill_null(np.nan).to_numpy()
+                assert np.allclose(result1, result2, rtol=1e-12, equal_nan=True)
+
     def test_ts_product(self):
         from polars_ta.wq._slow import ts_product as func_slow
         from polars_ta.wq.time_series import ts_product as func_fast
@@ -10,34 +10,45 @@ polars does not skip nan values as well. It should be processed by specific func
 与另一版本的区别是这版本调用更直接，没有跳过空的操作，也没有输入与输出数量的判断工作
 跳过空值等操作与polars样都不做，以后准备统一交给函数处理
 """
+from functools import lru_cache
+
 import talib as _talib
 from talib import abstract as _abstract
 
 from tools.prefix import save
 
+# 没有回看窗口且不累计的函数，每行结果只依赖当行输入，可以标记为逐元素让polars分块并行
+# AD、OBV等lookback也为0，但结果是累计值，不能放入
+ELEMENTWISE = {
+    'ADD', 'DIV', 'MULT', 'SUB',
+    'ACOS', 'ASIN', 'ATAN', 'CEIL', 'COS', 'COSH', 'EXP', 'FLOOR', 'LN', 'LOG10', 'SIN', 'SINH', 'SQRT', 'TAN', 'TANH',
+    'AVGPRICE', 'MEDPRICE', 'TYPPRICE', 'WCLPRICE',
+    'BOP', 'MARKETFI',
+}
+
 
 def _codegen_func(name, input_names, parameters, output_names, doc):
     tpl11 = """
 def {name}({aa}) -> Expr:  # {output_names}
     \"\"\"{doc}\"\"\"
-    return {bb}.map_batches(lambda x1: batches_i1_o1(x1.to_numpy().astype(float), {cc}), return_dtype={return_dtype})
+    return {bb}.map_batches({fn}, return_dtype={return_dtype}{ff})
 """
     tpl12 = """
 def {name}({aa}) -> Expr:  # {output_names}
     \"\"\"{doc}\"\"\"
     dtype = Struct([Field(f"column_{{i}}", Float64) for i in range({ee})])
-    return {bb}.map_batches(lambda x1: batches_i1_o2(x1.to_numpy().astype(float), {cc}), return_dtype=dtype)
+    return {bb}.map_batches({fn}, return_dtype=dtype{ff})
 """
     tpl21 = """
 def {name}({aa}) -> Expr:  # {output_names}
     \"\"\"{doc}\"\"\"
-    return struct({bb}).map_batches(lambda xx: batches_i2_o1(struct_to_numpy(xx, {dd}, dtype=float), {cc}), return_dtype={return_dtype})
+    return struct({bb}).map_batches({fn}, return_dtype={return_dtype}{ff})
 """
     tpl22 = """
 def {name}({aa}) -> Expr:  # {output_names}
     \"\"\"{doc}\"\"\"
     dtype = Struct([Field(f"column_{{i}}", Float64) for i in range({ee})])
-    return struct({bb}).map_batches(lambda xx: batches_i2_o2(struct_to_numpy(xx, {dd}, dtype=float), {cc}), return_dtype=dtype)
+    return struct({bb}).map_batches({fn}, return_dtype=dtype{ff})
 """
     if len(output_names) > 42:
         extra_args = {'ret_idx': len(output_names) - 1}
@@ -53,14 +64,26 @@ def {name}({aa}) -> Expr:  # {output_names}
         bb = [f'f{i}={arg}' for i, arg in enumerate(input_names)]
         bb = ', '.join(bb)
 
-    c1 = [f'_ta.{name}']
+    c1 = [f'_cb_{name}']
     if len(parameters) > 0:
-        c2 = [f'{k}' for k, v in parameters.items()]
+        # partial按位置绑定的参数会排在输入之前，所以参数只能按名字绑定
+        c2 = [f'{k}={k}' for k, v in parameters.items()]
     else:
         c2 = []
 
     c3 = [f'{k}={k}' for k, v in extra_args.items()]
-    cc = ', '.join(c1 + c2 + c3)
+    if len(c2) + len(c3) > 0:
+        fn = f"partial({', '.join(c1 + c2 + c3)})"
+    else:
+        fn = c1[0]
+
+    ff = ', is_elementwise=True' if name in ELEMENTWISE else ''
+
+    # 回调在模块级只创建一次，有参数时用partial绑定
+    cb = f"""
+_cb_{name} = make_talib_cb(_ta.{name}, {len(input_names)}, {len(output_names)})
+
+"""
 
     if output_names[0] == 'integer':
         return_dtype = 'Int32'
@@ -68,28 +91,35 @@ def {name}({aa}) -> Expr:  # {output_names}
         return_dtype = 'Float64'
 
     if len(input_names) == 1 and len(output_names) == 1:
-        return tpl11.format(name=name, aa=aa, bb=bb, cc=cc, dd=len(input_names), ee=len(output_names), output_names=output_names, doc=doc, return_dtype=return_dtype)
+        return cb + tpl11.format(name=name, fn=fn, aa=aa, bb=bb, dd=len(input_names), ee=len(output_names), output_names=output_names, doc=doc, return_dtype=return_dtype, ff=ff)
     elif len(input_names) == 1 and len(output_names) > 1:
-        return tpl12.format(name=name, aa=aa, bb=bb, cc=cc, dd=len(input_names), ee=len(output_names), output_names=output_names, doc=doc)
+        return cb + tpl12.format(name=name, fn=fn, aa=aa, bb=bb, dd=len(input_names), ee=len(output_names), output_names=output_names, doc=doc, ff=ff)
     elif len(input_names) > 1 and len(output_names) == 1:
-        return tpl21.format(name=name, aa=aa, bb=bb, cc=cc, dd=len(input_names), ee=len(output_names), output_names=output_names, doc=doc, return_dtype=return_dtype)
+        return cb + tpl21.format(name=name, fn=fn, aa=aa, bb=bb, dd=len(input_names), ee=len(output_names), output_names=output_names, doc=doc, return_dtype=return_dtype, ff=ff)
     else:
-        return tpl22.format(name=name, aa=aa, bb=bb, cc=cc, dd=len(input_names), ee=len(output_names), output_names=output_names, doc=doc)
+        return cb + tpl22.format(name=name, fn=fn, aa=aa, bb=bb, dd=len(input_names), ee=len(output_names), output_names=output_names, doc=doc, ff=ff)
+
+
+@lru_cache
+def talib_info() -> dict:
+    """`info` of every TA-Lib function, parsed once and shared by later calls
+    所有TA-Lib函数的`info`，只解析一次，多次生成时共用"""
+    return {name: _abstract.Function(name).info for name in _talib.get_functions()}
 
 
 def codegen():
     head_v2 = """# generated by codegen_talib.py
+from functools import partial
+
 import talib as _ta
 from polars import Expr, struct, Struct, Field, Float64, Int32
 
-from polars_ta.utils.numba_ import batches_i1_o1, batches_i1_o2, batches_i2_o1, batches_i2_o2, struct_to_numpy
+from polars_ta.utils.talib_shim import make_talib_cb
 """
 
     txts = [head_v2]
-    for i, func_name in enumerate(_talib.get_functions()):
+    for info in talib_info().values():
         """talib遍历"""
-        info = _abstract.Function(func_name).info
-
         name = info['name']
         input_names = []
         for in_names in info['input_names'].values():
@@ -41,12 +41,17 @@ def codegen_import_as(module: str, prefix: str = 'ts_',
         include_parameter = []
 
     m = __import__(module, fromlist=['*'])
-    funcs = inspect.getmembers(m, inspect.isfunction)
-    funcs = [f for f in funcs if not f[0].startswith('_')]
+    # 直接扫描模块字典，先按名字与来源模块过滤，再排序，比getmembers对每个属性做查找快
+    include_modules = set(include_modules)
+    exclude_func = set(exclude_func)
+    names = getattr(m, '__all__', None)
+    members = vars(m)
+    if names is not None:
+        members = {k: members[k] for k in names if k in members}
+    funcs = sorted((name, func) for name, func in members.items()
+                   if not name.startswith('_') and inspect.isfunction(func) and func.__module__ in include_modules)
     txts = []
     for name, func in funcs:
-        if func.__module__ not in include_modules:
-            continue
         if name in exclude_func:
             continue
 